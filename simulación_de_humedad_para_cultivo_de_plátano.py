@@ -1,33 +1,1025 @@
-import tkinter as tk
-from tkinter import ttk, messagebox
 import random
 import math
+import copy
+import json
+import queue
+import base64
+import bisect
+import asyncio
+import hashlib
+import heapq
+import argparse
+import os
+import sys
+import time
+import functools
+import itertools
+import mmap
+import struct
+import threading
+import concurrent.futures
+from http import HTTPStatus
+from xml.sax.saxutils import escape
+from array import array
 
-class SimuladorPlatano:
-    def __init__(self, root):
-        self.root = root
-        self.root.title("Sistema de Monitoreo - Cultivo de Plátano")
-        self.root.geometry("1400x900")
-        self.root.configure(bg='#2d5016')
+# La interfaz gráfica es opcional: los informes, la sensibilidad y el modo sin interfaz
+# funcionan en instalaciones de Python sin Tk
+try:
+    import tkinter as tk
+    from tkinter import ttk, messagebox
+except ImportError:
+    tk = ttk = messagebox = None
+
+
+class RedHidraulica:
+    """Red de distribución de agua: pileta -> canal -> un lateral por área"""
+    
+    def __init__(self, num_areas, capacidad_canal=20.0, capacidad_lateral=3.0,
+                 perdida_canal=0.05, perdida_lateral=0.10):
+        # Capacidades expresadas en unidades de la pileta (% de su volumen) por riego
+        self.capacidad_canal = capacidad_canal
+        self.perdida_canal = perdida_canal
+        self.capacidad_laterales = [capacidad_lateral] * num_areas
+        self.perdida_laterales = [perdida_lateral] * num_areas
+        
+        # Último reparto resuelto (caudal a la entrada de cada lateral)
+        self.flujo_laterales = [0.0] * num_areas
+    
+    def repartir(self, disponible, demandas):
+        """Resuelve el reparto de agua para las demandas de cada área.
+        
+        `demandas` es un diccionario {área: agua requerida en el área}. Devuelve
+        (agua entregada por área, agua extraída de la pileta).
+        """
+        self.flujo_laterales = [0.0] * len(self.flujo_laterales)
+        
+        # Caudal que cada lateral pide en su entrada para cubrir su demanda
+        pedidos = []
+        for area, demanda in demandas.items():
+            eficiencia = 1 - self.perdida_laterales[area]
+            pedido = min(self.capacidad_laterales[area], demanda / eficiencia)
+            if pedido > 0:
+                pedidos.append((pedido, area))
+        
+        # Agua que el canal puede llevar hasta las tomas de los laterales
+        oferta = min(disponible, self.capacidad_canal) * (1 - self.perdida_canal)
+        
+        # Reparto max-min justo: se atienden primero los pedidos pequeños y el
+        # sobrante se divide por igual entre los laterales restantes
+        pedidos.sort()
+        restantes = len(pedidos)
+        for pedido, area in pedidos:
+            flujo = min(pedido, oferta / restantes)
+            self.flujo_laterales[area] = flujo
+            oferta -= flujo
+            restantes -= 1
+        
+        entregada = {area: self.flujo_laterales[area] * (1 - self.perdida_laterales[area])
+                     for area in demandas}
+        extraida = sum(self.flujo_laterales) / (1 - self.perdida_canal)
+        return entregada, extraida
+    
+    def reiniciar_flujos(self):
+        """Marca todos los laterales como cerrados"""
+        self.flujo_laterales = [0.0] * len(self.flujo_laterales)
+
+
+class ModeloCrecimiento:
+    """Estado por planta y crecimiento fisiológico por tiempo térmico y estrés hídrico"""
+    
+    temperatura_base = 14.0    # °C bajo los cuales el plátano no acumula tiempo térmico
+    tt_crecimiento = 840.0     # grados-día para pasar de germinación a crecimiento
+    tt_maduracion = 1260.0     # grados-día para llegar a maduración
+    tasa_biomasa = 0.01        # kg de materia seca por grado-día sin estrés
+    indice_cosecha = 0.4       # fracción de la biomasa que termina en el racimo
+    materia_seca_racimo = 0.2  # fracción seca del racimo fresco
+    
+    def __init__(self, num_areas, plantas_por_area):
+        self.num_areas = num_areas
+        self.plantas_por_area = plantas_por_area  # capacidad máxima de cada área
+        self.reiniciar()
+    
+    def reiniciar(self):
+        """Elimina todas las plantas de la parcela"""
+        # Un elemento por planta en cada arreglo (la interfaz dibuja por área, no por planta)
+        self.area_planta = array('H')
+        self.dia_siembra = array('i')     # día de simulación en que se sembró
+        self.etapa_planta = array('b')    # 1: Germinación, 2: Crecimiento, 3: Maduración
+        self.salud = array('f')           # 0-1, promedio móvil del factor de estrés
+        self.tiempo_termico = array('f')  # grados-día acumulados desde la siembra
+        self.biomasa = array('f')         # kg de materia seca
+        self.ocupadas = [0] * self.num_areas
+        self.compartido = False  # los arreglos pueden estar compartidos con una copia
+    
+    def __deepcopy__(self, memo):
+        # Copia perezosa: ambas copias comparten los arreglos por planta hasta que una
+        # siembre; avanzar() ya reemplaza los arreglos en vez de modificarlos
+        copia = copy.copy(self)
+        copia.ocupadas = list(self.ocupadas)
+        self.compartido = copia.compartido = True
+        return copia
+    
+    def separar(self):
+        """Copia propia de los arreglos por planta antes de modificarlos en su lugar"""
+        for nombre in ('area_planta', 'dia_siembra', 'etapa_planta',
+                       'salud', 'tiempo_termico', 'biomasa'):
+            setattr(self, nombre, getattr(self, nombre)[:])
+        self.compartido = False
+    
+    @property
+    def total_plantas(self):
+        return len(self.area_planta)
+    
+    def espacio_libre(self):
+        """Plantas que aún caben en toda la parcela"""
+        return self.num_areas * self.plantas_por_area - self.total_plantas
+    
+    def sembrar(self, cantidad_por_area, dia):
+        """Siembra una tanda de plantas en cada área con espacio. Devuelve cuántas se sembraron."""
+        if self.compartido:
+            self.separar()
+        sembradas = 0
+        for area in range(self.num_areas):
+            cantidad = min(cantidad_por_area, self.plantas_por_area - self.ocupadas[area])
+            if cantidad <= 0:
+                continue
+            self.area_planta.extend([area] * cantidad)
+            self.dia_siembra.extend([dia] * cantidad)
+            self.etapa_planta.extend([1] * cantidad)
+            self.salud.extend([1.0] * cantidad)
+            self.tiempo_termico.extend([0.0] * cantidad)
+            self.biomasa.extend([0.0] * cantidad)
+            self.ocupadas[area] += cantidad
+            sembradas += cantidad
+        return sembradas
+    
+    @staticmethod
+    def factor_estres(humedad, humedad_min, humedad_max):
+        """Factor de crecimiento (0-1) según la humedad respecto a la banda ideal"""
+        if humedad < humedad_min:
+            # Déficit hídrico: sin crecimiento por debajo del 40%
+            return max(0.0, (humedad - 40) / (humedad_min - 40))
+        if humedad > humedad_max:
+            # Encharcamiento: el crecimiento cae a la mitad al 95%
+            return max(0.5, 1 - 0.5 * (humedad - humedad_max) / (95 - humedad_max))
+        return 1.0
+    
+    def grados_dia(self, temperatura, dias):
+        """Tiempo térmico acumulado en un periodo a temperatura media constante"""
+        return max(0.0, temperatura - self.temperatura_base) * dias
+    
+    def etapa(self):
+        """Etapa más avanzada del cultivo (0 si no hay plantas)"""
+        return max(self.etapa_planta, default=0)
+    
+    def tiempo_termico_max(self):
+        """Tiempo térmico de la tanda más antigua"""
+        return max(self.tiempo_termico, default=0.0)
+    
+    def dias_para_proxima_etapa(self, temperatura):
+        """Días estimados hasta que la tanda más antigua pase de etapa"""
+        tiempo = self.tiempo_termico_max()
+        umbral = self.tt_crecimiento if tiempo < self.tt_crecimiento else self.tt_maduracion
+        diario = self.grados_dia(temperatura, 1)
+        if diario <= 0:
+            return None
+        return max(0, math.ceil((umbral - tiempo) / diario))
+    
+    def avanzar(self, temperatura, dias, humedad_areas, humedad_min, humedad_max):
+        """Avanza el modelo un periodo y actualiza el estado de todas las plantas"""
+        grados = self.grados_dia(temperatura, dias)
+        factor_area = [self.factor_estres(humedad, humedad_min, humedad_max)
+                       for humedad in humedad_areas]
+        
+        # La biomasa deja de aumentar cuando el racimo llega a maduración
+        tt_mad = self.tt_maduracion
+        incremento = self.tasa_biomasa
+        self.biomasa = array('f', [
+            b + incremento * max(0.0, min(grados, tt_mad - t)) * factor_area[a]
+            for b, t, a in zip(self.biomasa, self.tiempo_termico, self.area_planta)])
+        self.tiempo_termico = array('f', [t + grados for t in self.tiempo_termico])
+        self.salud = array('f', [0.7 * v + 0.3 * factor_area[a]
+                                 for v, a in zip(self.salud, self.area_planta)])
+        
+        tt_crec = self.tt_crecimiento
+        self.etapa_planta = array('b', [1 + (t >= tt_crec) + (t >= tt_mad)
+                                        for t in self.tiempo_termico])
+    
+    def resumen_por_area(self):
+        """Cantidad, etapa promedio, etapa dominante y salud promedio de cada área"""
+        cantidad = [0] * self.num_areas
+        suma_etapa = [0] * self.num_areas
+        suma_salud = [0.0] * self.num_areas
+        por_etapa = [[0, 0, 0, 0] for _ in range(self.num_areas)]
+        for a, e, v in zip(self.area_planta, self.etapa_planta, self.salud):
+            cantidad[a] += 1
+            suma_etapa[a] += e
+            suma_salud[a] += v
+            por_etapa[a][e] += 1
+        
+        resumen = []
+        for a in range(self.num_areas):
+            if cantidad[a] == 0:
+                resumen.append((0, 0.0, 0, 0.0))
+                continue
+            dominante = max(range(1, 4), key=lambda e: por_etapa[a][e])
+            resumen.append((cantidad[a], suma_etapa[a] / cantidad[a], dominante,
+                            suma_salud[a] / cantidad[a]))
+        return resumen
+    
+    def rendimiento_total(self):
+        """Producción estimada de toda la parcela (kg de racimo fresco)"""
+        return sum(self.biomasa) * self.indice_cosecha / self.materia_seca_racimo
+
+
+class DetectorAnomalias:
+    """Detección en línea de sensores atascados, con saltos o desconectados.
+    
+    Cada sensor guarda solo unos pocos valores (promedio y varianza móviles, última
+    lectura y contadores), así la memoria por sensor es constante.
+    """
+    
+    alfa = 0.2                     # peso de la lectura nueva en los promedios móviles
+    z_propio = 3.0                 # desvío respecto a su propio historial
+    z_vecinos = 3.5                # desvío respecto a los otros sensores de su área
+    salto_maximo = 35.0            # cambio entre lecturas que se considera un salto
+    lecturas_planas = 3            # lecturas idénticas seguidas para declararlo atascado
+    lecturas_para_rehabilitar = 3  # lecturas normales seguidas para volver a confiar
+    calentamiento = 4              # lecturas antes de usar los desvíos estadísticos
+    
+    def __init__(self, area_sensor, num_areas):
+        n = len(area_sensor)
+        self.num_areas = num_areas
+        self.area_sensor = array('H', area_sensor)
+        self.media = array('f', bytes(4 * n))
+        self.varianza = array('f', [25.0] * n)
+        self.ultima = array('f', [float('nan')] * n)
+        self.planas = array('H', bytes(2 * n))
+        self.normales = array('H', bytes(2 * n))
+        self.sospechoso = array('b', bytes(n))
+        self.motivo = [''] * n
+        self.lecturas = 0
+    
+    def actualizar(self, humedades, limite_min, limite_max):
+        """Procesa una lectura de todos los sensores. Devuelve los índices sospechosos."""
+        # Promedio de cada área para comparar cada sensor con sus vecinos
+        suma_area = [0.0] * self.num_areas
+        cuenta_area = [0] * self.num_areas
+        for h, a in zip(humedades, self.area_sensor):
+            if h == h:  # descarta NaN
+                suma_area[a] += h
+                cuenta_area[a] += 1
+        residuos = []
+        for h, a in zip(humedades, self.area_sensor):
+            otros = cuenta_area[a] - 1
+            residuos.append(h - (suma_area[a] - h) / otros if otros > 0 and h == h else 0.0)
+        # Escala robusta de los residuos en toda la parcela (desviación absoluta mediana)
+        escala = max(2.0, 1.4826 * sorted(abs(r) for r in residuos)[len(residuos) // 2])
+        
+        usar_estadistica = self.lecturas >= self.calentamiento
+        alfa = self.alfa
+        for i, h in enumerate(humedades):
+            ultima = self.ultima[i]
+            motivo = ''
+            if h != h or h < 0 or h > 100:
+                motivo = 'desconectado'
+            else:
+                if abs(h - ultima) < 0.01 and limite_min < h < limite_max:
+                    self.planas[i] += 1
+                else:
+                    self.planas[i] = 0
+                if self.planas[i] >= self.lecturas_planas:
+                    motivo = 'atascado'
+                elif usar_estadistica and abs(residuos[i]) / escala > self.z_vecinos:
+                    z_propio = abs(h - self.media[i]) / math.sqrt(self.varianza[i])
+                    if abs(h - ultima) > self.salto_maximo:
+                        motivo = 'salto'
+                    elif z_propio > self.z_propio:
+                        motivo = 'deriva'
+            
+            if motivo:
+                self.sospechoso[i] = 1
+                self.normales[i] = 0
+                self.motivo[i] = motivo
+            else:
+                if self.sospechoso[i]:
+                    self.normales[i] += 1
+                    if self.normales[i] >= self.lecturas_para_rehabilitar:
+                        self.sospechoso[i] = 0
+                        self.motivo[i] = ''
+                # Solo las lecturas confiables alimentan el historial del sensor
+                if not self.sospechoso[i]:
+                    if self.lecturas == 0:
+                        self.media[i] = h
+                    else:
+                        delta = h - self.media[i]
+                        self.media[i] += alfa * delta
+                        self.varianza[i] = (1 - alfa) * (self.varianza[i] + alfa * delta * delta)
+            if h == h:
+                self.ultima[i] = h
+        
+        self.lecturas += 1
+        return [i for i, marcado in enumerate(self.sospechoso) if marcado]
+
+
+class ReglasAlerta:
+    """Reglas de alerta configurables, compiladas para evaluarse sobre todos los sensores a la vez.
+    
+    Cada regla es un diccionario (por ejemplo cargado de un archivo JSON):
+    
+        {"medida": "sensor", "condicion": "<", "umbral": 50, "duracion": 1,
+         "variacion": false, "lado": "izquierdo", "areas": [1, 2], "solo_sembrado": false,
+         "mensaje": "Sensor {n}: {valor}%"}
+    
+    `medida` es sensor, area, campo, pileta o etapa; `umbral` puede ser un número o el
+    nombre de un coeficiente del modelo; `duracion` son las actualizaciones seguidas que
+    debe cumplirse; con `variacion` se compara el cambio desde la actualización anterior.
+    """
+    
+    medidas = ('sensor', 'area', 'campo', 'pileta', 'etapa')
+    condiciones = ('<', '<=', '>', '>=', '==')
+    
+    # Reproducen las alertas fijas de las versiones anteriores
+    predeterminadas = [
+        {'medida': 'sensor', 'condicion': '<', 'umbral': 50,
+         'mensaje': "🚨 Sensor {n}: HUMEDAD MUY BAJA ({valor}%)"},
+        {'medida': 'sensor', 'condicion': '>', 'umbral': 90,
+         'mensaje': "⚠️ Sensor {n}: HUMEDAD MUY ALTA ({valor}%)"},
+        {'medida': 'pileta', 'condicion': '<', 'umbral': 20,
+         'mensaje': "💧 PILETA: Nivel de agua crítico (<20%)"},
+        {'medida': 'campo', 'condicion': '<', 'umbral': 'humedad_ideal_min', 'solo_sembrado': True,
+         'mensaje': "🌱 CULTIVO: Humedad muy baja para el plátano"},
+        {'medida': 'campo', 'condicion': '>', 'umbral': 'humedad_ideal_max', 'solo_sembrado': True,
+         'mensaje': "🌱 CULTIVO: Humedad muy alta para el plátano"},
+        {'medida': 'etapa', 'condicion': '==', 'umbral': 3, 'solo_sembrado': True,
+         'mensaje': "🎉 ¡PLÁTANOS LISTOS PARA COSECHAR! 🍌"},
+    ]
+    
+    def __init__(self, reglas, coeficientes, areas_lado, sensores_area):
+        self.reglas = [self.compilar(regla, coeficientes, areas_lado, sensores_area)
+                       for regla in reglas]
+    
+    @staticmethod
+    def cargar(ruta):
+        """Lee las reglas de un archivo JSON (una lista, o un objeto con la clave "reglas")"""
+        with open(ruta, encoding='utf-8') as archivo:
+            datos = json.load(archivo)
+        return datos['reglas'] if isinstance(datos, dict) else datos
+    
+    def compilar(self, regla, coeficientes, areas_lado, sensores_area):
+        """Valida una regla y resuelve de antemano su umbral y los índices de su alcance"""
+        def invalida(motivo):
+            return ValueError(f"{motivo} en la regla de alerta {json.dumps(regla, ensure_ascii=False)}")
+        
+        medida = regla.get('medida', 'sensor')
+        condicion = regla.get('condicion', '<')
+        if medida not in self.medidas:
+            raise invalida(f"Medida de alerta desconocida: {medida!r}")
+        if condicion not in self.condiciones:
+            raise invalida(f"Condición de alerta desconocida: {condicion!r}")
+        variacion = bool(regla.get('variacion', False))
+        if variacion and medida in ('pileta', 'etapa'):
+            raise invalida(f"La medida {medida!r} no admite reglas de variación")
+        
+        if 'umbral' not in regla:
+            raise invalida("Falta el umbral")
+        umbral = regla['umbral']
+        if isinstance(umbral, str):
+            if umbral not in coeficientes:
+                raise invalida(f"Coeficiente desconocido: {umbral!r}")
+            umbral = coeficientes[umbral]
+        elif isinstance(umbral, bool) or not isinstance(umbral, (int, float)):
+            raise invalida(f"Umbral inválido: {umbral!r}")
+        
+        duracion = regla.get('duracion', 1)
+        if isinstance(duracion, bool) or not isinstance(duracion, int):
+            raise invalida(f"Duración inválida (se espera un número entero de actualizaciones): "
+                           f"{duracion!r}")
+        
+        mensaje = regla.get('mensaje', f"Alerta: {medida} {condicion} {umbral} ({{valor}})")
+        if not isinstance(mensaje, str):
+            raise invalida(f"Mensaje inválido: {mensaje!r}")
+        try:
+            mensaje.format(n=1, valor=0.0)
+        except (KeyError, IndexError, ValueError, AttributeError, TypeError) as error:
+            raise invalida(f"Mensaje inválido ({error!r}); solo puede usar {{n}} y {{valor}}") from None
+        
+        # Alcance: áreas (numeradas desde 1 en la configuración) y/o un lado de la parcela
+        alcance = None
+        if medida in ('sensor', 'area') and ('areas' in regla or 'lado' in regla):
+            num_areas = len(sensores_area)
+            areas = set(range(num_areas))
+            if 'areas' in regla:
+                if not isinstance(regla['areas'], (list, tuple)):
+                    raise invalida(f"'areas' debe ser una lista de áreas: {regla['areas']!r}")
+                for area in regla['areas']:
+                    if isinstance(area, bool) or not isinstance(area, int) or not 1 <= area <= num_areas:
+                        raise invalida(f"Área fuera de rango (1-{num_areas}): {area!r}")
+                areas &= {area - 1 for area in regla['areas']}
+            if 'lado' in regla:
+                if regla['lado'] not in areas_lado:
+                    raise invalida(f"Lado desconocido: {regla['lado']!r}")
+                areas &= set(areas_lado[regla['lado']])
+            if not areas:
+                raise invalida("El alcance no incluye ningún área")
+            if medida == 'sensor':
+                alcance = tuple(sensor for area in sorted(areas) for sensor in sensores_area[area])
+            else:
+                alcance = tuple(sorted(areas))
+        
+        return {
+            'medida': medida,
+            'condicion': condicion,
+            'umbral': umbral,
+            'duracion': max(1, duracion),
+            'variacion': variacion,
+            'alcance': alcance,
+            'solo_sembrado': bool(regla.get('solo_sembrado', False)),
+            'mensaje': mensaje,
+        }
+    
+    @staticmethod
+    def valores(sim, medida, variacion):
+        """Valores actuales (o su cambio desde la actualización anterior) de una medida"""
+        if medida == 'pileta':
+            return [sim.nivel_agua]
+        if medida == 'etapa':
+            return [sim.etapa_crecimiento]
+        if medida == 'campo':
+            historial = sim.historial_humedad
+            if variacion:
+                return [historial[-1] - historial[-2] if len(historial) > 1 else 0.0]
+            return [sum(d['humedad'] for d in sim.datos_sensores.values()) / sim.total_sensores]
+        if not variacion:
+            humedades = [sim.datos_sensores[i]['humedad'] for i in range(sim.total_sensores)]
+        else:
+            humedades = [h[-1] - h[-2] if len(h) > 1 else 0.0 for h in sim.historial_sensores]
+        if medida == 'sensor':
+            return humedades
+        return [sum(humedades[i] for i in sensores) / len(sensores) for sensores in sim.sensores_area]
+    
+    def condiciones_cumplidas(self, sim):
+        """Índices (sensor, área o 0) que cumplen hoy la condición de cada regla, y los valores.
+        
+        Los valores de cada medida y alcance se ordenan una sola vez por evaluación; luego
+        cada regla es una búsqueda binaria de su umbral, y su costo no depende del número
+        de sensores sino del de elementos en alerta.
+        """
+        valores = {}
+        ordenados = {}
+        cumplidas = []
+        for regla in self.reglas:
+            if regla['solo_sembrado'] and not sim.platano_sembrado:
+                cumplidas.append([])
+                continue
+            clave_valores = (regla['medida'], regla['variacion'])
+            if clave_valores not in valores:
+                valores[clave_valores] = self.valores(sim, *clave_valores)
+            clave = clave_valores + (regla['alcance'],)
+            if clave not in ordenados:
+                todos = valores[clave_valores]
+                indices = range(len(todos)) if regla['alcance'] is None else regla['alcance']
+                orden = sorted(indices, key=todos.__getitem__)
+                ordenados[clave] = (orden, [todos[i] for i in orden])
+            orden, ordenado = ordenados[clave]
+            
+            umbral, condicion = regla['umbral'], regla['condicion']
+            if condicion == '<':
+                elegidos = orden[:bisect.bisect_left(ordenado, umbral)]
+            elif condicion == '<=':
+                elegidos = orden[:bisect.bisect_right(ordenado, umbral)]
+            elif condicion == '>':
+                elegidos = orden[bisect.bisect_right(ordenado, umbral):]
+            elif condicion == '>=':
+                elegidos = orden[bisect.bisect_left(ordenado, umbral):]
+            else:
+                elegidos = orden[bisect.bisect_left(ordenado, umbral):
+                                 bisect.bisect_right(ordenado, umbral)]
+            cumplidas.append(elegidos)
+        return cumplidas, valores
+    
+    def actualizar_rachas(self, sim, rachas):
+        """Cuenta las actualizaciones seguidas en que se cumple cada regla con duración"""
+        cumplidas, _ = self.condiciones_cumplidas(sim)
+        for k, (regla, elegidos) in enumerate(zip(self.reglas, cumplidas)):
+            if regla['duracion'] > 1:
+                anterior = rachas.get(k, {})
+                rachas[k] = {i: anterior.get(i, 0) + 1 for i in elegidos}
+    
+    def evaluar(self, sim, rachas):
+        """Alertas activas como tuplas (medida, índice, mensaje), las de sensores por índice"""
+        por_sensor = []
+        resto = []
+        cumplidas, valores = self.condiciones_cumplidas(sim)
+        for k, (regla, elegidos) in enumerate(zip(self.reglas, cumplidas)):
+            if regla['duracion'] > 1:
+                racha = rachas.get(k, {})
+                elegidos = [i for i in elegidos if racha.get(i, 0) >= regla['duracion']]
+            if not elegidos:
+                continue
+            todos = valores[regla['medida'], regla['variacion']]
+            destino = por_sensor if regla['medida'] == 'sensor' else resto
+            for i in sorted(elegidos):
+                destino.append((i, k, regla['medida'],
+                                regla['mensaje'].format(n=i + 1, valor=round(todos[i], 2))))
+        por_sensor.sort()
+        return [(medida, i, mensaje) for i, _, medida, mensaje in por_sensor + resto]
+
+
+class AgendaEventos:
+    """Planificador de eventos discretos sobre un montículo (heapq), con el tiempo en días.
+    
+    Entre un evento y el siguiente no se hace ningún trabajo: el reloj salta directo
+    al próximo evento pendiente.
+    """
+    
+    def __init__(self, ahora=0.0):
+        self.ahora = ahora
+        self.cola = []       # (tiempo, orden de llegada, tipo, datos)
+        self.contador = 0    # desempata eventos simultáneos en orden de programación
+        self.procesados = 0
+    
+    def __len__(self):
+        return len(self.cola)
+    
+    def programar(self, tiempo, tipo, *datos):
+        """Agenda un evento `tipo` para el día `tiempo` (nunca antes del reloj actual)"""
+        heapq.heappush(self.cola, (max(tiempo, self.ahora), self.contador, tipo, datos))
+        self.contador += 1
+    
+    def proximo(self):
+        """Día del próximo evento pendiente (infinito si no hay)"""
+        return self.cola[0][0] if self.cola else math.inf
+    
+    def ejecutar_hasta(self, limite, manejador):
+        """Atiende en orden los eventos hasta el día `limite` con manejador(tiempo, tipo, datos)"""
+        cola = self.cola
+        while cola and cola[0][0] <= limite:
+            tiempo, _, tipo, datos = heapq.heappop(cola)
+            self.ahora = tiempo
+            manejador(tiempo, tipo, datos)
+            self.procesados += 1
+        self.ahora = max(self.ahora, limite)
+
+
+class SketchCuantiles:
+    """Sketch KLL de cuantiles en flujo: memoria O(k·log(n/k)) sin importar cuántos datos entren.
+    
+    El nivel h guarda valores que pesan 2^h. Cuando un nivel se llena se ordena y se
+    promueve al siguiente uno de cada dos valores (alternando pares e impares), con lo que
+    el peso total se conserva exacto y el error de rango queda en O(1/k).
+    """
+    
+    def __init__(self, k=200):
+        self.k = k
+        self.niveles = [array('f')]
+        self.n = 0
+        self.paridad = 0
+    
+    def capacidad(self, nivel):
+        # Los niveles bajos (los más recientes) son más chicos
+        profundidad = len(self.niveles) - 1 - nivel
+        return max(8, int(self.k * (2 / 3) ** profundidad))
+    
+    def agregar(self, valores):
+        """Agrega un lote de valores"""
+        base = self.niveles[0]
+        for valor in valores:
+            base.append(valor)
+            if len(base) >= self.capacidad(0):
+                self.compactar()
+                base = self.niveles[0]
+        self.n += len(valores)
+    
+    def compactar(self):
+        h = 0
+        while h < len(self.niveles):
+            nivel = self.niveles[h]
+            if len(nivel) >= self.capacidad(h):
+                if h + 1 == len(self.niveles):
+                    self.niveles.append(array('f'))
+                ordenado = sorted(nivel)
+                resto = [ordenado.pop()] if len(ordenado) % 2 else []
+                self.niveles[h + 1].extend(ordenado[self.paridad::2])
+                self.niveles[h] = array('f', resto)
+                self.paridad ^= 1
+            h += 1
+    
+    def cuantiles(self, probabilidades):
+        """Valores aproximados de los cuantiles pedidos (None si el sketch está vacío)"""
+        pares = sorted((valor, 1 << h) for h, nivel in enumerate(self.niveles) for valor in nivel)
+        if not pares:
+            return [None] * len(probabilidades)
+        total = sum(peso for _, peso in pares)
+        resultados = []
+        for q in probabilidades:
+            objetivo = q * total
+            acumulado = 0
+            for valor, peso in pares:
+                acumulado += peso
+                if acumulado >= objetivo:
+                    break
+            resultados.append(valor)
+        return resultados
+    
+    def tamaño(self):
+        """Valores guardados (la memoria del sketch)"""
+        return sum(len(nivel) for nivel in self.niveles)
+
+
+class EstadisticasHumedad:
+    """Distribución histórica de la humedad por área y en toda la parcela.
+    
+    Guarda un sketch de cuantiles por área y otro de la parcela, y los días que cada área
+    pasó en cada banda de humedad; la memoria no crece con los años simulados.
+    """
+    
+    bandas = ('Muy baja', 'Baja', 'Ideal', 'Alta', 'Muy alta')
+    # Los primeros límites pertenecen a la banda que empiezan (como el mínimo ideal en la
+    # interfaz); los demás, a la banda que terminan (el máximo ideal todavía es ideal)
+    limites_inferiores = 2
+    
+    def __init__(self, num_areas, limites, k=200):
+        self.limites = limites  # humedad donde empieza cada banda a partir de la segunda
+        self.por_area = [SketchCuantiles(k) for _ in range(num_areas)]
+        self.parcela = SketchCuantiles(k)
+        self.dias_banda = [array('d', bytes(8 * len(self.bandas))) for _ in range(num_areas)]
+    
+    def registrar(self, humedades, sensores_area, dias):
+        """Agrega una lectura de todos los sensores que representa `dias` días"""
+        self.parcela.agregar(humedades)
+        inferiores = self.limites[:self.limites_inferiores]
+        superiores = self.limites[self.limites_inferiores:]
+        for sketch, dias_banda, sensores in zip(self.por_area, self.dias_banda, sensores_area):
+            valores = [humedades[sensor_id] for sensor_id in sensores]
+            sketch.agregar(valores)
+            dias_sensor = dias / len(valores)
+            for valor in valores:
+                banda = bisect.bisect_right(inferiores, valor) + bisect.bisect_left(superiores, valor)
+                dias_banda[banda] += dias_sensor
+    
+    def percentiles(self, area=None, probabilidades=(0.1, 0.5, 0.9)):
+        """Percentiles históricos de un área (o de la parcela si `area` es None)"""
+        sketch = self.parcela if area is None else self.por_area[area]
+        return sketch.cuantiles(probabilidades)
+    
+    def fraccion_bandas(self, area=None):
+        """Fracción del tiempo en cada banda para un área (o el promedio de la parcela)"""
+        if area is None:
+            dias = [sum(columna) for columna in zip(*self.dias_banda)]
+        else:
+            dias = list(self.dias_banda[area])
+        total = sum(dias)
+        return [d / total if total else 0.0 for d in dias]
+
+
+class SerieCompartida:
+    """Serie de lecturas que solo crece, compartible entre copias.
+    
+    Los valores viven en tramos sellados que nunca se modifican, más un tramo propio al
+    que se agrega. Una copia (deepcopy) sella el tramo propio y comparte todos los tramos,
+    así que cuesta lo mismo con un mes o con décadas de historial. Al sellar se funden los
+    tramos chicos del final con el nuevo, y quedan a lo sumo unos log2(n) tramos.
+    """
+    
+    __slots__ = ('tramos', 'propio', 'largo')
+    
+    def __init__(self, tramos=()):
+        self.tramos = tuple(tramos)
+        self.propio = array('f')
+        self.largo = sum(len(tramo) for tramo in self.tramos)
+    
+    def append(self, valor):
+        self.propio.append(valor)
+        self.largo += 1
+    
+    def __len__(self):
+        return self.largo
+    
+    def __iter__(self):
+        for tramo in self.tramos:
+            yield from tramo
+        yield from self.propio
+    
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return self.valores()[indice]
+        if indice < 0:
+            indice += self.largo
+        if not 0 <= indice < self.largo:
+            raise IndexError("índice fuera de la serie")
+        # Las lecturas recientes son las más consultadas: buscar desde el final
+        resto = self.largo - indice
+        if resto <= len(self.propio):
+            return self.propio[-resto]
+        resto -= len(self.propio)
+        for tramo in reversed(self.tramos):
+            if resto <= len(tramo):
+                return tramo[-resto]
+            resto -= len(tramo)
+    
+    def valores(self):
+        """Todos los valores en un arreglo contiguo nuevo"""
+        valores = array('f')
+        for tramo in self.tramos:
+            valores.extend(tramo)
+        valores.extend(self.propio)
+        return valores
+    
+    def sellar(self):
+        """Congela el tramo propio para que pueda compartirse"""
+        if not self.propio:
+            return
+        tramos = list(self.tramos)
+        nuevo = self.propio
+        while tramos and len(tramos[-1]) <= len(nuevo):
+            nuevo = tramos.pop() + nuevo
+        tramos.append(nuevo)
+        self.tramos = tuple(tramos)
+        self.propio = array('f')
+    
+    def __deepcopy__(self, memo):
+        self.sellar()
+        return SerieCompartida(self.tramos)
+
+
+class AzarRegistrado(random.Random):
+    """Generador aleatorio que guarda, o reproduce, cada número que entrega"""
+    
+    def __init__(self, semilla=None):
+        self.capturados = None
+        self.pendientes = []
+        super().__init__(semilla)
+    
+    def random(self):
+        # randint, uniform, etc. pasan todos por aquí
+        if self.pendientes:
+            valor = self.pendientes.pop()
+        else:
+            valor = super().random()
+        if self.capturados is not None:
+            self.capturados.append(valor)
+        return valor
+    
+    def iniciar_captura(self, sorteos=()):
+        """Empieza a guardar sorteos; si se dan `sorteos`, se entregan esos primero"""
+        self.capturados = []
+        self.pendientes = list(reversed(sorteos))
+    
+    def terminar_captura(self):
+        """Deja de guardar sorteos y devuelve los capturados"""
+        capturados, self.capturados = self.capturados, None
+        self.pendientes = []
+        return capturados
+
+
+class RegistroEventos:
+    """Registro de solo anexado de acciones y sorteos, con instantáneas periódicas del estado"""
+    
+    def __init__(self, semilla, ruta=None, intervalo_instantaneas=25, configuracion=None):
+        self.semilla = semilla
+        self.configuracion = configuracion or {}  # argumentos de configurar() aparte de la semilla
+        self.eventos = []        # (acción, argumentos, sorteos)
+        self.instantaneas = {}   # eventos aplicados -> estado exportado
+        self.intervalo_instantaneas = intervalo_instantaneas
+        self.archivo = None
+        if ruta:
+            self.archivo = open(ruta, 'a', encoding='utf-8')
+            self.archivo.write(json.dumps({'semilla': semilla,
+                                           'configuracion': self.configuracion}) + '\n')
+            self.archivo.flush()
+    
+    def agregar(self, accion, args, sorteos, simulacion):
+        """Anexa un evento y toma una instantánea si corresponde"""
+        self.eventos.append((accion, list(args), sorteos))
+        if self.archivo:
+            self.archivo.write(json.dumps({'accion': accion, 'args': list(args),
+                                           'sorteos': sorteos}) + '\n')
+            self.archivo.flush()
+        if len(self.eventos) % self.intervalo_instantaneas == 0:
+            self.instantaneas[len(self.eventos)] = simulacion.exportar_estado()
+    
+    @staticmethod
+    def sesiones(ruta):
+        """Sesiones de un archivo de registro: [(semilla, configuración, eventos)], una por encabezado"""
+        sesiones = []
+        with open(ruta, encoding='utf-8') as archivo:
+            for numero, linea in enumerate(archivo, start=1):
+                if not linea.strip():
+                    continue
+                datos = json.loads(linea)
+                if 'semilla' in datos:
+                    sesiones.append((datos['semilla'], datos.get('configuracion', {}), []))
+                elif not sesiones:
+                    raise ValueError(f"{ruta}:{numero}: evento antes del encabezado de sesión")
+                else:
+                    sesiones[-1][2].append((datos['accion'], datos['args'], datos['sorteos']))
+        if not sesiones:
+            raise ValueError(f"{ruta}: registro vacío")
+        return sesiones
+    
+    @classmethod
+    def cargar(cls, ruta, intervalo_instantaneas=25, sesion=-1):
+        """Lee una sesión de un registro guardado y reconstruye sus instantáneas reproduciéndola.
+        
+        Cada ejecución con el mismo archivo anexa una sesión nueva que empieza con su semilla
+        y su configuración; por omisión se carga la última.
+        """
+        semilla, configuracion, eventos = cls.sesiones(ruta)[sesion]
+        registro = cls(semilla, intervalo_instantaneas=intervalo_instantaneas,
+                       configuracion=configuracion)
+        SimulacionPlatano.reproducir(eventos, registro.semilla, registro=registro,
+                                     configuracion=configuracion)
+        return registro
+    
+    def estado_en(self, indice):
+        """Simulación sin interfaz con los primeros `indice` eventos aplicados"""
+        base = max((i for i in self.instantaneas if i <= indice), default=0)
+        if base:
+            simulacion = SimulacionPlatano.desde_estado(self.instantaneas[base], self.semilla,
+                                                        self.configuracion)
+        else:
+            simulacion = SimulacionPlatano.vacia(self.semilla, self.configuracion)
+        simulacion.aplicar_eventos(self.eventos[base:indice])
+        return simulacion
+
+
+def accion_registrada(metodo):
+    """Anota en el registro de eventos la acción y los sorteos aleatorios que consume"""
+    @functools.wraps(metodo)
+    def envoltura(self, *args):
+        if self.accion_en_curso:
+            return metodo(self, *args)
+        self.accion_en_curso = True
+        registrar = self.registro is not None
+        if registrar and not self.rng.pendientes:
+            self.rng.iniciar_captura()
+        try:
+            resultado = metodo(self, *args)
+        except BaseException:
+            # Una acción rechazada no entra al registro: al reproducirlo volvería a fallar
+            if registrar:
+                self.rng.terminar_captura()
+            raise
+        finally:
+            self.accion_en_curso = False
+        if registrar:
+            self.registro.agregar(metodo.__name__, args, self.rng.terminar_captura(), self)
+        for observador in self.observadores:
+            observador(self, metodo.__name__)
+        return resultado
+    return envoltura
+
+
+class SimulacionPlatano:
+    """Modelo de la parcela sin interfaz gráfica"""
+    
+    # Atributos que forman el estado de la simulación (instantáneas y reproducción)
+    campos_estado = ('mes_actual', 'dia_simulacion', 'nivel_agua', 'agua_usada', 'datos_sensores',
+                     'historial_humedad', 'historial_sensores', 'historial_riego', 'alertas', 'platano_sembrado',
+                     'etapa_crecimiento', 'dias_desde_siembra', 'crecimiento', 'red', 'detector',
+                     'rachas_alerta', 'agenda', 'reloj_suelo', 'estadisticas')
+    
+    # Coeficientes del modelo de humedad (los que estudia el análisis de sensibilidad)
+    coeficientes_base = {
+        'infiltracion': 0.8,         # fracción de la lluvia que entra al suelo
+        'lamina_por_punto': 4.0,     # mm de agua por punto de humedad en la zona de raíces
+        'capacidad_campo': 85,       # humedad sobre la cual el suelo drena
+        'drenaje': 0.3,              # fracción diaria del exceso sobre capacidad de campo que drena
+        'umbral_estres': 55,         # humedad bajo la cual el cultivo reduce su transpiración
+        'amplitud_termica': 8.0,     # diferencia entre máxima y mínima diaria (°C)
+        'amplitud_por_sequia': 0.1,  # °C de amplitud adicional por punto de sequía
+        'humedad_suelo_min': 30,     # límites físicos de la humedad medida
+        'humedad_suelo_max': 95,
+        'riego_min': 15,             # aumento de humedad de un riego completo
+        'riego_max': 25,
+        'humedad_ideal_min': 65,     # banda ideal del plátano
+        'humedad_ideal_max': 80,
+        'fraccion_tormentas': 0.5,   # parte de la lluvia del mes que cae en tormentas
+        'lluvia_por_tormenta': 25,   # mm promedio de una tormenta
+    }
+    
+    # Coeficiente de cultivo (Kc, FAO-56) del plátano por etapa; sin sembrar, suelo desnudo
+    coeficientes_cultivo = {0: 0.3, 1: 0.5, 2: 1.1, 3: 1.0}
+    
+    # Curvas de retención de van Genuchten y conductividad de Mualem por textura (Carsel y
+    # Parrish, 1988): contenido residual y de saturación, alfa (1/cm), n y Ks (cm/día)
+    tipos_suelo = {
+        'arena': {'theta_r': 0.045, 'theta_s': 0.43, 'alfa': 0.145, 'n': 2.68, 'ks': 712.8},
+        'franco_arenoso': {'theta_r': 0.065, 'theta_s': 0.41, 'alfa': 0.075, 'n': 1.89, 'ks': 106.1},
+        'franco': {'theta_r': 0.078, 'theta_s': 0.43, 'alfa': 0.036, 'n': 1.56, 'ks': 24.96},
+        'franco_arcilloso': {'theta_r': 0.095, 'theta_s': 0.41, 'alfa': 0.019, 'n': 1.31, 'ks': 6.24},
+        'arcilla': {'theta_r': 0.068, 'theta_s': 0.38, 'alfa': 0.008, 'n': 1.09, 'ks': 4.8},
+    }
+    suelo_referencia = 'franco'  # textura para la que están calibrados los coeficientes
+    
+    duracion_riego_maxima = 30  # días que puede durar un riego programado (uno por pulso diario)
+    
+    # Manejo que aplica una rama "¿qué pasa si...?" al empezar cada mes: (acción, *argumentos)
+    escenarios_rama = {
+        'Sin riego': (),
+        'Regar lado izquierdo': ('regar_lado', 'izquierdo'),
+        'Regar lado derecho': ('regar_lado', 'derecho'),
+        'Riego automático': ('riego_automatico',),
+    }
+    
+    def __init__(self, semilla=None, ruta_registro=None, registrar=True, coeficientes=None,
+                 iniciar_ahora=True, reglas_alerta=None, valvulas=None, suelos=None):
+        self.configurar(semilla, coeficientes, reglas_alerta, valvulas, suelos)
+        self.registro = (RegistroEventos(self.semilla, ruta_registro, configuracion=self.configuracion)
+                         if registrar else None)
+        if iniciar_ahora:
+            self.iniciar()
+    
+    def configurar(self, semilla=None, coeficientes=None, reglas_alerta=None, valvulas=None,
+                   suelos=None):
+        """Define los parámetros fijos del modelo"""
+        if semilla is None:
+            semilla = random.randrange(2 ** 32)
+        self.semilla = semilla
+        self.rng = AzarRegistrado(semilla)
+        self.registro = None
+        self.accion_en_curso = False
+        self.observadores = []  # funciones(simulación, acción) llamadas tras cada acción
+        self.metricas = MetricasSimulacion()
+        
+        self.coeficientes = dict(self.coeficientes_base, **(coeficientes or {}))
         
         # Parámetros del cultivo de plátano
-        self.humedad_ideal_min = 65  # % humedad ideal mínima
-        self.humedad_ideal_max = 80  # % humedad ideal máxima
+        self.humedad_ideal_min = self.coeficientes['humedad_ideal_min']  # % humedad ideal mínima
+        self.humedad_ideal_max = self.coeficientes['humedad_ideal_max']  # % humedad ideal máxima
         
         # Configuración de la parcela
         self.num_areas = 12
         self.sensores_por_area = 2
         self.total_sensores = self.num_areas * self.sensores_por_area
         
-        # Estado del cultivo
-        self.platano_sembrado = False
-        self.etapa_crecimiento = 0  # 0: No sembrado, 1: Germinación, 2: Crecimiento, 3: Maduración
-        self.dias_desde_siembra = 0
+        # Índices fijos: sensores de cada área, áreas de cada lado y de cada válvula
+        self.sensores_area = tuple(tuple(range(area * self.sensores_por_area,
+                                               (area + 1) * self.sensores_por_area))
+                                   for area in range(self.num_areas))
+        mitad = self.num_areas // 2
+        self.lado_area = tuple('izquierdo' if area < mitad else 'derecho'
+                               for area in range(self.num_areas))
+        self.areas_lado = {'izquierdo': tuple(range(mitad)),
+                           'derecho': tuple(range(mitad, self.num_areas))}
+        # Por defecto una válvula por área; `valvulas` da las áreas (desde 0) de cada una
+        if valvulas is None:
+            valvulas = [[area] for area in range(self.num_areas)]
+        self.valvulas = tuple(tuple(sorted(set(areas))) for areas in valvulas)
+        for areas in self.valvulas:
+            if not areas or not all(0 <= area < self.num_areas for area in areas):
+                raise ValueError(f"Válvula con áreas inválidas (se numeran de 1 a {self.num_areas}): "
+                                 f"{[area + 1 for area in areas]}")
+        
+        # Textura del suelo de cada área: un nombre para toda la parcela o uno por área
+        if suelos is None:
+            suelos = self.suelo_referencia
+        if isinstance(suelos, str):
+            suelos = [suelos] * self.num_areas
+        if len(suelos) != self.num_areas:
+            raise ValueError(f"Se esperaba un tipo de suelo por área ({self.num_areas})")
+        for suelo in suelos:
+            if suelo not in self.tipos_suelo:
+                raise ValueError(f"Tipo de suelo desconocido: {suelo}")
+        self.suelo_area = tuple(suelos)
+        self.suelo_sensor = tuple(self.suelo_area[i // self.sensores_por_area]
+                                  for i in range(self.total_sensores))
+        self.sensores_suelo = {}
+        for area, suelo in enumerate(self.suelo_area):
+            self.sensores_suelo[suelo] = self.sensores_suelo.get(suelo, ()) + self.sensores_area[area]
+        self.curvas_suelo = {suelo: self.tablas_suelo(suelo) for suelo in self.sensores_suelo}
+        
+        # Reglas de alerta (las predeterminadas reproducen las alertas fijas de siempre)
+        if reglas_alerta is None:
+            reglas_alerta = ReglasAlerta.predeterminadas
+        self.reglas_alerta = ReglasAlerta(reglas_alerta, self.coeficientes, self.areas_lado,
+                                          self.sensores_area)
+        
+        # Lo que, junto con la semilla, reconstruye este mismo modelo (va en el registro); se
+        # guarda ya resuelto para no depender de los valores por omisión de otra versión
+        self.configuracion = {'coeficientes': dict(self.coeficientes),
+                              'reglas_alerta': copy.deepcopy(reglas_alerta),
+                              'valvulas': [list(areas) for areas in self.valvulas],
+                              'suelos': list(self.suelo_area)}
+        
+        # Red hidráulica (pileta, canal y laterales)
+        self.red = RedHidraulica(self.num_areas)
+        self.demanda_riego_area = 2.5  # agua que recibe cada área en un riego completo
+        
+        # Configuración del cultivo
+        self.plantas_por_area = 1000
+        self.plantas_por_tanda = 250  # plantas por área en cada siembra escalonada
+        self.crecimiento = ModeloCrecimiento(self.num_areas, self.plantas_por_area)
         
         # Datos de simulación
         self.meses = ['Ene', 'Feb', 'Mar', 'Abr', 'May', 'Jun', 
                      'Jul', 'Ago', 'Sep', 'Oct', 'Nov', 'Dic']
         
+        # Latitud de la parcela (grados, negativa al sur) para la radiación extraterrestre
+        self.latitud = -2.0
+        self.tablas_balance = {}  # (mes, etapa, suelo, días) -> humedad final según la inicial
+        
         # Patrones climáticos por mes (promedio)
         self.patrones_clima = {
             'Ene': {'lluvia': 40, 'temperatura': 28, 'sequia': 20},
@@ -45,1077 +1037,2764 @@ class SimuladorPlatano:
         }
         
         # Estado inicial
+        self.estado_inicial()
+    
+    def estado_inicial(self):
+        """Lleva el estado a los valores de una parcela recién creada"""
         self.mes_actual = 0
+        self.dia_simulacion = 0
+        self.nivel_agua = 80  # Nivel inicial de agua (%)
+        self.agua_usada = 0.0  # agua extraída de la pileta en toda la simulación
         self.datos_sensores = {}
         self.historial_humedad = []
+        self.historial_sensores = [SerieCompartida() for _ in range(self.total_sensores)]
         self.historial_riego = []
         self.alertas = []
         
-        self.inicializar_datos()
-        self.crear_interfaz()
-        self.actualizar_simulacion()
-        
+        # Estado del cultivo
+        self.platano_sembrado = False
+        self.etapa_crecimiento = 0  # 0: No sembrado, 1: Germinación, 2: Crecimiento, 3: Maduración
+        self.dias_desde_siembra = 0
+        self.crecimiento.reiniciar()
+        self.red.reiniciar_flujos()
+        self.detector = DetectorAnomalias([i // self.sensores_por_area
+                                           for i in range(self.total_sensores)], self.num_areas)
+        self.rachas_alerta = {}  # regla -> {elemento: actualizaciones seguidas en alerta}
+        self.agenda = AgendaEventos()
+        self.reloj_suelo = 0.0  # día hasta el que se aplicó el balance hídrico
+        self.estadisticas = EstadisticasHumedad(
+            self.num_areas, (50, self.humedad_ideal_min, self.humedad_ideal_max, 90))
+        self.ramas = []  # (escenario, mes de la bifurcación, simulación) para comparar
+    
     def inicializar_datos(self):
         """Inicializa los datos de los sensores"""
         for i in range(self.total_sensores):
             self.datos_sensores[i] = {
-                'humedad': random.randint(60, 75),
+                'humedad': self.rng.randint(60, 75),
                 'area': i // self.sensores_por_area,
                 'estado': 'Normal',
-                'lado': 'izquierdo' if (i // self.sensores_por_area) < 6 else 'derecho'
+                'lado': self.lado_area[i // self.sensores_por_area]
             }
     
-    def crear_interfaz(self):
-        # Frame principal
-        main_frame = tk.Frame(self.root, bg='#2d5016')
-        main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-        
-        # Título principal
-        titulo_frame = tk.Frame(main_frame, bg='#4a7c1f', height=80)
-        titulo_frame.pack(fill=tk.X, pady=(0,10))
-        titulo_frame.pack_propagate(False)
-        
-        tk.Label(titulo_frame, text="🌴 SISTEMA DE MONITOREO - CULTIVO DE PLÁTANO 🌴", 
-                font=('Arial', 20, 'bold'), bg='#4a7c1f', fg='white').pack(expand=True)
-        
-        # Frame para controles y visualización
-        content_frame = tk.Frame(main_frame, bg='#2d5016')
-        content_frame.pack(fill=tk.BOTH, expand=True)
-        
-        # Panel izquierdo - Vista de la parcela
-        left_panel = tk.Frame(content_frame, bg='#3a6519', relief=tk.RAISED, bd=3)
-        left_panel.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0,5))
-        
-        # Panel derecho - Gráficos y controles
-        right_panel = tk.Frame(content_frame, bg='#3a6519', relief=tk.RAISED, bd=3)
-        right_panel.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True, padx=(5,0))
-        
-        self.crear_vista_parcela(left_panel)
-        self.crear_controles_derecha(right_panel)
+    @accion_registrada
+    def iniciar(self):
+        """Sensores y clima del primer mes de una simulación nueva"""
+        self.estado_inicial()
+        self.inicializar_datos()
+        self.simular_clima()
     
-    def crear_vista_parcela(self, parent):
-        """Crea la vista visual de la parcela con sensores"""
-        # Frame principal de la parcela
-        parcela_frame = tk.Frame(parent, bg='#3a6519')
-        parcela_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-        
-        # Título
-        tk.Label(parcela_frame, text="🏞️ VISTA DE LA PARCELA", 
-                font=('Arial', 16, 'bold'), bg='#3a6519', fg='white').pack(pady=10)
-        
-        # Frame con scroll para la parcela
-        parcela_container = tk.Frame(parcela_frame, bg='#3a6519')
-        parcela_container.pack(fill=tk.BOTH, expand=True)
-        
-        # Canvas y scrollbar para la parcela
-        canvas_parcela = tk.Canvas(parcela_container, bg='#3a6519', highlightthickness=0)
-        scrollbar_parcela = tk.Scrollbar(parcela_container, orient="vertical", command=canvas_parcela.yview)
-        
-        self.scrollable_parcela = tk.Frame(canvas_parcela, bg='#3a6519')
-        
-        self.scrollable_parcela.bind(
-            "<Configure>",
-            lambda e: canvas_parcela.configure(scrollregion=canvas_parcela.bbox("all"))
-        )
+    @classmethod
+    def vacia(cls, semilla, configuracion=None):
+        """Simulación sin interfaz ni registro, lista para aplicar eventos"""
+        simulacion = cls.__new__(cls)
+        simulacion.configurar(semilla, **(configuracion or {}))
+        return simulacion
+    
+    @classmethod
+    def desde_estado(cls, estado, semilla, configuracion=None):
+        """Simulación sin interfaz restaurada desde una instantánea"""
+        simulacion = cls.vacia(semilla, configuracion)
+        simulacion.restaurar_estado(estado)
+        return simulacion
+    
+    @classmethod
+    def reproducir(cls, eventos, semilla, registro=None, configuracion=None):
+        """Reproduce una sesión completa sin interfaz, a máxima velocidad"""
+        simulacion = cls.vacia(semilla, configuracion)
+        simulacion.registro = registro
+        simulacion.aplicar_eventos(eventos)
+        return simulacion
+    
+    def aplicar_eventos(self, eventos):
+        """Aplica eventos registrados entregando a cada acción sus sorteos originales"""
+        for accion, args, sorteos in eventos:
+            self.rng.iniciar_captura(sorteos)
+            # Siempre la versión del modelo, nunca la de la interfaz
+            getattr(SimulacionPlatano, accion)(self, *args)
+            if self.registro is None:
+                self.rng.terminar_captura()
+    
+    def exportar_estado(self):
+        """Copia independiente del estado actual"""
+        estado = {campo: copy.deepcopy(getattr(self, campo)) for campo in self.campos_estado}
+        estado['rng'] = self.rng.getstate()
+        return estado
+    
+    def restaurar_estado(self, estado):
+        """Reemplaza el estado actual por una copia de `estado`"""
+        for campo in self.campos_estado:
+            setattr(self, campo, copy.deepcopy(estado[campo]))
+        self.rng.setstate(estado['rng'])
+    
+    def bifurcar(self):
+        """Simulación sin interfaz ni registro que continúa desde el estado actual.
+        
+        El historial de los sensores y los arreglos de las plantas quedan compartidos
+        hasta que alguna de las dos simulaciones los modifica, así que bifurcar cuesta
+        casi nada aunque la corrida lleve años.
+        """
+        rama = SimulacionPlatano.__new__(SimulacionPlatano)
+        rama.configurar(self.semilla, **self.configuracion)
+        rama.tablas_balance = self.tablas_balance  # mismos coeficientes, mismas tablas
+        estado = copy.deepcopy({campo: getattr(self, campo) for campo in self.campos_estado})
+        for campo, valor in estado.items():
+            setattr(rama, campo, valor)
+        rama.rng.setstate(self.rng.getstate())
+        return rama
+    
+    def crear_rama(self, escenario, meses=6):
+        """Bifurca el estado actual y lo avanza `meses` meses con el manejo de `escenario`"""
+        accion, *args = self.escenarios_rama[escenario] or (None,)
+        rama = self.bifurcar()
+        for _ in range(meses):
+            if accion:
+                getattr(rama, accion)(*args)
+            rama.avanzar_mes()
+        self.ramas.append((escenario, len(self.historial_humedad), rama))
+        return rama
+    
+    @accion_registrada
+    def sembrar_platano(self):
+        """Siembra una nueva tanda de plantas. Devuelve cuántas se sembraron."""
+        # Siembra escalonada: cada siembra agrega una nueva tanda de plantas
+        primera_siembra = not self.platano_sembrado
+        sembradas = self.crecimiento.sembrar(self.plantas_por_tanda, self.dia_simulacion)
+        if sembradas == 0:
+            return 0
         
-        canvas_parcela.create_window((0, 0), window=self.scrollable_parcela, anchor="nw")
-        canvas_parcela.configure(yscrollcommand=scrollbar_parcela.set)
+        self.platano_sembrado = True
+        if primera_siembra:
+            self.dias_desde_siembra = 0
+        self.etapa_crecimiento = self.crecimiento.etapa()
+        return sembradas
+    
+    @accion_registrada
+    def recargar_agua(self):
+        """Recarga la pileta de agua"""
+        self.nivel_agua = 100
+    
+    @accion_registrada
+    def regar_lado(self, lado):
+        """Riega un lado de la parcela. Devuelve los sensores regados, o None sin agua."""
+        return self.regar_areas(*self.areas_lado[lado])
+    
+    @accion_registrada
+    def abrir_valvulas(self, *valvulas):
+        """Riega las áreas de las válvulas indicadas. Devuelve los sensores regados, o None sin agua."""
+        areas = sorted({area for valvula in valvulas for area in self.valvulas[valvula]})
+        return self.regar_areas(*areas)
+    
+    @accion_registrada
+    def regar_areas(self, *areas):
+        """Riega las áreas indicadas. Devuelve los sensores regados, o None sin agua."""
+        aumentos = self.repartir_riego(areas)
+        if aumentos is None:
+            return None
+        
+        for sensor_id, aumento in aumentos:
+            data = self.datos_sensores[sensor_id]
+            aumento = self.aumento_suelo(sensor_id, data['humedad'], aumento)
+            nueva_humedad = min(self.coeficientes['humedad_suelo_max'], data['humedad'] + aumento)
+            data['humedad'] = round(nueva_humedad, 1)
+        return len(aumentos)
+    
+    @accion_registrada
+    def programar_riego(self, areas, dentro_de=0.0, duracion=1.0):
+        """Agenda un riego de las áreas que empieza en `dentro_de` días y dura `duracion` días"""
+        self.validar_programacion(dentro_de, duracion)
+        self.agenda.programar(self.agenda.ahora + dentro_de, 'inicio_riego', list(areas), duracion)
+    
+    @classmethod
+    def validar_programacion(cls, dentro_de, duracion=0.0):
+        """Rechaza un evento programado fuera de la agenda o un riego con pulsos desmedidos"""
+        if not math.isfinite(dentro_de) or dentro_de < 0:
+            raise ValueError(f"'dentro_de' debe ser un número de días finito y no negativo: {dentro_de}")
+        if not math.isfinite(duracion) or not 0 <= duracion <= cls.duracion_riego_maxima:
+            raise ValueError(f"'duracion' debe estar entre 0 y {cls.duracion_riego_maxima} días: {duracion}")
+    
+    @classmethod
+    def validar_recarga(cls, dentro_de, cantidad):
+        """Rechaza una recarga programada fuera de la agenda o que no sea un porcentaje de la pileta"""
+        cls.validar_programacion(dentro_de)
+        if not math.isfinite(cantidad) or not 0 < cantidad <= 100:
+            raise ValueError(f"'cantidad' debe estar entre 0 y 100 (% de la pileta): {cantidad}")
+    
+    @accion_registrada
+    def programar_recarga(self, dentro_de, cantidad=100):
+        """Agenda una recarga de la pileta para dentro de `dentro_de` días"""
+        self.validar_recarga(dentro_de, cantidad)
+        self.agenda.programar(self.agenda.ahora + dentro_de, 'recarga', cantidad)
+    
+    def repartir_riego(self, areas):
+        """Extrae el agua de un riego de la pileta y la reparte por la red.
         
-        canvas_parcela.pack(side="left", fill="both", expand=True)
-        scrollbar_parcela.pack(side="right", fill="y")
+        Devuelve [(sensor, aumento de humedad)] para los sensores de las áreas, o None
+        si no hay agua suficiente.
+        """
+        if self.nivel_agua < 10:
+            return None
         
-        # Canvas para dibujar la parcela dentro del frame scrollable
-        self.parcela_canvas = tk.Canvas(self.scrollable_parcela, bg='#5a8c2f', highlightthickness=0,
-                                       width=600, height=600)
-        self.parcela_canvas.pack(fill=tk.BOTH, expand=True, pady=10)
+        # Resolver el reparto de agua a través de la red
+        demandas = {area: self.demanda_riego_area for area in areas}
+        entregada, extraida = self.red.repartir(self.nivel_agua, demandas)
         
-        # Frame para controles de riego y siembra
-        controles_frame = tk.Frame(self.scrollable_parcela, bg='#3a6519')
-        controles_frame.pack(fill=tk.X, pady=10)
+        # Reducir nivel de agua
+        self.nivel_agua = max(0, self.nivel_agua - extraida)
+        self.agua_usada += extraida
+        
+        # Aumentar humedad según el agua que llegó a cada área
+        aumentos = []
+        for area in sorted(demandas):
+            # Aumentar humedad entre 15-25% con un riego completo
+            fraccion = entregada[area] / self.demanda_riego_area
+            for sensor_id in self.sensores_area[area]:
+                aumentos.append((sensor_id, self.rng.uniform(self.coeficientes['riego_min'],
+                                                             self.coeficientes['riego_max']) * fraccion))
+        return aumentos
+    
+    def riego_automatico(self, nivel_recarga=30):
+        """Política simple: recarga la pileta baja y riega las áreas bajo el rango ideal"""
+        if self.nivel_agua < nivel_recarga:
+            self.recargar_agua()
+        # Las áreas sin ningún sensor confiable no se riegan a ciegas
+        secas = [area for area, humedad in enumerate(self.humedad_confiable_por_area())
+                 if humedad is not None and humedad < self.humedad_ideal_min]
+        if secas:
+            self.regar_areas(*secas)
+        return secas
+    
+    @accion_registrada
+    def avanzar_mes(self):
+        """Avanza al siguiente mes en la simulación"""
+        self.dia_simulacion += 30
+        self.metricas.meses += 1
         
-        # Pileta de agua
-        pileta_frame = tk.LabelFrame(controles_frame, text="💧 PILETA DE AGUA", 
-                                   font=('Arial', 12, 'bold'), bg='#4a7c1f', fg='white',
-                                   padx=10, pady=10)
-        pileta_frame.pack(fill=tk.X, pady=5)
+        # Avanzar crecimiento del plátano con el clima y la humedad del mes que termina
+        if self.platano_sembrado:
+            self.dias_desde_siembra += 30  # 30 días por mes
+            
+            inicio = time.perf_counter()
+            clima = self.patrones_clima[self.meses[self.mes_actual]]
+            self.crecimiento.avanzar(clima['temperatura'], 30, self.humedad_por_area(),
+                                     self.humedad_ideal_min, self.humedad_ideal_max)
+            self.etapa_crecimiento = self.crecimiento.etapa()
+            self.metricas.latencia['crecimiento'].observar(time.perf_counter() - inicio)
         
-        # Botones de control de riego
-        botones_frame = tk.Frame(pileta_frame, bg='#4a7c1f')
-        botones_frame.pack(fill=tk.X, pady=5)
+        self.mes_actual = (self.mes_actual + 1) % 12
         
-        tk.Button(botones_frame, text="🚿 REGAR LADO IZQUIERDO", 
-                 command=lambda: self.regar_lado('izquierdo'),
-                 bg='#2196f3', fg='white', font=('Arial', 11, 'bold'),
-                 relief=tk.RAISED, bd=3, cursor='hand2', width=20).pack(side=tk.LEFT, padx=10)
+        # Recargar un poco de agua cada mes (lluvia natural)
+        self.nivel_agua = min(100, self.nivel_agua + 10)
         
-        tk.Button(botones_frame, text="🚿 REGAR LADO DERECHO", 
-                 command=lambda: self.regar_lado('derecho'),
-                 bg='#2196f3', fg='white', font=('Arial', 11, 'bold'),
-                 relief=tk.RAISED, bd=3, cursor='hand2', width=20).pack(side=tk.RIGHT, padx=10)
+        self.actualizar_simulacion()
+    
+    @accion_registrada
+    def reiniciar_simulacion(self):
+        """Reinicia la simulación a su estado inicial"""
+        self.estado_inicial()
+        self.inicializar_datos()
+        self.actualizar_simulacion()
+    
+    def humedad_por_area(self, areas=None):
+        """Humedad promedio de cada área (o solo de las `areas` indicadas)"""
+        if areas is None:
+            areas = range(self.num_areas)
+        humedades_areas = []
+        for area in areas:
+            sensores = self.sensores_area[area]
+            humedades_areas.append(sum(self.datos_sensores[sensor_id]['humedad']
+                                       for sensor_id in sensores) / len(sensores))
+        return humedades_areas
+    
+    def rejilla_humedad(self):
+        """Humedad de los sensores como rejilla: una fila por área de cada lado y, por
+        columnas, los sensores del lado izquierdo seguidos de los del derecho"""
+        izquierdo, derecho = self.areas_lado['izquierdo'], self.areas_lado['derecho']
+        return [[self.datos_sensores[sensor_id]['humedad']
+                 for area in par for sensor_id in self.sensores_area[area]]
+                for par in zip(izquierdo, derecho)]
+    
+    def humedad_confiable_por_area(self):
+        """Humedad promedio de cada área sin sensores sospechosos (None si no queda ninguno)"""
+        humedades_areas = []
+        for area in range(self.num_areas):
+            humedades = [self.datos_sensores[sensor_id]['humedad']
+                         for sensor_id in self.sensores_area[area]
+                         if not self.detector.sospechoso[sensor_id]]
+            humedades_areas.append(sum(humedades) / len(humedades) if humedades else None)
+        return humedades_areas
+    
+    def dias_proxima_etapa(self):
+        """Días estimados hasta la siguiente etapa con la temperatura del mes actual"""
+        temperatura = self.patrones_clima[self.meses[self.mes_actual]]['temperatura']
+        return self.crecimiento.dias_para_proxima_etapa(temperatura)
+    
+    def actualizar_simulacion(self):
+        """Avanza el clima del mes actual"""
+        inicio = time.perf_counter()
+        self.simular_clima()
+        self.metricas.latencia['clima'].observar(time.perf_counter() - inicio)
+    
+    def evapotranspiracion_referencia(self, mes):
+        """ET0 diaria (mm) de Hargreaves con la temperatura media del mes"""
+        clima = self.patrones_clima[self.meses[mes]]
+        coef = self.coeficientes
+        
+        # Radiación extraterrestre (FAO-56, ec. 21) a mitad de mes, en mm de agua evaporada
+        dia = 30 * mes + 15
+        phi = math.radians(self.latitud)
+        dr = 1 + 0.033 * math.cos(2 * math.pi * dia / 365)
+        declinacion = 0.409 * math.sin(2 * math.pi * dia / 365 - 1.39)
+        ws = math.acos(max(-1.0, min(1.0, -math.tan(phi) * math.tan(declinacion))))
+        ra = (24 * 60 / math.pi * 0.0820 * dr *
+              (ws * math.sin(phi) * math.sin(declinacion) +
+               math.cos(phi) * math.cos(declinacion) * math.sin(ws)))
+        
+        amplitud = coef['amplitud_termica'] + coef['amplitud_por_sequia'] * clima['sequia']
+        return 0.0023 * 0.408 * ra * (clima['temperatura'] + 17.8) * math.sqrt(amplitud)
+    
+    @classmethod
+    def saturacion_efectiva(cls, suelo, succion):
+        """Saturación efectiva (0-1) de van Genuchten a una succión en cm"""
+        p = cls.tipos_suelo[suelo]
+        m = 1 - 1 / p['n']
+        return (1 + (p['alfa'] * succion) ** p['n']) ** -m
+    
+    @classmethod
+    def succion(cls, suelo, saturacion):
+        """Succión (cm) a la que el suelo queda con esa saturación efectiva"""
+        p = cls.tipos_suelo[suelo]
+        m = 1 - 1 / p['n']
+        return (saturacion ** (-1 / m) - 1) ** (1 / p['n']) / p['alfa']
+    
+    @classmethod
+    def capacidad_hidrica(cls, suelo, succion):
+        """Pendiente de la curva de retención, dθ/dh (1/cm)"""
+        p = cls.tipos_suelo[suelo]
+        n, m = p['n'], 1 - 1 / p['n']
+        ah = p['alfa'] * succion
+        return ((p['theta_s'] - p['theta_r']) * p['alfa'] * n * m * ah ** (n - 1)
+                * (1 + ah ** n) ** (-m - 1))
+    
+    @classmethod
+    def conductividad(cls, suelo, saturacion):
+        """Conductividad no saturada de Mualem (cm/día)"""
+        p = cls.tipos_suelo[suelo]
+        m = 1 - 1 / p['n']
+        return p['ks'] * saturacion ** 0.5 * (1 - (1 - saturacion ** (1 / m)) ** m) ** 2
+    
+    def tablas_suelo(self, suelo):
+        """Lámina por punto y fracción diaria de drenaje de una textura, cada 0.5 puntos.
+        
+        La humedad medida es equivalente en succión: cada lectura corresponde a la succión
+        que tendría el suelo de referencia con esa humedad, así la banda ideal, el umbral
+        de estrés y la capacidad de campo valen para toda textura. Lo que cambia es cuánta
+        agua mueve un punto (la pendiente de la curva de retención) y qué tan rápido drena
+        el exceso (la conductividad de Mualem a esa succión).
+        """
+        coef = self.coeficientes
+        minima, maxima = coef['humedad_suelo_min'], coef['humedad_suelo_max']
+        puntos = int((maxima - minima) * 2) + 1
+        if suelo == self.suelo_referencia:
+            return {'lamina': array('d', [coef['lamina_por_punto']] * puntos),
+                    'drenaje': array('d', [coef['drenaje']] * puntos)}
+        
+        referencia = self.suelo_referencia
+        lamina, drenaje = array('d'), array('d')
+        for k in range(puntos):
+            # Los extremos (succión nula o infinita) se evalúan apenas dentro del rango
+            saturacion = min(0.999, max(0.001, k * 0.5 / (maxima - minima)))
+            succion = self.succion(referencia, saturacion)
+            relacion = (self.capacidad_hidrica(suelo, succion)
+                        / self.capacidad_hidrica(referencia, succion))
+            relacion = min(20.0, max(0.05, relacion))
+            flujo = (self.conductividad(suelo, self.saturacion_efectiva(suelo, succion))
+                     / self.conductividad(referencia, saturacion))
+            lamina.append(coef['lamina_por_punto'] * relacion)
+            drenaje.append(min(1.0, coef['drenaje'] * flujo / relacion))
+        return {'lamina': lamina, 'drenaje': drenaje}
+    
+    def aumento_suelo(self, sensor_id, humedad, aumento):
+        """Aumento de un sensor por el agua que sube `aumento` puntos al suelo de referencia"""
+        suelo = self.suelo_sensor[sensor_id]
+        if suelo == self.suelo_referencia:
+            return aumento
+        lamina = self.interpolar_tabla(self.curvas_suelo[suelo]['lamina'], humedad,
+                                       self.coeficientes['humedad_suelo_min'])
+        return aumento * self.coeficientes['lamina_por_punto'] / lamina
+    
+    def tabla_balance(self, mes, etapa, dias=30, suelo=None):
+        """Humedad tras `dias` días enteros según la humedad inicial, cada 0.5 puntos.
+        
+        El balance diario (lluvia infiltrada - ETc·Ks - drenaje) depende solo del mes, la
+        etapa y la textura, así que se calcula una vez por combinación y se guarda; cada
+        sensor luego solo interpola en la tabla de su suelo. Los periodos largos se obtienen
+        componiendo tablas de potencias de dos (30 = 16 + 8 + 4 + 2) en lugar de integrar
+        día a día cada fila.
+        """
+        suelo = suelo or self.suelo_referencia
+        clave = (mes, etapa, suelo, dias)
+        if clave in self.tablas_balance:
+            return self.tablas_balance[clave]
+        coef = self.coeficientes
+        minima = coef['humedad_suelo_min']
+        if dias > 1:
+            mitad = 1 << (dias.bit_length() - 1)
+            if mitad == dias:
+                mitad //= 2
+            despues = self.tabla_balance(mes, etapa, mitad, suelo)
+            antes = self.tabla_balance(mes, etapa, dias - mitad, suelo)
+            tabla = array('f', [self.interpolar_tabla(despues, h, minima) for h in antes])
+        else:
+            # Balance de un día; la lluvia de tormentas llega aparte como eventos
+            clima = self.patrones_clima[self.meses[mes]]
+            lluvia_diaria = (clima['lluvia'] * (1 - coef['fraccion_tormentas'])
+                             * coef['infiltracion'] / 30)
+            etc_diaria = self.evapotranspiracion_referencia(mes) * self.coeficientes_cultivo[etapa]
+            maxima = coef['humedad_suelo_max']
+            umbral, capacidad = coef['umbral_estres'], coef['capacidad_campo']
+            curvas = self.curvas_suelo.get(suelo) or self.tablas_suelo(suelo)
+            
+            tabla = array('f')
+            for k, lamina in enumerate(curvas['lamina']):
+                humedad = minima + k * 0.5
+                # Coeficiente de estrés hídrico: la transpiración cae al secarse el suelo
+                ks = min(1.0, (humedad - minima) / (umbral - minima)) if umbral > minima else 1.0
+                humedad += lluvia_diaria / lamina - ks * (etc_diaria / lamina)
+                if humedad > capacidad:
+                    drenaje = self.interpolar_tabla(curvas['drenaje'], humedad, minima)
+                    humedad -= drenaje * (humedad - capacidad)
+                tabla.append(max(minima, min(maxima, humedad)))
+        self.tablas_balance[clave] = tabla
+        return tabla
+    
+    @staticmethod
+    def interpolar_tabla(tabla, humedad, minima):
+        """Valor de una tabla de balance (grilla de 0.5 desde `minima`) en `humedad`"""
+        posicion = max(0.0, (humedad - minima) * 2)
+        k = min(int(posicion), len(tabla) - 2)
+        return tabla[k] + (posicion - k) * (tabla[k + 1] - tabla[k])
+    
+    def simular_clima(self):
+        """Simula el mes en curso atendiendo los eventos de su agenda"""
+        self.red.reiniciar_flujos()
+        inicio = self.dia_simulacion
+        fin = inicio + 30
+        self.programar_clima_mes(inicio, fin)
+        self.agenda.ejecutar_hasta(fin, self.atender_evento)
+    
+    def programar_clima_mes(self, inicio, fin):
+        """Agenda las tormentas, el cambio de etapa y la lectura de sensores del mes"""
+        clima = self.patrones_clima[self.meses[self.mes_actual]]
+        coef = self.coeficientes
+        
+        # Tormentas como proceso de Poisson con la lluvia de tormentas del mes
+        por_tormenta = coef['lluvia_por_tormenta']
+        tasa = clima['lluvia'] * coef['fraccion_tormentas'] / por_tormenta / (fin - inicio)
+        if tasa > 0:
+            tiempo = inicio + self.rng.expovariate(tasa)
+            while tiempo < fin:
+                self.agenda.programar(tiempo, 'tormenta', self.rng.expovariate(1 / por_tormenta))
+                tiempo += self.rng.expovariate(tasa)
+        
+        # Paso de etapa de la tanda más antigua (cambia el coeficiente de cultivo)
+        if self.platano_sembrado and 0 < self.etapa_crecimiento < 3:
+            dias = self.crecimiento.dias_para_proxima_etapa(clima['temperatura'])
+            if dias is not None and inicio + dias < fin:
+                self.agenda.programar(inicio + dias, 'cambio_etapa')
+        
+        self.agenda.programar(fin, 'lectura_sensores')
+    
+    def atender_evento(self, tiempo, tipo, datos):
+        """Lleva el suelo hasta `tiempo` y ejecuta el evento"""
+        self.evolucionar_suelo(tiempo)
+        getattr(self, 'evento_' + tipo)(*datos)
+        self.metricas.eventos[tipo] = self.metricas.eventos.get(tipo, 0) + 1
+    
+    def evolucionar_suelo(self, hasta):
+        """Aplica el balance hídrico de una vez desde el último evento hasta `hasta`"""
+        dias = hasta - self.reloj_suelo
+        if dias <= 0:
+            return
+        self.reloj_suelo = hasta
+        minima = self.coeficientes['humedad_suelo_min']
+        interpolar = self.interpolar_tabla
+        enteros = int(dias)
+        fraccion = dias - enteros
+        mes, etapa = self.mes_actual, self.etapa_crecimiento
+        for suelo, sensores in self.sensores_suelo.items():
+            tabla = self.tabla_balance(mes, etapa, enteros, suelo) if enteros else None
+            un_dia = self.tabla_balance(mes, etapa, 1, suelo) if fraccion else None
+            for sensor_id in sensores:
+                data = self.datos_sensores[sensor_id]
+                humedad = data['humedad']
+                if tabla is not None:
+                    humedad = interpolar(tabla, humedad, minima)
+                if un_dia is not None:
+                    humedad += fraccion * (interpolar(un_dia, humedad, minima) - humedad)
+                data['humedad'] = humedad
+    
+    def evento_tormenta(self, lluvia):
+        """Una tormenta de `lluvia` mm moja toda la parcela"""
+        coef = self.coeficientes
+        aumento = lluvia * coef['infiltracion'] / coef['lamina_por_punto']
+        for sensor_id, data in self.datos_sensores.items():
+            data['humedad'] = min(coef['humedad_suelo_max'], data['humedad']
+                                  + self.aumento_suelo(sensor_id, data['humedad'], aumento))
+    
+    def evento_cambio_etapa(self):
+        """La tanda más antigua pasa de etapa a mitad de mes"""
+        self.etapa_crecimiento = min(3, self.etapa_crecimiento + 1)
+    
+    def evento_recarga(self, cantidad):
+        """Recarga programada de la pileta"""
+        self.nivel_agua = min(100, self.nivel_agua + cantidad)
+    
+    def evento_inicio_riego(self, areas, duracion):
+        """Extrae el agua del riego y la entrega en pulsos repartidos durante `duracion` días"""
+        aumentos = self.repartir_riego(areas)
+        if not aumentos:
+            return
+        pulsos = max(1, math.ceil(duracion))
+        pulso = [(sensor_id, aumento / pulsos) for sensor_id, aumento in aumentos]
+        for k in range(1, pulsos + 1):
+            self.agenda.programar(self.agenda.ahora + duracion * k / pulsos, 'pulso_riego', pulso)
+    
+    def evento_pulso_riego(self, pulso):
+        """Entrega una parte del agua de un riego en curso"""
+        maxima = self.coeficientes['humedad_suelo_max']
+        for sensor_id, aumento in pulso:
+            data = self.datos_sensores[sensor_id]
+            data['humedad'] = min(maxima, data['humedad']
+                                  + self.aumento_suelo(sensor_id, data['humedad'], aumento))
+    
+    def evento_lectura_sensores(self):
+        """Lectura de fin de mes: variación local, historial, detector y reglas de alerta"""
+        coef = self.coeficientes
+        minima, maxima = coef['humedad_suelo_min'], coef['humedad_suelo_max']
+        for data in self.datos_sensores.values():
+            nueva_humedad = data['humedad'] + self.rng.uniform(-5, 5)
+            nueva_humedad = max(minima, min(maxima, nueva_humedad))
+            
+            data['humedad'] = round(nueva_humedad, 1)
         
-        # Botón para sembrar plátano
-        siembra_frame = tk.Frame(pileta_frame, bg='#4a7c1f')
-        siembra_frame.pack(fill=tk.X, pady=5)
+        # Registrar datos para historial
+        humedades = [sensor['humedad'] for sensor in self.datos_sensores.values()]
+        humedad_promedio = sum(humedades) / len(humedades)
+        self.historial_humedad.append(humedad_promedio)
+        for historial, humedad in zip(self.historial_sensores, humedades):
+            historial.append(humedad)
+        self.estadisticas.registrar(humedades, self.sensores_area, 30)
         
-        self.btn_sembrar = tk.Button(siembra_frame, text="🌱 SEMBRAR PLÁTANO", 
-                                    command=self.sembrar_platano,
-                                    bg='#4caf50', fg='white', font=('Arial', 12, 'bold'),
-                                    relief=tk.RAISED, bd=3, cursor='hand2', width=25)
-        self.btn_sembrar.pack(pady=5)
+        # Marcar sensores con lecturas sospechosas
+        sospechosos = set(self.detector.actualizar(humedades, self.coeficientes['humedad_suelo_min'],
+                                                   self.coeficientes['humedad_suelo_max']))
+        for sensor_id, data in self.datos_sensores.items():
+            data['estado'] = "Sospechoso" if sensor_id in sospechosos else "Normal"
         
-        # Indicador de nivel de agua y estado del cultivo
-        info_frame = tk.Frame(pileta_frame, bg='#4a7c1f')
-        info_frame.pack(fill=tk.X, pady=5)
+        # Avanzar las rachas de las reglas de alerta con duración
+        self.reglas_alerta.actualizar_rachas(self, self.rachas_alerta)
+    
+    def resumen_estado(self):
+        """Estado actual en tipos simples, apto para JSON"""
+        return {
+            'mes': self.meses[self.mes_actual],
+            'dia': self.dia_simulacion,
+            'nivel_agua': round(self.nivel_agua, 1),
+            'sensores': [self.datos_sensores[i]['humedad'] for i in range(self.total_sensores)],
+            'sospechosos': [i for i, marcado in enumerate(self.detector.sospechoso) if marcado],
+            'percentiles': dict(zip(('p10', 'p50', 'p90'), self.estadisticas.percentiles())),
+            'tiempo_en_bandas': dict(zip(EstadisticasHumedad.bandas,
+                                         (round(f, 3) for f in self.estadisticas.fraccion_bandas()))),
+            'cultivo': {
+                'sembrado': self.platano_sembrado,
+                'etapa': self.etapa_crecimiento,
+                'dias_desde_siembra': self.dias_desde_siembra,
+                'plantas': self.crecimiento.total_plantas,
+                'rendimiento_kg': round(self.crecimiento.rendimiento_total(), 1),
+            },
+            'alertas': self.calcular_alertas(),
+        }
+    
+    def calcular_alertas(self):
+        """Lista de alertas con el estado actual"""
+        activas = self.reglas_alerta.evaluar(self, self.rachas_alerta)
+        
+        # Alertas de sensores individuales
+        alertas_nuevas = [mensaje for medida, _, mensaje in activas if medida == 'sensor']
+        
+        # Verificar sensores con lecturas sospechosas
+        for sensor_id, motivo in enumerate(self.detector.motivo):
+            if motivo:
+                alertas_nuevas.append(f"🔧 Sensor {sensor_id + 1}: LECTURA SOSPECHOSA ({motivo})")
+        
+        # Pileta, cultivo y demás reglas
+        alertas_nuevas.extend(mensaje for medida, _, mensaje in activas if medida != 'sensor')
+        self.metricas.alertas_activas = len(alertas_nuevas)
+        return alertas_nuevas
+
+
+class HistogramaLatencia:
+    """Histograma de duraciones con límites fijos, al estilo de Prometheus.
+    
+    Las cuentas viven en un arreglo reservado de antemano: observar solo busca el cubo
+    con bisect e incrementa un entero, sin crear listas ni diccionarios.
+    """
+    
+    __slots__ = ('limites', 'cuentas', 'suma')
+    
+    def __init__(self, limites):
+        self.limites = tuple(limites)
+        self.cuentas = array('Q', bytes(8 * (len(self.limites) + 1)))  # el último cubo es +Inf
+        self.suma = 0.0
+    
+    def observar(self, segundos):
+        self.cuentas[bisect.bisect_left(self.limites, segundos)] += 1
+        self.suma += segundos
+    
+    def lineas(self, nombre, etiquetas):
+        """Líneas de texto _bucket (acumuladas), _sum y _count"""
+        lineas = []
+        acumulado = 0
+        for limite, cuenta in zip(self.limites + ('+Inf',), self.cuentas):
+            acumulado += cuenta
+            lineas.append(f'{nombre}_bucket{{{etiquetas},le="{limite}"}} {acumulado}')
+        lineas.append(f'{nombre}_sum{{{etiquetas}}} {self.suma}')
+        lineas.append(f'{nombre}_count{{{etiquetas}}} {acumulado}')
+        return lineas
+
+
+class MetricasSimulacion:
+    """Contadores e histogramas de ejecución, expuestos en el formato de texto de Prometheus.
+    
+    Los pasos por segundo se obtienen en Prometheus con rate(platano_meses_simulados_total[1m]).
+    """
+    
+    fases = ('crecimiento', 'clima', 'interfaz', 'alertas')
+    limites_latencia = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+    
+    def __init__(self):
+        self.latencia = {fase: HistogramaLatencia(self.limites_latencia) for fase in self.fases}
+        self.meses = 0              # meses simulados
+        self.eventos = {}           # tipo de evento de la agenda -> cantidad atendida
+        self.alertas_activas = 0    # alertas en la última evaluación
+        self.alertas_mostradas = 0  # alertas mostradas al usuario por la interfaz
+    
+    def texto(self, medidores=()):
+        """Exposición completa; `medidores` son (nombre, ayuda, valor) leídos al momento"""
+        lineas = ['# HELP platano_fase_segundos Duración de cada fase de la actualización mensual',
+                  '# TYPE platano_fase_segundos histogram']
+        for fase, histograma in self.latencia.items():
+            lineas.extend(histograma.lineas('platano_fase_segundos', f'fase="{fase}"'))
+        lineas += ['# HELP platano_meses_simulados_total Meses simulados',
+                   '# TYPE platano_meses_simulados_total counter',
+                   f'platano_meses_simulados_total {self.meses}',
+                   '# HELP platano_eventos_total Eventos de la agenda atendidos por tipo',
+                   '# TYPE platano_eventos_total counter']
+        lineas += [f'platano_eventos_total{{tipo="{tipo}"}} {cantidad}'
+                   for tipo, cantidad in sorted(self.eventos.items())]
+        lineas += ['# HELP platano_alertas_mostradas_total Alertas mostradas por la interfaz',
+                   '# TYPE platano_alertas_mostradas_total counter',
+                   f'platano_alertas_mostradas_total {self.alertas_mostradas}']
+        for nombre, ayuda, valor in (('platano_alertas_activas', 'Alertas activas', self.alertas_activas),
+                                     *medidores):
+            lineas += [f'# HELP {nombre} {ayuda}', f'# TYPE {nombre} gauge', f'{nombre} {valor}']
+        return ('\n'.join(lineas) + '\n').encode()
+
+
+class ServidorAPI:
+    """Servidor HTTP/WebSocket local (asyncio) para consultar la simulación y darle órdenes.
+    
+    El estado se publica desde el hilo de la simulación tras cada acción y se sirve desde
+    una copia ya serializada, así los clientes nunca bloquean el bucle de simulación.
+    """
+    
+    GUID_WEBSOCKET = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+    
+    def __init__(self, simulacion, host='127.0.0.1', puerto=8765, ejecutar=None):
+        self.simulacion = simulacion
+        self.host = host
+        self.puerto = puerto
+        # ejecutar(acción, args) -> concurrent.futures.Future resuelto en el hilo de la simulación
+        self.ejecutar = ejecutar or self.ejecutar_directo
+        self.loop = None
+        self.clientes_ws = set()
+        self.estado_previo = None
+        self.estado_json = b'{}'
+        self.historial_json = b'[]'
+        self.alertas_json = b'[]'
+        simulacion.observadores.append(self.publicar)
+        self.publicar(simulacion, 'iniciar')
+    
+    # --- Lado de la simulación ---
+    
+    def ejecutar_directo(self, accion, args):
+        """Ejecuta la orden en el hilo actual (modo sin interfaz)"""
+        futuro = concurrent.futures.Future()
+        try:
+            futuro.set_result(getattr(self.simulacion, accion)(*args))
+        except Exception as error:
+            futuro.set_exception(error)
+        return futuro
+    
+    def publicar(self, simulacion, accion):
+        """Serializa el estado y envía a los clientes WebSocket lo que cambió"""
+        estado = simulacion.resumen_estado()
+        previo = self.estado_previo
+        if previo is None or accion in ('iniciar', 'reiniciar_simulacion'):
+            delta = dict(estado, tipo='estado')
+        else:
+            delta = {'tipo': 'delta'}
+            for clave, valor in estado.items():
+                if clave == 'sensores':
+                    cambios = {i: h for i, (h, h_prev) in enumerate(zip(valor, previo['sensores']))
+                               if h != h_prev}
+                    if cambios:
+                        delta['sensores'] = cambios
+                elif valor != previo[clave]:
+                    delta[clave] = valor
+        delta['accion'] = accion
+        self.estado_previo = estado
+        
+        estado_json = json.dumps(estado).encode()
+        historial_json = json.dumps(simulacion.historial_humedad).encode()
+        alertas_json = json.dumps(estado['alertas']).encode()
+        trama = self.trama_texto(json.dumps(delta).encode())
+        if self.loop is None:
+            self.actualizar_copias(estado_json, historial_json, alertas_json, None)
+        else:
+            self.loop.call_soon_threadsafe(self.actualizar_copias, estado_json,
+                                           historial_json, alertas_json, trama)
+    
+    # --- Lado del servidor (hilo del bucle asyncio) ---
+    
+    def actualizar_copias(self, estado_json, historial_json, alertas_json, trama):
+        self.estado_json = estado_json
+        self.historial_json = historial_json
+        self.alertas_json = alertas_json
+        if trama is None:
+            return
+        for cola in self.clientes_ws:
+            if cola.full():
+                # Cliente lento: se descartan sus deltas pendientes y se le reenvía el estado
+                while not cola.empty():
+                    cola.get_nowait()
+                cola.put_nowait(self.trama_texto(b'{"tipo": "estado", ' + self.estado_json[1:]))
+            else:
+                cola.put_nowait(trama)
+    
+    async def servir(self):
+        """Atiende conexiones hasta que se cancele la tarea"""
+        self.loop = asyncio.get_running_loop()
+        servidor = await asyncio.start_server(self.atender, self.host, self.puerto,
+                                              backlog=1024)
+        async with servidor:
+            await servidor.serve_forever()
+    
+    def iniciar_en_hilo(self):
+        """Corre el servidor en un hilo propio (junto a la interfaz gráfica)"""
+        hilo = threading.Thread(target=asyncio.run, args=(self.servir(),), daemon=True)
+        hilo.start()
+        return hilo
+    
+    async def atender(self, lector, escritor):
+        try:
+            linea = await lector.readline()
+            metodo, ruta, _ = linea.decode('latin-1').split(' ', 2)
+            cabeceras = {}
+            while True:
+                linea = await lector.readline()
+                if linea in (b'\r\n', b'\n', b''):
+                    break
+                nombre, _, valor = linea.decode('latin-1').partition(':')
+                cabeceras[nombre.strip().lower()] = valor.strip()
+            
+            if cabeceras.get('upgrade', '').lower() == 'websocket':
+                await self.atender_websocket(lector, escritor, cabeceras)
+                return
+            
+            cuerpo = b''
+            if int(cabeceras.get('content-length', 0)):
+                cuerpo = await lector.readexactly(int(cabeceras['content-length']))
+            ruta = ruta.split('?')[0]
+            estado, respuesta = await self.responder(metodo, ruta, cuerpo)
+            tipo = b'text/plain; version=0.0.4' if ruta == '/metrics' else b'application/json'
+            self.escribir_respuesta(escritor, estado, respuesta, tipo)
+            await escritor.drain()
+        except (ValueError, ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            escritor.close()
+    
+    @staticmethod
+    def escribir_respuesta(escritor, estado, respuesta, tipo=b'application/json'):
+        escritor.write(b'HTTP/1.1 %d %s\r\nContent-Type: %s\r\n'
+                       b'Content-Length: %d\r\nConnection: close\r\n\r\n'
+                       % (estado, HTTPStatus(estado).phrase.encode(), tipo, len(respuesta)))
+        escritor.write(respuesta)
+    
+    async def responder(self, metodo, ruta, cuerpo):
+        """Devuelve (código HTTP, cuerpo JSON) para una petición"""
+        if metodo == 'GET':
+            copias = {'/estado': self.estado_json, '/historial': self.historial_json,
+                      '/alertas': self.alertas_json}
+            if ruta in copias:
+                return 200, copias[ruta]
+            if ruta == '/metrics':
+                return 200, self.metricas()
+            return 404, b'{"error": "ruta desconocida"}'
+        
+        if metodo != 'POST':
+            return 405, b'{"error": "metodo no permitido"}'
+        try:
+            datos = json.loads(cuerpo or b'{}')
+            if not isinstance(datos, dict):
+                raise ValueError("el cuerpo debe ser un objeto JSON")
+            accion, args = self.traducir_orden(ruta, datos)
+        except (ValueError, KeyError, TypeError) as error:
+            return 400, json.dumps({'error': str(error)}).encode()
+        
+        # Los errores de la propia acción también llegan al cliente en vez de cortar la conexión
+        try:
+            resultado = await asyncio.wrap_future(self.ejecutar(accion, args))
+        except (ValueError, KeyError, TypeError) as error:
+            return 400, json.dumps({'error': str(error)}).encode()
+        except Exception as error:
+            return 500, json.dumps({'error': f"{type(error).__name__}: {error}"}).encode()
+        return 200, json.dumps({'ok': True, 'resultado': resultado}).encode()
+    
+    def metricas(self):
+        """Métricas de la simulación y del servidor en formato Prometheus"""
+        simulacion = self.simulacion
+        ordenes = getattr(simulacion, 'ordenes', None)
+        medidores = [
+            ('platano_nivel_agua_porcentaje', 'Nivel de la pileta', simulacion.nivel_agua),
+            ('platano_agua_usada', 'Agua extraída de la pileta en la simulación', simulacion.agua_usada),
+            ('platano_agenda_pendientes', 'Eventos en la agenda', len(simulacion.agenda.cola)),
+            ('platano_ordenes_pendientes', 'Órdenes remotas esperando a la interfaz',
+             ordenes.qsize() if ordenes is not None else 0),
+            ('platano_clientes_websocket', 'Clientes WebSocket conectados', len(self.clientes_ws)),
+            ('platano_tramas_pendientes', 'Tramas WebSocket en cola de envío',
+             sum(cola.qsize() for cola in self.clientes_ws)),
+        ]
+        return simulacion.metricas.texto(medidores)
+    
+    def programacion(self, datos):
+        """Lee y valida (dentro_de, duracion) de un riego programado antes de encolarlo"""
+        dentro_de, duracion = float(datos.get('dentro_de', 0)), float(datos.get('duracion', 1))
+        SimulacionPlatano.validar_programacion(dentro_de, duracion)
+        return dentro_de, duracion
+    
+    def traducir_orden(self, ruta, datos):
+        """Convierte una ruta POST y su cuerpo en (acción del modelo, argumentos)"""
+        if ruta == '/regar':
+            if 'valvula' in datos:
+                valvula = int(datos['valvula'])
+                if not 0 <= valvula < len(self.simulacion.valvulas):
+                    raise ValueError(f"válvula fuera de rango: {valvula}")
+                if 'dentro_de' in datos or 'duracion' in datos:
+                    return 'programar_riego', (list(self.simulacion.valvulas[valvula]),
+                                               *self.programacion(datos))
+                return 'abrir_valvulas', (valvula,)
+            if 'area' in datos:
+                area = int(datos['area'])
+                if not 0 <= area < self.simulacion.num_areas:
+                    raise ValueError(f"área fuera de rango: {area}")
+                if 'dentro_de' in datos or 'duracion' in datos:
+                    return 'programar_riego', ([area], *self.programacion(datos))
+                return 'regar_areas', (area,)
+            if datos.get('lado') not in ('izquierdo', 'derecho'):
+                raise ValueError("se requiere 'lado' (izquierdo/derecho), 'area' o 'valvula'")
+            if 'dentro_de' in datos or 'duracion' in datos:
+                return 'programar_riego', (list(self.simulacion.areas_lado[datos['lado']]),
+                                           *self.programacion(datos))
+            return 'regar_lado', (datos['lado'],)
+        if ruta == '/recargar' and ('dentro_de' in datos or 'cantidad' in datos):
+            dentro_de, cantidad = float(datos.get('dentro_de', 0)), float(datos.get('cantidad', 100))
+            SimulacionPlatano.validar_recarga(dentro_de, cantidad)
+            return 'programar_recarga', (dentro_de, cantidad)
+        ordenes = {'/sembrar': 'sembrar_platano', '/recargar': 'recargar_agua',
+                   '/avanzar': 'avanzar_mes'}
+        if ruta not in ordenes:
+            raise KeyError(f"orden desconocida: {ruta}")
+        return ordenes[ruta], ()
+    
+    async def atender_websocket(self, lector, escritor, cabeceras):
+        if 'sec-websocket-key' not in cabeceras:
+            self.escribir_respuesta(escritor, 400, b'{"error": "falta Sec-WebSocket-Key"}')
+            await escritor.drain()
+            return
+        clave = cabeceras['sec-websocket-key'] + self.GUID_WEBSOCKET
+        aceptacion = base64.b64encode(hashlib.sha1(clave.encode()).digest())
+        escritor.write(b'HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\n'
+                       b'Connection: Upgrade\r\nSec-WebSocket-Accept: ' + aceptacion + b'\r\n\r\n')
+        
+        cola = asyncio.Queue(maxsize=64)
+        cola.put_nowait(self.trama_texto(b'{"tipo": "estado", ' + self.estado_json[1:]))
+        self.clientes_ws.add(cola)
+        envio = asyncio.create_task(self.enviar_tramas(cola, escritor))
+        try:
+            # Solo se leen tramas del cliente para detectar el cierre
+            while True:
+                cabecera = await lector.readexactly(2)
+                codigo = cabecera[0] & 0x0F
+                largo = cabecera[1] & 0x7F
+                if largo == 126:
+                    largo = int.from_bytes(await lector.readexactly(2), 'big')
+                elif largo == 127:
+                    largo = int.from_bytes(await lector.readexactly(8), 'big')
+                if cabecera[1] & 0x80:
+                    largo += 4  # máscara
+                await lector.readexactly(largo)
+                if codigo == 0x8:
+                    break
+        finally:
+            self.clientes_ws.discard(cola)
+            envio.cancel()
+    
+    async def enviar_tramas(self, cola, escritor):
+        while True:
+            escritor.write(await cola.get())
+            await escritor.drain()
+    
+    @staticmethod
+    def trama_texto(datos):
+        """Trama WebSocket de texto sin máscara (servidor -> cliente)"""
+        largo = len(datos)
+        if largo < 126:
+            cabecera = bytes((0x81, largo))
+        elif largo < 65536:
+            cabecera = bytes((0x81, 126)) + largo.to_bytes(2, 'big')
+        else:
+            cabecera = bytes((0x81, 127)) + largo.to_bytes(8, 'big')
+        return cabecera + datos
+
+
+class EstadoCompartido:
+    """Estado de la simulación en un archivo mapeado en memoria, con formato versionado.
+    
+    Un solo proceso escribe (la simulación, tras cada acción) y cualquier cantidad de
+    procesos lo leen sin serializar: los arreglos se exponen como memoryview sobre el mapa.
+    La consistencia entre campos se logra con un seqlock: el escritor deja la secuencia
+    impar mientras escribe y los lectores repiten la lectura si cambió entre medio.
+    
+    Formato (versión 1, little-endian): encabezado, humedad por sensor (float32), marca de
+    sospechoso por sensor (uint8, alineado a 8 bytes), humedad por área (float32), anillo
+    de `capacidad` meses de lecturas por sensor (float32) y anillo del promedio (float64).
+    """
+    
+    magia = b'PLAT'
+    version = 1
+    # magia, versión, secuencia, sensores, áreas, capacidad del anillo, meses escritos,
+    # mes actual, día de simulación, etapa del cultivo, nivel de agua, agua usada
+    encabezado = struct.Struct('<4sIQIIIIiii4xdd')
+    offset_secuencia = 8
+    
+    def __init__(self, mapa):
+        self.mapa = mapa
+        magia, version, _, sensores, areas, capacidad, _, _, _, _, _, _ = \
+            self.encabezado.unpack_from(mapa)
+        if magia != self.magia or version != self.version:
+            raise ValueError(f"Formato de estado compartido no soportado: {magia!r} v{version}")
+        self.num_sensores, self.num_areas, self.capacidad = sensores, areas, capacidad
+    
+        # Vistas sin copia sobre cada sección del mapa
+        self.vista = memoryview(mapa)
+        offset = self.encabezado.size
+        secciones = {}
+        for nombre, formato, cantidad in self.secciones(sensores, areas, capacidad):
+            largo = struct.calcsize(formato) * cantidad
+            secciones[nombre] = self.vista[offset:offset + largo].cast(formato)
+            offset += -(-largo // 8) * 8
+        self.humedad = secciones['humedad']
+        self.sospechoso = secciones['sospechoso']
+        self.humedad_area = secciones['humedad_area']
+        self.historial = secciones['historial']
+        self.historial_promedio = secciones['historial_promedio']
+        self.meses_escritos = 0  # meses del historial ya copiados (lado del escritor)
+    
+    @staticmethod
+    def secciones(sensores, areas, capacidad):
+        return (('humedad', 'f', sensores), ('sospechoso', 'B', sensores),
+                ('humedad_area', 'f', areas), ('historial', 'f', capacidad * sensores),
+                ('historial_promedio', 'd', capacidad))
+    
+    @classmethod
+    def tamaño(cls, sensores, areas, capacidad):
+        return cls.encabezado.size + sum(-(-struct.calcsize(formato) * cantidad // 8) * 8
+                                         for _, formato, cantidad in
+                                         cls.secciones(sensores, areas, capacidad))
+    
+    @classmethod
+    def crear(cls, ruta, simulacion, capacidad=1200):
+        """Crea (o reemplaza) el archivo y publica en él cada acción de `simulacion`"""
+        sensores, areas = simulacion.total_sensores, simulacion.num_areas
+        with open(ruta, 'w+b') as archivo:
+            archivo.truncate(cls.tamaño(sensores, areas, capacidad))
+            mapa = mmap.mmap(archivo.fileno(), 0)
+        cls.encabezado.pack_into(mapa, 0, cls.magia, cls.version, 0, sensores, areas, capacidad,
+                                 0, 0, 0, 0, 0.0, 0.0)
+        compartido = cls(mapa)
+        simulacion.observadores.append(compartido.publicar)
+        if simulacion.datos_sensores:
+            compartido.publicar(simulacion, 'iniciar')
+        return compartido
+    
+    @classmethod
+    def abrir(cls, ruta):
+        """Se conecta como lector a un estado publicado por otro proceso"""
+        with open(ruta, 'rb') as archivo:
+            mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(mapa)
+    
+    @property
+    def secuencia(self):
+        return int.from_bytes(self.mapa[self.offset_secuencia:self.offset_secuencia + 8], 'little')
+    
+    def publicar(self, simulacion, accion):
+        """Copia el estado de la simulación al mapa (observador de acciones)"""
+        secuencia = self.secuencia + 1
+        struct.pack_into('<Q', self.mapa, self.offset_secuencia, secuencia)  # impar: escribiendo
+    
+        for i in range(self.num_sensores):
+            self.humedad[i] = simulacion.datos_sensores[i]['humedad']
+        self.sospechoso[:] = bytes(simulacion.detector.sospechoso)
+        for area, humedad in enumerate(simulacion.humedad_por_area()):
+            self.humedad_area[area] = humedad
+    
+        # Meses nuevos del historial; tras un reinicio el anillo vuelve a empezar
+        meses = len(simulacion.historial_humedad)
+        if meses < self.meses_escritos:
+            self.meses_escritos = 0
+        n = self.num_sensores
+        for mes in range(max(self.meses_escritos, meses - self.capacidad), meses):
+            fila = mes % self.capacidad
+            for i, serie in enumerate(simulacion.historial_sensores):
+                self.historial[fila * n + i] = serie[mes]
+            self.historial_promedio[fila] = simulacion.historial_humedad[mes]
+        self.meses_escritos = meses
+    
+        self.encabezado.pack_into(self.mapa, 0, self.magia, self.version, secuencia,
+                                  n, self.num_areas, self.capacidad, meses,
+                                  simulacion.mes_actual, simulacion.dia_simulacion,
+                                  simulacion.etapa_crecimiento, simulacion.nivel_agua,
+                                  simulacion.agua_usada)
+        struct.pack_into('<Q', self.mapa, self.offset_secuencia, secuencia + 1)  # par: listo
+    
+    def leer(self, meses_historial=0):
+        """Copia consistente del estado actual y de los últimos `meses_historial` meses"""
+        while True:
+            inicio = self.secuencia
+            if inicio % 2:
+                time.sleep(0)
+                continue
+            (_, _, _, n, _, capacidad, meses, mes, dia, etapa, nivel_agua,
+             agua_usada) = self.encabezado.unpack_from(self.mapa)
+            estado = {
+                'secuencia': inicio,
+                'mes': mes,
+                'dia': dia,
+                'etapa': etapa,
+                'nivel_agua': nivel_agua,
+                'agua_usada': agua_usada,
+                'sensores': self.humedad.tolist(),
+                'sospechosos': [i for i, marcado in enumerate(self.sospechoso) if marcado],
+                'areas': self.humedad_area.tolist(),
+                'meses': meses,
+            }
+            ultimos = range(max(0, meses - min(meses_historial, capacidad)), meses)
+            estado['historial'] = [self.historial_promedio[m % capacidad] for m in ultimos]
+            estado['historial_sensores'] = [
+                self.historial[m % capacidad * n:(m % capacidad + 1) * n].tolist() for m in ultimos]
+            if self.secuencia == inicio:
+                return estado
+    
+    def cerrar(self):
+        """Libera las vistas y el mapa (el archivo queda para otros lectores)"""
+        for vista in (self.humedad, self.sospechoso, self.humedad_area,
+                      self.historial, self.historial_promedio, self.vista):
+            vista.release()
+        self.mapa.close()
+
+
+def hipercubo_latino(muestras, dimensiones, rng):
+    """Muestreo por hipercubo latino en [0, 1)^d: un punto por estrato en cada dimensión"""
+    columnas = []
+    for _ in range(dimensiones):
+        estratos = list(range(muestras))
+        rng.shuffle(estratos)
+        columnas.append([(e + rng.random()) / muestras for e in estratos])
+    return [list(fila) for fila in zip(*columnas)]
+
+
+def evaluar_coeficientes(coeficientes, semilla, meses):
+    """Salidas de una corrida: (meses fuera de la banda ideal, agua usada)"""
+    sim = SimulacionPlatano(semilla=semilla, registrar=False, coeficientes=coeficientes)
+    fuera = 0
+    for _ in range(meses):
+        sim.avanzar_mes()
+        if not sim.humedad_ideal_min <= sim.historial_humedad[-1] <= sim.humedad_ideal_max:
+            fuera += 1
+        sim.riego_automatico()
+    return fuera, sim.agua_usada
+
+
+def evaluar_lote(lote):
+    """Evalúa un lote de conjuntos de coeficientes en un proceso de trabajo"""
+    return [evaluar_coeficientes(coeficientes, semilla, meses)
+            for coeficientes, semilla, meses in lote]
+
+
+class AnalisisSensibilidad:
+    """Índices de Sobol de primer orden y totales de los coeficientes del modelo"""
+    
+    # Rango de muestreo de cada coeficiente
+    rangos = {
+        'infiltracion': (0.6, 0.95),
+        'lamina_por_punto': (3.0, 5.0),
+        'capacidad_campo': (80, 90),
+        'drenaje': (0.1, 0.5),
+        'umbral_estres': (45, 60),
+        'amplitud_termica': (6.0, 10.0),
+        'amplitud_por_sequia': (0.05, 0.15),
+        'humedad_suelo_min': (25, 35),
+        'humedad_suelo_max': (90, 98),
+        'riego_min': (10, 20),
+        'riego_max': (20, 30),
+        'humedad_ideal_min': (60, 70),
+        'humedad_ideal_max': (75, 85),
+        'fraccion_tormentas': (0.3, 0.7),
+        'lluvia_por_tormenta': (15, 35),
+    }
+    salidas = ('meses_fuera_de_banda', 'agua_usada')
+    
+    def __init__(self, muestras, meses=24, semilla=0, procesos=None):
+        self.muestras = muestras
+        self.meses = meses
+        self.semilla = semilla
+        self.procesos = procesos
+        self.nombres = list(self.rangos)
+    
+    def escalar(self, fila):
+        return {nombre: bajo + u * (alto - bajo)
+                for nombre, u, (bajo, alto) in zip(self.nombres, fila, self.rangos.values())}
+    
+    def diseño(self):
+        """Matrices A, B y A_B^i del esquema de Saltelli (N·(d+2) corridas)"""
+        rng = random.Random(self.semilla)
+        d = len(self.nombres)
+        # A y B salen de un mismo hipercubo de 2d columnas para que sean independientes
+        muestra = hipercubo_latino(self.muestras, 2 * d, rng)
+        matriz_a = [fila[:d] for fila in muestra]
+        matriz_b = [fila[d:] for fila in muestra]
+        matrices_ab = [[a[:i] + [b[i]] + a[i + 1:] for a, b in zip(matriz_a, matriz_b)]
+                       for i in range(d)]
+        return matriz_a, matriz_b, matrices_ab
+    
+    def ejecutar(self):
+        """Corre todas las simulaciones en paralelo y devuelve los índices por salida"""
+        matriz_a, matriz_b, matrices_ab = self.diseño()
+        filas = matriz_a + matriz_b + [fila for matriz in matrices_ab for fila in matriz]
+        # Todas las corridas de la fila j comparten semilla: solo varían los coeficientes
+        trabajos = [(self.escalar(fila), self.semilla + j % self.muestras, self.meses)
+                    for j, fila in enumerate(filas)]
+        tamaño = max(1, len(trabajos) // (64 * (self.procesos or os.cpu_count() or 1)))
+        lotes = [trabajos[i:i + tamaño] for i in range(0, len(trabajos), tamaño)]
+        with concurrent.futures.ProcessPoolExecutor(self.procesos) as ejecutor:
+            resultados = [r for lote in ejecutor.map(evaluar_lote, lotes) for r in lote]
+        
+        n = self.muestras
+        indices = {}
+        for k, salida in enumerate(self.salidas):
+            valores = [r[k] for r in resultados]
+            f_a, f_b = valores[:n], valores[n:2 * n]
+            media = sum(f_a + f_b) / (2 * n)
+            varianza = sum((v - media) ** 2 for v in f_a + f_b) / (2 * n)
+            indices[salida] = {}
+            for i, nombre in enumerate(self.nombres):
+                f_ab = valores[(2 + i) * n:(3 + i) * n]
+                if varianza == 0:
+                    indices[salida][nombre] = (0.0, 0.0)
+                    continue
+                # Estimadores de Saltelli (2010) para S_i y de Jansen para S_Ti
+                primer_orden = sum(b * (ab - a) for a, b, ab in zip(f_a, f_b, f_ab)) / n / varianza
+                total = sum((a - ab) ** 2 for a, ab in zip(f_a, f_ab)) / (2 * n) / varianza
+                indices[salida][nombre] = (primer_orden, total)
+        return indices
+
+
+def reducir_lttb(valores, umbral):
+    """Reduce una serie a `umbral` puntos (índice, valor) con Largest-Triangle-Three-Buckets.
+    
+    Conserva la forma visual de la serie: de cada tramo elige el punto que forma el
+    triángulo más grande con el punto anterior elegido y el promedio del tramo siguiente.
+    """
+    n = len(valores)
+    if umbral >= n or umbral < 3:
+        return list(enumerate(valores))
+    
+    reducido = [(0, valores[0])]
+    tamaño = (n - 2) / (umbral - 2)
+    a = 0
+    for k in range(umbral - 2):
+        inicio = int(k * tamaño) + 1
+        fin = int((k + 1) * tamaño) + 1
+        
+        # Promedio del tramo siguiente
+        sig_inicio, sig_fin = fin, min(int((k + 2) * tamaño) + 1, n)
+        x_prom = (sig_inicio + sig_fin - 1) / 2
+        y_prom = sum(valores[sig_inicio:sig_fin]) / (sig_fin - sig_inicio)
+        
+        x_a, y_a = a, valores[a]
+        mejor, area_max = inicio, -1.0
+        for i in range(inicio, fin):
+            area = abs((x_a - x_prom) * (valores[i] - y_a) - (x_a - i) * (y_prom - y_a))
+            if area > area_max:
+                mejor, area_max = i, area
+        reducido.append((mejor, valores[mejor]))
+        a = mejor
+    reducido.append((n - 1, valores[n - 1]))
+    return reducido
+
+
+class MapaCalor:
+    """Imagen PPM de la humedad interpolada (bilineal) sobre una rejilla regular de sensores.
+    
+    Los índices y pesos de interpolación de cada columna y fila de píxeles se calculan una
+    sola vez. Cada actualización interpola primero las filas de la rejilla a lo ancho y
+    luego mezcla dos de ellas por cada fila de píxeles; los colores salen de una tabla de
+    256 entradas aplicada con bytes.translate.
+    
+    El costo crece con los píxeles: unos 3 ms a 100×100 (la vista de la parcela, 500 px
+    a zoom 5), 9 ms a 200×200 y unos 200 ms a 1000×1000, así que la imagen se calcula a
+    baja resolución y Tk la amplía.
+    """
+    
+    def __init__(self, filas, columnas, ancho, alto):
+        self.filas = filas
+        self.columnas = columnas
+        self.ancho = ancho
+        self.alto = alto
+        self.pesos_x = self.pesos(columnas, ancho)
+        self.pesos_y = self.pesos(filas, alto)
+        self.cabecera = f"P6 {ancho} {alto} 255\n".encode()
+    
+    @staticmethod
+    def pesos(muestras, pixeles):
+        """(índice, fracción) de cada píxel de un eje con las muestras en los centros de celda"""
+        pesos = []
+        for p in range(pixeles):
+            x = min(max((p + 0.5) * muestras / pixeles - 0.5, 0.0), muestras - 1.0)
+            i = min(int(x), max(muestras - 2, 0))
+            pesos.append((i, x - i))
+        return pesos
+    
+    @staticmethod
+    def paleta(paradas):
+        """Canales R, G y B (tablas de 256 bytes) de un degradado entre `paradas` [(0-1, '#rrggbb')]"""
+        canales = [bytearray(256) for _ in range(3)]
+        for k in range(256):
+            t = k / 255
+            for (t0, c0), (t1, c1) in zip(paradas, paradas[1:]):
+                if t <= t1 or (t1, c1) == paradas[-1]:
+                    break
+            f = 0.0 if t1 == t0 else min(1.0, max(0.0, (t - t0) / (t1 - t0)))
+            for canal in range(3):
+                a = int(c0[1 + 2 * canal:3 + 2 * canal], 16)
+                b = int(c1[1 + 2 * canal:3 + 2 * canal], 16)
+                canales[canal][k] = round(a + f * (b - a))
+        return tuple(bytes(canal) for canal in canales)
+    
+    def ppm(self, rejilla, minimo, maximo, paleta):
+        """Imagen PPM binaria de la `rejilla` (filas × columnas de humedad)"""
+        escala = 255 / (maximo - minimo)
+        pesos_x = self.pesos_x
+        
+        # Valores en índices de la paleta, interpolados a lo ancho una vez por fila de sensores
+        filas = []
+        for fila in rejilla:
+            v = [min(255.0, max(0.0, (h - minimo) * escala)) for h in fila]
+            if len(v) == 1:
+                filas.append([v[0]] * self.ancho)
+            else:
+                filas.append([v[i] + f * (v[i + 1] - v[i]) for i, f in pesos_x])
+        if len(filas) == 1:
+            filas.append(filas[0])
+        
+        rojo, verde, azul = paleta
+        linea = bytearray(3 * self.ancho)
+        datos = [self.cabecera]
+        for i, f in self.pesos_y:
+            arriba, abajo = filas[i], filas[i + 1]
+            indices = bytes([int(a + f * (b - a)) for a, b in zip(arriba, abajo)])
+            linea[0::3] = indices.translate(rojo)
+            linea[1::3] = indices.translate(verde)
+            linea[2::3] = indices.translate(azul)
+            datos.append(bytes(linea))
+        return b''.join(datos)
+
+
+class LienzoSVG:
+    """Lienzo sin pantalla con la parte de la API de tk.Canvas que usan los gráficos"""
+    
+    def __init__(self, ancho, alto, bg='#2d5016'):
+        self.ancho = ancho
+        self.alto = alto
+        self.bg = bg
+        self.elementos = []
+    
+    def delete(self, *etiquetas):
+        self.elementos = []
+    
+    @staticmethod
+    def aplanar(coords):
+        if len(coords) == 1:
+            coords = coords[0]
+        return ' '.join(f"{c:.1f}" for c in coords)
+    
+    @staticmethod
+    def estilo(fill='', outline='black', width=1, dash=None):
+        estilo = f'fill="{fill or "none"}" stroke="{outline or "none"}" stroke-width="{width}"'
+        if dash:
+            estilo += f' stroke-dasharray="{",".join(map(str, dash))}"'
+        return estilo
+    
+    def create_line(self, *coords, fill='black', width=1, dash=None):
+        self.elementos.append(f'<polyline points="{self.aplanar(coords)}" '
+                              f'{self.estilo("", fill, width, dash)}/>')
+    
+    def create_rectangle(self, x0, y0, x1, y1, fill='', outline='black', width=1):
+        self.elementos.append(f'<rect x="{min(x0, x1):.1f}" y="{min(y0, y1):.1f}" '
+                              f'width="{abs(x1 - x0):.1f}" height="{abs(y1 - y0):.1f}" '
+                              f'{self.estilo(fill, outline, width)}/>')
+    
+    def create_oval(self, x0, y0, x1, y1, fill='', outline='black', width=1):
+        self.elementos.append(f'<ellipse cx="{(x0 + x1) / 2:.1f}" cy="{(y0 + y1) / 2:.1f}" '
+                              f'rx="{abs(x1 - x0) / 2:.1f}" ry="{abs(y1 - y0) / 2:.1f}" '
+                              f'{self.estilo(fill, outline, width)}/>')
+    
+    def create_polygon(self, *coords, fill='', outline='', width=1):
+        self.elementos.append(f'<polygon points="{self.aplanar(coords)}" '
+                              f'{self.estilo(fill, outline, width)}/>')
+    
+    def create_text(self, x, y, text='', font=('Arial', 10), fill='black',
+                    anchor='center', justify='left', angle=0):
+        familia, tamaño = font[0], font[1]
+        peso = 'bold' if 'bold' in font[2:] else 'normal'
+        alineacion = {'w': 'start', 'e': 'end'}.get(anchor, 'middle')
+        lineas = str(text).split('\n')
+        # Tk centra verticalmente el bloque de texto en (x, y)
+        y0 = y - (len(lineas) - 1) * tamaño * 0.65
+        tspans = ''.join(f'<tspan x="{x:.1f}" y="{y0 + i * tamaño * 1.3:.1f}">{escape(linea)}</tspan>'
+                         for i, linea in enumerate(lineas))
+        rotacion = f' transform="rotate({-angle} {x:.1f} {y:.1f})"' if angle else ''
+        self.elementos.append(f'<text font-family="{familia}" font-size="{tamaño}pt" '
+                              f'font-weight="{peso}" fill="{fill}" text-anchor="{alineacion}" '
+                              f'dominant-baseline="middle"{rotacion}>{tspans}</text>')
+    
+    def svg(self):
+        return (f'<svg xmlns="http://www.w3.org/2000/svg" width="{self.ancho}" '
+                f'height="{self.alto}"><rect width="100%" height="100%" fill="{self.bg}"/>'
+                + ''.join(self.elementos) + '</svg>')
+    
+    def guardar(self, ruta):
+        with open(ruta, 'w', encoding='utf-8') as archivo:
+            archivo.write(self.svg())
+
+
+class GraficosParcela:
+    """Gráficos de barras, pastel, predicción y estadísticas sobre cualquier lienzo.
+    
+    Requiere bar_canvas, pie_canvas, pred_canvas y stats_canvas (tk.Canvas o LienzoSVG).
+    """
+    
+    sensor_prediccion = None  # None: promedio de la parcela; si no, índice del sensor
+    colores_rama = ('#ffd54f', '#4fc3f7', '#ce93d8', '#ff8a80', '#a1887f', '#e0e0e0')
+    
+    def actualizar_graficos(self):
+        """Actualiza todos los gráficos"""
+        self.actualizar_grafico_barras()
+        self.actualizar_grafico_pastel()
+        self.actualizar_grafico_prediccion()
+    
+    def actualizar_estadisticas(self):
+        """Actualiza las estadísticas detalladas"""
+        self.stats_canvas.delete("all")
         
-        self.nivel_agua = 80  # Nivel inicial de agua (%)
-        self.nivel_label = tk.Label(info_frame, text=f"Nivel de agua: {self.nivel_agua}%", 
-                                   font=('Arial', 11, 'bold'), bg='#4a7c1f', fg='#00ffff')
-        self.nivel_label.pack(side=tk.LEFT, padx=20)
+        if not self.historial_humedad:
+            self.stats_canvas.create_text(325, 400, 
+                                        text='No hay datos suficientes\npara mostrar estadísticas', 
+                                        font=('Arial', 14, 'bold'), fill='white',
+                                        justify='center')
+            return
         
-        self.estado_cultivo_label = tk.Label(info_frame, text="Estado: No sembrado", 
-                                            font=('Arial', 11, 'bold'), bg='#4a7c1f', fg='#ffeb3b')
-        self.estado_cultivo_label.pack(side=tk.RIGHT, padx=20)
+        # Calcular estadísticas
+        humedad_actual = self.historial_humedad[-1] if self.historial_humedad else 0
+        humedad_min = min(self.historial_humedad) if self.historial_humedad else 0
+        humedad_max = max(self.historial_humedad) if self.historial_humedad else 0
+        humedad_promedio = sum(self.historial_humedad) / len(self.historial_humedad) if self.historial_humedad else 0
         
-        # Botón para recargar agua
-        recarga_frame = tk.Frame(pileta_frame, bg='#4a7c1f')
-        recarga_frame.pack(fill=tk.X, pady=5)
+        # Contar sensores por estado
+        estados = {'IDEAL': 0, 'BAJA': 0, 'ALTA': 0}
+        for sensor in self.datos_sensores.values():
+            if sensor['humedad'] < self.humedad_ideal_min:
+                estados['BAJA'] += 1
+            elif sensor['humedad'] > self.humedad_ideal_max:
+                estados['ALTA'] += 1
+            else:
+                estados['IDEAL'] += 1
         
-        tk.Button(recarga_frame, text="💦 RECARGAR AGUA", 
-                 command=self.recargar_agua,
-                 bg='#00bcd4', fg='white', font=('Arial', 11, 'bold'),
-                 relief=tk.RAISED, bd=3, cursor='hand2', width=20).pack(pady=5)
+        # Texto de estadísticas
+        stats_text = f"""ESTADÍSTICAS DETALLADAS - MES {self.meses[self.mes_actual]}
+
+HUMEDAD:
+• Actual: {humedad_actual:.1f}%
+• Mínima Histórica: {humedad_min:.1f}%
+• Máxima Histórica: {humedad_max:.1f}%
+• Promedio: {humedad_promedio:.1f}%
+
+SENSORES ({self.total_sensores} total):
+• Ideales: {estados['IDEAL']} ({estados['IDEAL']/self.total_sensores*100:.1f}%)
+• Baja Humedad: {estados['BAJA']} ({estados['BAJA']/self.total_sensores*100:.1f}%)
+• Alta Humedad: {estados['ALTA']} ({estados['ALTA']/self.total_sensores*100:.1f}%)
+
+RECURSOS:
+• Nivel de agua: {self.nivel_agua:.0f}%
+• Meses simulados: {len(self.historial_humedad)}
+• Áreas totales: {self.num_areas}
+
+CULTIVO:
+• Estado: {'Plátanos sembrados' if self.platano_sembrado else 'No sembrado'}"""
         
-        # Dibujar la parcela inicial
-        self.dibujar_parcela()
+        if self.platano_sembrado:
+            etapas = {1: "Germinación", 2: "Crecimiento", 3: "Maduración"}
+            etapa_text = etapas.get(self.etapa_crecimiento, "Desconocida")
+            stats_text += f"""
+• Etapa actual: {etapa_text}
+• Días desde siembra: {self.dias_desde_siembra}
+• Próxima etapa: {self.dias_proxima_etapa() if self.etapa_crecimiento < 3 else '¡Final!'} días
+• Plantas: {self.crecimiento.total_plantas}
+• Tiempo térmico: {self.crecimiento.tiempo_termico_max():.0f} °C·día
+• Rendimiento estimado: {self.crecimiento.rendimiento_total() / 1000:.1f} t
+
+RANGO IDEAL PARA PLÁTANO: {self.humedad_ideal_min}% - {self.humedad_ideal_max}%"""
+        
+        # Dibujar texto
+        lines = stats_text.split('\n')
+        for i, line in enumerate(lines):
+            y_pos = 50 + i * 25
+            self.stats_canvas.create_text(50, y_pos, text=line, 
+                                         font=('Arial', 11, 'bold'), 
+                                         fill='white', anchor='w')
+        
+        # Título
+        self.stats_canvas.create_text(325, 20, 
+                                     text="📈 ESTADÍSTICAS DETALLADAS", 
+                                     font=('Arial', 16, 'bold'), fill='white')
+        
+        # Lo demás va debajo del texto, que crece con la información del cultivo
+        y_libre = 50 + len(lines) * 25 + 35
+        if self.platano_sembrado:
+            self.dibujar_progreso_cultivo(y_libre)
+            y_libre += 110
+        self.dibujar_distribucion_humedad(max(780, y_libre))
     
-    def dibujar_parcela(self):
-        """Dibuja la representación visual de la parcela"""
-        self.parcela_canvas.delete("all")
+    def dibujar_distribucion_humedad(self, y_base=780):
+        """Percentiles históricos y tiempo en cada banda, para la parcela y cada área"""
+        colores = ('#6d4c41', '#ff9800', '#4caf50', '#03a9f4', '#f44336')
+        x_barra, ancho_barra, alto_fila = 300, 320, 22
         
-        canvas_width = 600
-        canvas_height = 600
+        self.stats_canvas.create_text(325, y_base,
+                                     text="DISTRIBUCIÓN HISTÓRICA DE HUMEDAD",
+                                     font=('Arial', 12, 'bold'), fill='white')
+        y = y_base + 30
+        for x, texto in ((50, ""), (140, "P10"), (190, "P50"), (240, "P90"),
+                         (x_barra, "Tiempo en cada banda")):
+            self.stats_canvas.create_text(x, y, text=texto, font=('Arial', 9, 'bold'),
+                                         fill='white', anchor='w')
+        
+        filas = [("Parcela", None)] + [(f"Área {area + 1}", area) for area in range(self.num_areas)]
+        for nombre, area in filas:
+            y += alto_fila
+            self.stats_canvas.create_text(50, y, text=nombre, font=('Arial', 9, 'bold'),
+                                         fill='white', anchor='w')
+            for x, valor in zip((140, 190, 240), self.estadisticas.percentiles(area)):
+                texto = f"{valor:.1f}" if valor is not None else "-"
+                self.stats_canvas.create_text(x, y, text=texto, font=('Arial', 9),
+                                             fill='white', anchor='w')
+            
+            # Barra apilada con la fracción del tiempo en cada banda
+            x = x_barra
+            for fraccion, color in zip(self.estadisticas.fraccion_bandas(area), colores):
+                if fraccion > 0:
+                    self.stats_canvas.create_rectangle(x, y - 8, x + fraccion * ancho_barra, y + 8,
+                                                      fill=color, outline='')
+                    x += fraccion * ancho_barra
+        
+        # Leyenda de las bandas
+        y += 30
+        limites = self.estadisticas.limites
+        rangos = ([f"<{limites[0]}"] + [f"{a}-{b}" for a, b in zip(limites, limites[1:])]
+                  + [f">{limites[-1]}"])
+        for k, (banda, rango, color) in enumerate(zip(EstadisticasHumedad.bandas, rangos, colores)):
+            x = 50 + k * 120
+            self.stats_canvas.create_rectangle(x, y - 6, x + 12, y + 6, fill=color, outline='')
+            self.stats_canvas.create_text(x + 16, y, text=f"{banda} ({rango}%)",
+                                         font=('Arial', 8), fill='white', anchor='w')
+    
+    def dibujar_progreso_cultivo(self, y_base=600):
+        """Dibuja una barra de progreso del cultivo"""
+        ancho_total = 600
+        alto_barra = 30
         
-        # Dibujar el canal central
-        canal_x = canvas_width // 2
-        canal_ancho = 30
-        self.parcela_canvas.create_rectangle(canal_x - canal_ancho//2, 50,
-                                           canal_x + canal_ancho//2, canvas_height - 50,
-                                           fill='#1e88e5', outline='#0d47a1', width=2)
+        # Fondo de la barra
+        self.stats_canvas.create_rectangle(50, y_base, 50 + ancho_total, y_base + alto_barra,
+                                          fill='#333333', outline='white', width=2)
+        
+        # Progreso actual (tiempo térmico hacia la maduración)
+        tt_total = self.crecimiento.tt_maduracion
+        tiempo_termico = self.crecimiento.tiempo_termico_max()
+        progreso = min(1.0, tiempo_termico / tt_total)
+        ancho_progreso = ancho_total * progreso
         
-        # Dibujar texto "CANAL"
-        self.parcela_canvas.create_text(canal_x, canvas_height // 2, 
-                                       text="CANAL", font=('Arial', 12, 'bold'),
-                                       fill='white', angle=90)
+        # Color según etapa
+        if self.etapa_crecimiento == 1:
+            color = '#8bc34a'
+        elif self.etapa_crecimiento == 2:
+            color = '#4caf50'
+        else:
+            color = '#388e3c'
         
-        # Dibujar sensores del lado izquierdo
-        lado_izq_x = canal_x - canal_ancho//2 - 60
-        self.dibujar_sensores_lado(lado_izq_x, 'izquierdo')
+        # Barra de progreso
+        self.stats_canvas.create_rectangle(50, y_base, 50 + ancho_progreso, y_base + alto_barra,
+                                          fill=color, outline='')
         
-        # Dibujar sensores del lado derecho
-        lado_der_x = canal_x + canal_ancho//2 + 60
-        self.dibujar_sensores_lado(lado_der_x, 'derecho')
+        # Etiquetas
+        self.stats_canvas.create_text(325, y_base - 20, 
+                                     text="PROGRESO DEL CULTIVO", 
+                                     font=('Arial', 12, 'bold'), fill='white')
         
-        # Dibujar pileta de agua
-        self.dibujar_pileta_agua()
+        self.stats_canvas.create_text(325, y_base + alto_barra + 20, 
+                                     text=f"{tiempo_termico:.0f}/{tt_total:.0f} °C·día ({progreso*100:.1f}%)", 
+                                     font=('Arial', 10, 'bold'), fill='white')
         
-        # Dibujar plátanos si están sembrados
-        if self.platano_sembrado:
-            self.dibujar_platanos()
+        # Marcas de etapas
+        marcas = [(0, "Germ"), (self.crecimiento.tt_crecimiento, "Crec"), (tt_total, "Mad")]
+        for i, (grados, etapa) in enumerate(marcas):
+            x = 50 + (grados / tt_total) * ancho_total
+            self.stats_canvas.create_line(x, y_base - 10, x, y_base + alto_barra + 10, 
+                                        fill='white', width=1)
+            self.stats_canvas.create_text(x, y_base - 25, text=etapa, 
+                                         font=('Arial', 8), fill='white')
     
-    def dibujar_sensores_lado(self, x_base, lado):
-        """Dibuja los sensores de un lado específico"""
-        canvas_height = 600
+    def actualizar_grafico_barras(self):
+        """Actualiza el gráfico de barras de humedad por áreas"""
+        self.bar_canvas.delete("all")
         
-        # Calcular qué sensores pertenecen a este lado
-        sensores_lado = []
-        for sensor_id, data in self.datos_sensores.items():
-            if data['lado'] == lado:
-                sensores_lado.append((sensor_id, data))
+        # Calcular humedad promedio por área
+        humedades_areas = self.humedad_por_area()
         
-        # Ordenar sensores por área
-        sensores_lado.sort(key=lambda x: x[1]['area'])
+        # Configuración del gráfico
+        canvas_width = 650
+        canvas_height = 500
+        margin = 80
+        graph_width = canvas_width - 2 * margin
+        graph_height = canvas_height - 2 * margin
+        bar_width = graph_width / (self.num_areas + 1)
         
-        # Dibujar 6 sensores en este lado (2 por área × 3 áreas en vertical)
-        espaciado_y = (canvas_height - 100) // 6
-        radio_sensor = 15
+        # Dibujar ejes
+        self.bar_canvas.create_line(margin, margin, margin, canvas_height - margin, width=2, fill='white')
+        self.bar_canvas.create_line(margin, canvas_height - margin, canvas_width - margin, canvas_height - margin, width=2, fill='white')
         
-        for i, (sensor_id, data) in enumerate(sensores_lado[:6]):  # Solo primeros 6 del lado
-            y = 80 + i * espaciado_y
+        # Título
+        self.bar_canvas.create_text(canvas_width // 2, 30, 
+                                   text="Humedad por Área de Cultivo", 
+                                   font=('Arial', 16, 'bold'), fill='white')
+        
+        # Dibujar barras
+        max_humedad = max(humedades_areas) if humedades_areas else 100
+        min_humedad = min(humedades_areas) if humedades_areas else 0
+        
+        for i, humedad in enumerate(humedades_areas):
+            x0 = margin + (i + 0.5) * bar_width
+            y0 = canvas_height - margin
             
-            # Color según estado de humedad
-            if data['humedad'] < self.humedad_ideal_min:
-                color = '#ff9800'  # Naranja - baja humedad
-            elif data['humedad'] > self.humedad_ideal_max:
-                color = '#f44336'  # Rojo - alta humedad
-            else:
-                color = '#4caf50'  # Verde - ideal
+            # Calcular altura de la barra
+            bar_height = (humedad / 100) * graph_height
             
-            # Dibujar sensor
-            self.parcela_canvas.create_oval(x_base - radio_sensor, y - radio_sensor,
-                                           x_base + radio_sensor, y + radio_sensor,
-                                           fill=color, outline='white', width=2)
+            # Color según humedad
+            if humedad < self.humedad_ideal_min:
+                color = '#ff9800'  # Naranja
+            elif humedad > self.humedad_ideal_max:
+                color = '#f44336'  # Rojo
+            else:
+                color = '#4caf50'  # Verde
             
-            # Etiqueta del sensor
-            self.parcela_canvas.create_text(x_base, y, 
-                                           text=str(sensor_id + 1),
-                                           font=('Arial', 8, 'bold'), fill='white')
+            # Dibujar barra
+            self.bar_canvas.create_rectangle(
+                x0 - bar_width/2, y0 - bar_height,
+                x0 + bar_width/2, y0,
+                fill=color, outline='white', width=1
+            )
             
-            # Indicador de humedad
-            humedad_text = f"{data['humedad']}%"
-            self.parcela_canvas.create_text(x_base, y + radio_sensor + 10,
-                                           text=humedad_text,
-                                           font=('Arial', 7), fill='white')
+            # Etiqueta del valor
+            self.bar_canvas.create_text(x0, y0 - bar_height - 10, 
+                                       text=f"{humedad:.1f}%", 
+                                       font=('Arial', 9, 'bold'), fill='white')
             
-            # Línea conectando al canal (simulando tubería de riego)
-            canal_x = 300
-            if lado == 'izquierdo':
-                self.parcela_canvas.create_line(x_base + radio_sensor, y,
-                                               canal_x - 15, y,
-                                               fill='#888888', width=1, dash=(2, 2))
-            else:
-                self.parcela_canvas.create_line(x_base - radio_sensor, y,
-                                               canal_x + 15, y,
-                                               fill='#888888', width=1, dash=(2, 2))
-    
-    def dibujar_pileta_agua(self):
-        """Dibuja la pileta de agua"""
-        canvas_width = 600
-        canvas_height = 600
+            # Etiqueta del área
+            self.bar_canvas.create_text(x0, y0 + 15, 
+                                       text=f"Área {i+1}", 
+                                       font=('Arial', 9), fill='white')
         
-        # Posición de la pileta (abajo a la derecha)
-        pileta_x = canvas_width - 100
-        pileta_y = canvas_height - 80
-        pileta_ancho = 80
-        pileta_alto = 60
+        # Líneas de referencia
+        y_ideal_min = canvas_height - margin - (self.humedad_ideal_min / 100) * graph_height
+        y_ideal_max = canvas_height - margin - (self.humedad_ideal_max / 100) * graph_height
         
-        # Dibujar pileta
-        self.parcela_canvas.create_rectangle(pileta_x, pileta_y,
-                                           pileta_x + pileta_ancho, pileta_y + pileta_alto,
-                                           fill='#1e88e5', outline='#0d47a1', width=3)
+        self.bar_canvas.create_line(margin, y_ideal_min, canvas_width - margin, y_ideal_min, 
+                                   fill='blue', dash=(4, 2), width=2)
+        self.bar_canvas.create_line(margin, y_ideal_max, canvas_width - margin, y_ideal_max, 
+                                   fill='red', dash=(4, 2), width=2)
         
-        # Dibujar nivel de agua
-        nivel_alto = (self.nivel_agua / 100) * pileta_alto
-        self.parcela_canvas.create_rectangle(pileta_x, pileta_y + pileta_alto - nivel_alto,
-                                           pileta_x + pileta_ancho, pileta_y + pileta_alto,
-                                           fill='#29b6f6', outline='')
+        # Leyenda
+        self.bar_canvas.create_text(canvas_width - 100, margin - 20, 
+                                   text="=== Mín Ideal", fill='blue', font=('Arial', 9))
+        self.bar_canvas.create_text(canvas_width - 100, margin, 
+                                   text="=== Máx Ideal", fill='red', font=('Arial', 9))
+    
+    def actualizar_grafico_pastel(self):
+        """Actualiza el gráfico de pastel de estados de sensores"""
+        self.pie_canvas.delete("all")
         
-        # Etiqueta de la pileta
-        self.parcela_canvas.create_text(pileta_x + pileta_ancho//2, pileta_y - 10,
-                                       text="PILETA", font=('Arial', 9, 'bold'),
-                                       fill='white')
+        # Contar estados
+        estados = {'IDEAL': 0, 'BAJA': 0, 'ALTA': 0}
+        for sensor in self.datos_sensores.values():
+            if sensor['humedad'] < self.humedad_ideal_min:
+                estados['BAJA'] += 1
+            elif sensor['humedad'] > self.humedad_ideal_max:
+                estados['ALTA'] += 1
+            else:
+                estados['IDEAL'] += 1
         
-        # Tuberías de conexión a los lados
-        canal_x = 300
-        self.parcela_canvas.create_line(pileta_x, pileta_y + pileta_alto//2,
-                                       canal_x, pileta_y + pileta_alto//2,
-                                       fill='#888888', width=2)
-    
-    def dibujar_platanos(self):
-        """Dibuja los plátanos en la parcela"""
-        canvas_width = 600
-        canvas_height = 600
+        total_sensores = self.total_sensores
+        if total_sensores == 0:
+            return
         
-        canal_x = canvas_width // 2
+        # Configuración
+        canvas_width = 650
+        canvas_height = 500
+        center_x = canvas_width // 2
+        center_y = canvas_height // 2
+        radius = 150
         
-        # Dibujar plátanos en ambos lados
-        for lado, offset in [('izquierdo', -80), ('derecho', 80)]:
-            x_base = canal_x + offset
-            
-            # Dibujar 3 plantas de plátano por lado
-            for i in range(3):
-                y = 120 + i * 120
-                
-                # Tamaño según etapa de crecimiento
-                if self.etapa_crecimiento == 1:  # Germinación
-                    tamaño = 15
-                    color = '#8bc34a'
-                    emoji = "🌱"
-                elif self.etapa_crecimiento == 2:  # Crecimiento
-                    tamaño = 25
-                    color = '#4caf50'
-                    emoji = "🌿"
-                else:  # Maduración
-                    tamaño = 35
-                    color = '#388e3c'
-                    emoji = "🍌"
-                
-                # Dibujar planta
-                self.parcela_canvas.create_oval(x_base - tamaño, y - tamaño,
-                                               x_base + tamaño, y + tamaño,
-                                               fill=color, outline='#2e7d32', width=2)
+        # Colores
+        colores = {'IDEAL': '#4caf50', 'BAJA': '#ff9800', 'ALTA': '#f44336'}
+        
+        # Dibujar gráfico de pastel
+        start_angle = 0
+        for estado, cantidad in estados.items():
+            if cantidad == 0:
+                continue
                 
-                # Dibujar emoji de plátano
-                self.parcela_canvas.create_text(x_base, y, text=emoji,
-                                               font=('Arial', 12), fill='#795548')
+            # Calcular ángulo
+            angle = (cantidad / total_sensores) * 360
+            
+            # Dibujar sector
+            self.dibujar_sector(self.pie_canvas, center_x, center_y, radius, 
+                               start_angle, start_angle + angle, colores[estado])
+            
+            # Etiqueta
+            porcentaje = (cantidad / total_sensores) * 100
+            mid_angle = start_angle + angle / 2
+            label_radius = radius + 40
+            label_x = center_x + label_radius * math.cos(math.radians(mid_angle))
+            label_y = center_y - label_radius * math.sin(math.radians(mid_angle))
+            
+            self.pie_canvas.create_text(label_x, label_y, 
+                                       text=f"{estado}\n{porcentaje:.1f}%", 
+                                       font=('Arial', 10, 'bold'), 
+                                       fill=colores[estado], 
+                                       justify='center')
+            
+            start_angle += angle
+        
+        # Título
+        self.pie_canvas.create_text(center_x, 30, 
+                                   text="Distribución de Estados de Sensores", 
+                                   font=('Arial', 16, 'bold'), fill='white')
+        
+        # Leyenda
+        y_legend = center_y + radius + 60
+        for i, (estado, color) in enumerate(colores.items()):
+            x_legend = center_x - 100 + i * 120
+            self.pie_canvas.create_rectangle(x_legend - 50, y_legend - 15,
+                                           x_legend - 30, y_legend + 15,
+                                           fill=color, outline='white')
+            self.pie_canvas.create_text(x_legend, y_legend,
+                                       text=f"{estado}: {estados[estado]}",
+                                       font=('Arial', 10, 'bold'), fill='white')
     
-    def crear_controles_derecha(self, parent):
-        """Crea los controles del panel derecho"""
-        # Notebook para organizar contenido
-        notebook = ttk.Notebook(parent)
-        notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+    def dibujar_sector(self, canvas, x, y, r, start_angle, end_angle, color):
+        """Dibuja un sector circular"""
+        points = [x, y]
+        for angle in range(int(start_angle), int(end_angle) + 1):
+            rad_angle = math.radians(angle)
+            points.extend([x + r * math.cos(rad_angle), y - r * math.sin(rad_angle)])
+        points.extend([x, y])
+        canvas.create_polygon(points, fill=color, outline='white', width=2)
+    
+    def actualizar_grafico_prediccion(self):
+        """Actualiza el gráfico de predicción"""
+        self.pred_canvas.delete("all")
         
-        # Estilo para el notebook
-        style = ttk.Style()
-        style.configure('TNotebook.Tab', font=('Arial', 10, 'bold'))
+        # Serie a mostrar: promedio de la parcela o un sensor
+        def serie(simulacion):
+            if self.sensor_prediccion is None:
+                return simulacion.historial_humedad
+            return simulacion.historial_sensores[self.sensor_prediccion]
         
-        # Pestaña 1: Información y controles
-        info_tab = tk.Frame(notebook, bg='#2d5016')
-        notebook.add(info_tab, text='📋 Información')
+        historial = serie(self)
+        if self.sensor_prediccion is None:
+            titulo = "Predicción de Humedad"
+        else:
+            titulo = f"Predicción de Humedad - Sensor {self.sensor_prediccion + 1}"
+        
+        if len(historial) < 2:
+            self.pred_canvas.create_text(325, 250, 
+                                       text="Se necesitan más datos\npara la predicción", 
+                                       font=('Arial', 14, 'bold'), fill='white',
+                                       justify='center')
+            return
+        
+        # Configuración
+        canvas_width = 650
+        canvas_height = 500
+        margin = 80
+        graph_width = canvas_width - 2 * margin
+        graph_height = canvas_height - 2 * margin
         
-        # Pestaña 2: Gráficos
-        graficos_tab = tk.Frame(notebook, bg='#2d5016')
-        notebook.add(graficos_tab, text='📊 Gráficos')
+        # Añadir predicción simple
+        prediccion = []
+        if len(historial) >= 3:
+            ultimos_3 = historial[-3:]
+            tendencia = (ultimos_3[-1] - ultimos_3[0]) / 2
+            for i in range(3):
+                pred_valor = historial[-1] + tendencia * (i + 1)
+                prediccion.append(max(30, min(90, pred_valor)))
+        total = len(historial) + len(prediccion)
+        # Cada rama se dibuja desde el mes en que se bifurcó
+        ramas = [(escenario, inicio, serie(rama)) for escenario, inicio, rama in self.ramas]
+        total = max([total] + [len(valores) for _, _, valores in ramas])
         
-        # Pestaña 3: Estadísticas Detalladas
-        stats_tab = tk.Frame(notebook, bg='#2d5016')
-        notebook.add(stats_tab, text='📈 Estadísticas')
+        # Dibujar ejes
+        self.pred_canvas.create_line(margin, margin, margin, canvas_height - margin, width=2, fill='white')
+        self.pred_canvas.create_line(margin, canvas_height - margin, canvas_width - margin, canvas_height - margin, width=2, fill='white')
         
-        self.crear_pestana_informacion(info_tab)
-        self.crear_pestana_graficos(graficos_tab)
-        self.crear_pestana_estadisticas(stats_tab)
-    
-    def crear_pestana_informacion(self, parent):
-        """Crea la pestaña de información con scroll"""
-        # Frame con scroll
-        canvas = tk.Canvas(parent, bg='#2d5016', highlightthickness=0)
-        scrollbar = tk.Scrollbar(parent, orient="vertical", command=canvas.yview)
-        scrollable_frame = tk.Frame(canvas, bg='#2d5016')
+        # Título
+        self.pred_canvas.create_text(canvas_width // 2, 30, 
+                                   text=titulo, 
+                                   font=('Arial', 16, 'bold'), fill='white')
         
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
+        # Dibujar líneas de referencia
+        y_min_ideal = canvas_height - margin - (self.humedad_ideal_min / 100) * graph_height
+        y_max_ideal = canvas_height - margin - (self.humedad_ideal_max / 100) * graph_height
         
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
+        self.pred_canvas.create_line(margin, y_min_ideal, canvas_width - margin, y_min_ideal, 
+                                   fill='blue', dash=(4, 2), width=2)
+        self.pred_canvas.create_line(margin, y_max_ideal, canvas_width - margin, y_max_ideal, 
+                                   fill='red', dash=(4, 2), width=2)
         
-        canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
+        def coordenadas(i, humedad):
+            x = margin + (i / (total - 1)) * graph_width
+            y = canvas_height - margin - (humedad / 100) * graph_height
+            return x, y
+        
+        # El histórico se reduce a lo sumo a un punto por píxel antes de dibujar
+        reducido = reducir_lttb(historial, graph_width)
+        puntos = [c for i, humedad in reducido for c in coordenadas(i, humedad)]
+        puntos_pred = list(puntos[-2:])
+        for i, humedad in enumerate(prediccion, start=len(historial)):
+            puntos_pred.extend(coordenadas(i, humedad))
+        
+        # Puntos individuales solo cuando la serie es corta
+        if total <= 24:
+            for k in range(0, len(puntos), 2):
+                x, y = puntos[k], puntos[k + 1]
+                self.pred_canvas.create_oval(x-4, y-4, x+4, y+4, fill='#4caf50', outline='white')
+            for k in range(2, len(puntos_pred), 2):
+                x, y = puntos_pred[k], puntos_pred[k + 1]
+                self.pred_canvas.create_oval(x-4, y-4, x+4, y+4, fill='#ff6b35', outline='white')
+        
+        # Etiquetas de mes: como mucho 12, repartidas en el eje
+        paso = math.ceil(total / 12)
+        for i in range(0, total, paso):
+            x, _ = coordenadas(i, 0)
+            if i < len(historial):
+                mes_text = self.meses[i % 12]
+                if total > 12:
+                    mes_text += f" {i // 12 + 1}"
+            else:
+                mes_text = f"P{i-len(historial)+1}"
+            
+            self.pred_canvas.create_text(x, canvas_height - margin + 20, 
+                                       text=mes_text, font=('Arial', 8), fill='white')
         
-        # Información del mes actual
-        info_frame = tk.LabelFrame(scrollable_frame, text="📅 INFORMACIÓN DEL MES ACTUAL", 
-                                  font=('Arial', 12, 'bold'), bg='#4a7c1f', fg='white',
-                                  padx=15, pady=15)
-        info_frame.pack(fill=tk.X, padx=10, pady=10)
+        # Dibujar línea continua
+        if len(puntos) >= 4:
+            self.pred_canvas.create_line(puntos, fill='#4caf50', width=3)
+        if prediccion:
+            self.pred_canvas.create_line(puntos_pred, fill='#ff6b35', width=3, dash=(4, 2))
+        for (escenario, inicio, valores), color in zip(ramas, itertools.cycle(self.colores_rama)):
+            desde = max(0, inicio - 1)
+            tramo = reducir_lttb(valores[desde:], graph_width)
+            puntos_rama = [c for i, humedad in tramo for c in coordenadas(desde + i, humedad)]
+            if len(puntos_rama) >= 4:
+                self.pred_canvas.create_line(puntos_rama, fill=color, width=2, dash=(6, 3))
         
-        self.mes_label = tk.Label(info_frame, text="Mes: Enero", font=('Arial', 14, 'bold'),
-                                 bg='#4a7c1f', fg='yellow')
-        self.mes_label.pack(anchor=tk.W)
+        # Leyenda
+        self.pred_canvas.create_text(canvas_width - 100, margin - 20, 
+                                   text="==== Mín Ideal", fill='blue', font=('Arial', 9))
+        self.pred_canvas.create_text(canvas_width - 100, margin, 
+                                   text="=== Máx Ideal", fill='red', font=('Arial', 9))
+        self.pred_canvas.create_text(canvas_width - 100, margin + 20, 
+                                   text="● Histórico", fill='#4caf50', font=('Arial', 9))
+        self.pred_canvas.create_text(canvas_width - 100, margin + 40, 
+                                   text="● Predicción", fill='#ff6b35', font=('Arial', 9))
+        for k, ((escenario, _, _), color) in enumerate(zip(ramas, itertools.cycle(self.colores_rama))):
+            self.pred_canvas.create_text(canvas_width - 100, margin + 60 + 20 * k,
+                                       text=f"- - {escenario}", fill=color, font=('Arial', 9))
+
+
+class InformeSimulacion(GraficosParcela, SimulacionPlatano):
+    """Corrida sin interfaz que guarda sus gráficos como archivos SVG"""
+    
+    def __init__(self, semilla=None):
+        super().__init__(semilla=semilla, registrar=False)
+        self.bar_canvas = LienzoSVG(650, 500)
+        self.pie_canvas = LienzoSVG(650, 500)
+        self.pred_canvas = LienzoSVG(650, 500)
+        self.stats_canvas = LienzoSVG(650, 1300)
+    
+    def simular(self, meses):
+        """Siembra y avanza `meses` regando las áreas que quedan bajo el rango ideal"""
+        self.sembrar_platano()
+        for _ in range(meses):
+            self.avanzar_mes()
+            self.riego_automatico()
+    
+    def guardar(self, carpeta):
+        """Dibuja y guarda los cuatro gráficos y un resumen en `carpeta`"""
+        os.makedirs(carpeta, exist_ok=True)
+        self.actualizar_graficos()
+        self.actualizar_estadisticas()
+        for nombre, lienzo in (('barras', self.bar_canvas), ('pastel', self.pie_canvas),
+                               ('prediccion', self.pred_canvas), ('estadisticas', self.stats_canvas)):
+            lienzo.guardar(os.path.join(carpeta, f"{nombre}.svg"))
+        resumen = self.resumen_estado()
+        with open(os.path.join(carpeta, 'resumen.json'), 'w', encoding='utf-8') as archivo:
+            json.dump(resumen, archivo, ensure_ascii=False, indent=1)
+        return resumen
+
+
+def generar_informe(semilla, meses, carpeta):
+    """Simula una corrida y guarda su informe; se ejecuta en un proceso de trabajo"""
+    informe = InformeSimulacion(semilla)
+    informe.simular(meses)
+    resumen = informe.guardar(os.path.join(carpeta, f"corrida_{semilla}"))
+    return semilla, resumen['cultivo']['rendimiento_kg']
+
+
+def generar_informes(corridas, meses, carpeta, procesos=None):
+    """Genera en paralelo los informes de `corridas` simulaciones (semillas 0..corridas-1)"""
+    with concurrent.futures.ProcessPoolExecutor(procesos) as ejecutor:
+        trabajos = ejecutor.map(generar_informe, range(corridas), [meses] * corridas,
+                                [carpeta] * corridas, chunksize=max(1, corridas // 64))
+        return dict(trabajos)
+
+
+class SimuladorPlatano(GraficosParcela, SimulacionPlatano):
+    def __init__(self, root, semilla=None, ruta_registro=None, puerto_servidor=None,
+                 mostrar_tiempos=False, reglas_alerta=None, valvulas=None, suelos=None):
+        self.inicio_arranque = time.perf_counter()
+        self.tiempos_arranque = []  # (etapa, segundos desde el inicio)
+        self.mostrar_tiempos = mostrar_tiempos
+        self.puerto_servidor = puerto_servidor
         
-        self.clima_label = tk.Label(info_frame, text="Lluvia: 40mm | Temp: 28°C | Sequía: 20%",
-                                   font=('Arial', 11), bg='#4a7c1f', fg='white')
-        self.clima_label.pack(anchor=tk.W)
+        self.root = root
+        self.root.title("Sistema de Monitoreo - Cultivo de Plátano")
+        self.root.geometry("1400x900")
+        self.root.configure(bg='#2d5016')
         
-        # Información del cultivo
-        self.cultivo_frame = tk.LabelFrame(scrollable_frame, text="🌱 ESTADO DEL CULTIVO", 
-                                        font=('Arial', 12, 'bold'), bg='#4a7c1f', fg='white',
-                                        padx=15, pady=15)
-        self.cultivo_frame.pack(fill=tk.X, padx=10, pady=10)
+        # El primer paso de simulación se hace cuando la ventana ya está visible
+        super().__init__(semilla=semilla, ruta_registro=ruta_registro, iniciar_ahora=False,
+                         reglas_alerta=reglas_alerta, valvulas=valvulas, suelos=suelos)
+        self.iniciada = False
+        self.orden_remota = False  # True mientras se ejecuta una orden del servidor
+        self.marcar_arranque('modelo')
+        
+        # Vista de mapa de calor de la parcela (rejilla de interpolación y colores en caché)
+        self.vista_mapa_calor = tk.BooleanVar(value=False)
+        self.mapa_calor = None
+        self.paleta_calor = None
+        self.imagen_calor = None
+        
+        # Las pestañas se construyen la primera vez que se seleccionan
+        self.pestanas_creadas = set()
+        self.pestanas_pendientes = {}  # ruta del frame -> (nombre, constructor)
+        self.crear_interfaz()
+        self.marcar_arranque('interfaz')
         
-        self.etapa_label = tk.Label(self.cultivo_frame, text="Estado: No sembrado", 
-                                   font=('Arial', 11, 'bold'), bg='#4a7c1f', fg='#ffeb3b')
-        self.etapa_label.pack(anchor=tk.W)
+        self.root.bind('<Map>', self.al_mostrar_ventana)
+    
+    def marcar_arranque(self, etapa):
+        """Registra cuánto tardó el arranque hasta `etapa`"""
+        self.tiempos_arranque.append((etapa, time.perf_counter() - self.inicio_arranque))
+    
+    def al_mostrar_ventana(self, event):
+        if event.widget is not self.root or self.iniciada:
+            return
+        self.marcar_arranque('ventana visible')
+        self.root.after_idle(self.primer_paso)
+    
+    def primer_paso(self):
+        """Simula el primer mes una vez que la ventana está en pantalla"""
+        if self.iniciada:
+            return
+        self.iniciar()
+        self.iniciada = True
+        self.construir_pestana_seleccionada(self.notebook)
+        self.refrescar_interfaz()
+        self.marcar_arranque('primer paso')
+        
+        if self.mostrar_tiempos:
+            print(" | ".join(f"{etapa}: {segundos * 1000:.0f} ms"
+                             for etapa, segundos in self.tiempos_arranque), file=sys.stderr)
+        if self.puerto_servidor:
+            self.iniciar_servidor(self.puerto_servidor)
+        self.verificar_alertas()
+    
+    def registrar_pestana(self, notebook, frame, nombre, constructor):
+        """Agrega una pestaña vacía cuyo contenido se construye al seleccionarla"""
+        self.pestanas_pendientes[str(frame)] = (nombre, constructor, frame)
+        notebook.bind('<<NotebookTabChanged>>',
+                      lambda e: self.construir_pestana_seleccionada(e.widget))
+    
+    def construir_pestana_seleccionada(self, notebook):
+        if not self.iniciada:
+            return
+        pendiente = self.pestanas_pendientes.pop(notebook.select(), None)
+        if pendiente is None:
+            return
+        nombre, constructor, frame = pendiente
+        constructor(frame)
+        self.pestanas_creadas.add(nombre)
+        self.dibujar_pestana(nombre)
+    
+    def dibujar_pestana(self, nombre):
+        """Dibuja el contenido de una pestaña recién construida"""
+        dibujos = {
+            'informacion': (self.actualizar_controles, self.actualizar_info_cultivo),
+            'estadisticas': (self.actualizar_estadisticas,),
+            'barras': (self.actualizar_grafico_barras,),
+            'pastel': (self.actualizar_grafico_pastel,),
+            'prediccion': (self.actualizar_grafico_prediccion,),
+        }
+        for dibujar in dibujos.get(nombre, ()):
+            dibujar()
+    
+    def iniciar_servidor(self, puerto):
+        """Expone la simulación por HTTP/WebSocket mientras la interfaz sigue activa"""
+        self.ordenes = queue.Queue()
+        self.servidor = ServidorAPI(self, puerto=puerto, ejecutar=self.encolar_orden)
+        self.servidor.iniciar_en_hilo()
+        self.atender_ordenes()
+    
+    def encolar_orden(self, accion, args):
+        """Llamado desde el hilo del servidor: Tk solo se toca desde su propio hilo"""
+        futuro = concurrent.futures.Future()
+        self.ordenes.put((accion, args, futuro))
+        return futuro
+    
+    def atender_ordenes(self):
+        """Ejecuta las órdenes remotas pendientes sin diálogos de confirmación"""
+        # Con un diálogo abierto Tk sigue atendiendo temporizadores: una orden ejecutada
+        # dentro de otra acción se mezclaría con ella en el registro de eventos
+        while not self.accion_en_curso and not self.ordenes.empty():
+            accion, args, futuro = self.ordenes.get_nowait()
+            self.orden_remota = True
+            try:
+                resultado = getattr(SimulacionPlatano, accion)(self, *args)
+                if accion != 'avanzar_mes':  # avanzar_mes ya refresca la interfaz
+                    self.refrescar_interfaz()
+                futuro.set_result(resultado)
+            except Exception as error:
+                futuro.set_exception(error)
+            finally:
+                self.orden_remota = False
+        self.root.after(50, self.atender_ordenes)
+    
+    def crear_interfaz(self):
+        # Frame principal
+        main_frame = tk.Frame(self.root, bg='#2d5016')
+        main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
-        self.dias_label = tk.Label(self.cultivo_frame, text="", 
-                                  font=('Arial', 11), bg='#4a7c1f', fg='white')
-        self.dias_label.pack(anchor=tk.W)
+        # Título principal
+        titulo_frame = tk.Frame(main_frame, bg='#4a7c1f', height=80)
+        titulo_frame.pack(fill=tk.X, pady=(0,10))
+        titulo_frame.pack_propagate(False)
         
-        self.proxima_label = tk.Label(self.cultivo_frame, text="", 
-                                     font=('Arial', 11), bg='#4a7c1f', fg='white')
-        self.proxima_label.pack(anchor=tk.W)
+        tk.Label(titulo_frame, text="🌴 SISTEMA DE MONITOREO - CULTIVO DE PLÁTANO 🌴", 
+                font=('Arial', 20, 'bold'), bg='#4a7c1f', fg='white').pack(expand=True)
         
-        # Controles de simulación
-        control_frame = tk.LabelFrame(scrollable_frame, text="🎮 CONTROLES DE SIMULACIÓN", 
-                                     font=('Arial', 12, 'bold'), bg='#4a7c1f', fg='white',
-                                     padx=15, pady=15)
-        control_frame.pack(fill=tk.X, padx=10, pady=10)
+        # Frame para controles y visualización
+        content_frame = tk.Frame(main_frame, bg='#2d5016')
+        content_frame.pack(fill=tk.BOTH, expand=True)
         
-        tk.Button(control_frame, text="⏭️ AVANZAR MES", command=self.avanzar_mes,
-                 bg='#ff6b35', fg='white', font=('Arial', 12, 'bold'),
-                 relief=tk.RAISED, bd=3, cursor='hand2', width=20).pack(pady=5)
+        # Panel izquierdo - Vista de la parcela
+        left_panel = tk.Frame(content_frame, bg='#3a6519', relief=tk.RAISED, bd=3)
+        left_panel.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0,5))
         
-        tk.Button(control_frame, text="🔄 REINICIAR SIMULACIÓN", command=self.reiniciar_simulacion,
-                 bg='#2196f3', fg='white', font=('Arial', 12, 'bold'),
-                 relief=tk.RAISED, bd=3, cursor='hand2', width=20).pack(pady=5)
+        # Panel derecho - Gráficos y controles
+        right_panel = tk.Frame(content_frame, bg='#3a6519', relief=tk.RAISED, bd=3)
+        right_panel.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True, padx=(5,0))
         
-        # Estado de sensores
-        sensores_frame = tk.LabelFrame(scrollable_frame, text="🔍 ESTADO DE SENSORES", 
-                                      font=('Arial', 12, 'bold'), bg='#4a7c1f', fg='white',
-                                      padx=15, pady=15)
-        sensores_frame.pack(fill=tk.X, padx=10, pady=10)
+        self.crear_vista_parcela(left_panel)
+        self.crear_controles_derecha(right_panel)
+    
+    def crear_vista_parcela(self, parent):
+        """Crea la vista visual de la parcela con sensores"""
+        # Frame principal de la parcela
+        parcela_frame = tk.Frame(parent, bg='#3a6519')
+        parcela_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
-        # Crear grid de sensores
-        for area in range(self.num_areas):
-            area_frame = tk.Frame(sensores_frame, bg='#4a7c1f')
-            area_frame.pack(fill=tk.X, pady=2)
-            
-            tk.Label(area_frame, text=f"Área {area+1}:", font=('Arial', 9, 'bold'),
-                    bg='#4a7c1f', fg='white', width=8).pack(side=tk.LEFT)
-            
-            for sensor_idx in range(self.sensores_por_area):
-                sensor_id = area * self.sensores_por_area + sensor_idx
-                sensor_data = self.datos_sensores[sensor_id]
-                
-                # Color según estado
-                if sensor_data['humedad'] < self.humedad_ideal_min:
-                    color = '#ff9800'
-                elif sensor_data['humedad'] > self.humedad_ideal_max:
-                    color = '#f44336'
-                else:
-                    color = '#4caf50'
-                
-                sensor_text = f"S{sensor_id+1}: {sensor_data['humedad']}%"
-                lbl = tk.Label(area_frame, text=sensor_text, font=('Arial', 8),
-                             bg=color, fg='white', width=12)
-                lbl.pack(side=tk.LEFT, padx=2)
+        # Título
+        tk.Label(parcela_frame, text="🏞️ VISTA DE LA PARCELA", 
+                font=('Arial', 16, 'bold'), bg='#3a6519', fg='white').pack(pady=10)
         
-        # Leyenda
-        leyenda_frame = tk.Frame(sensores_frame, bg='#4a7c1f')
-        leyenda_frame.pack(fill=tk.X, pady=10)
+        # Frame con scroll para la parcela
+        parcela_container = tk.Frame(parcela_frame, bg='#3a6519')
+        parcela_container.pack(fill=tk.BOTH, expand=True)
         
-        tk.Label(leyenda_frame, text="Leyenda:", font=('Arial', 9, 'bold'),
-                bg='#4a7c1f', fg='white').pack(side=tk.LEFT)
+        # Canvas y scrollbar para la parcela
+        canvas_parcela = tk.Canvas(parcela_container, bg='#3a6519', highlightthickness=0)
+        scrollbar_parcela = tk.Scrollbar(parcela_container, orient="vertical", command=canvas_parcela.yview)
         
-        for color, texto in [('#4caf50', 'Ideal'), ('#ff9800', 'Baja'), ('#f44336', 'Alta')]:
-            tk.Label(leyenda_frame, text="■", font=('Arial', 12),
-                    bg=color, fg=color).pack(side=tk.LEFT, padx=2)
-            tk.Label(leyenda_frame, text=texto, font=('Arial', 8),
-                    bg='#4a7c1f', fg='white').pack(side=tk.LEFT, padx=5)
-    
-    def crear_pestana_graficos(self, parent):
-        """Crea la pestaña de gráficos con scroll"""
-        # Frame con scroll para gráficos
-        canvas_graficos = tk.Canvas(parent, bg='#2d5016', highlightthickness=0)
-        scrollbar_graficos = tk.Scrollbar(parent, orient="vertical", command=canvas_graficos.yview)
-        scrollable_graficos = tk.Frame(canvas_graficos, bg='#2d5016')
+        self.scrollable_parcela = tk.Frame(canvas_parcela, bg='#3a6519')
         
-        scrollable_graficos.bind(
+        self.scrollable_parcela.bind(
             "<Configure>",
-            lambda e: canvas_graficos.configure(scrollregion=canvas_graficos.bbox("all"))
+            lambda e: canvas_parcela.configure(scrollregion=canvas_parcela.bbox("all"))
         )
         
-        canvas_graficos.create_window((0, 0), window=scrollable_graficos, anchor="nw")
-        canvas_graficos.configure(yscrollcommand=scrollbar_graficos.set)
+        canvas_parcela.create_window((0, 0), window=self.scrollable_parcela, anchor="nw")
+        canvas_parcela.configure(yscrollcommand=scrollbar_parcela.set)
         
-        canvas_graficos.pack(side="left", fill="both", expand=True)
-        scrollbar_graficos.pack(side="right", fill="y")
+        canvas_parcela.pack(side="left", fill="both", expand=True)
+        scrollbar_parcela.pack(side="right", fill="y")
         
-        # Notebook para gráficos dentro del frame scrollable
-        graficos_notebook = ttk.Notebook(scrollable_graficos)
-        graficos_notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        # Canvas para dibujar la parcela dentro del frame scrollable
+        self.parcela_canvas = tk.Canvas(self.scrollable_parcela, bg='#5a8c2f', highlightthickness=0,
+                                       width=600, height=600)
+        self.parcela_canvas.pack(fill=tk.BOTH, expand=True, pady=10)
         
-        # Pestaña de gráfico de barras
-        bar_frame = tk.Frame(graficos_notebook, bg='#2d5016')
-        graficos_notebook.add(bar_frame, text='📊 Barras')
+        # Frame para controles de riego y siembra
+        controles_frame = tk.Frame(self.scrollable_parcela, bg='#3a6519')
+        controles_frame.pack(fill=tk.X, pady=10)
         
-        # Pestaña de gráfico de pastel
-        pie_frame = tk.Frame(graficos_notebook, bg='#2d5016')
-        graficos_notebook.add(pie_frame, text='🥧 Pastel')
+        # Pileta de agua
+        pileta_frame = tk.LabelFrame(controles_frame, text="💧 PILETA DE AGUA", 
+                                   font=('Arial', 12, 'bold'), bg='#4a7c1f', fg='white',
+                                   padx=10, pady=10)
+        pileta_frame.pack(fill=tk.X, pady=5)
         
-        # Pestaña de predicción
-        pred_frame = tk.Frame(graficos_notebook, bg='#2d5016')
-        graficos_notebook.add(pred_frame, text='🔮 Predicción')
+        # Botones de control de riego
+        botones_frame = tk.Frame(pileta_frame, bg='#4a7c1f')
+        botones_frame.pack(fill=tk.X, pady=5)
         
-        # Canvas para gráficos con tamaño fijo
-        self.bar_canvas = tk.Canvas(bar_frame, bg='#2d5016', highlightthickness=0, width=650, height=500)
-        self.bar_canvas.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        tk.Button(botones_frame, text="🚿 REGAR LADO IZQUIERDO", 
+                 command=lambda: self.regar_lado('izquierdo'),
+                 bg='#2196f3', fg='white', font=('Arial', 11, 'bold'),
+                 relief=tk.RAISED, bd=3, cursor='hand2', width=20).pack(side=tk.LEFT, padx=10)
+        
+        tk.Button(botones_frame, text="🚿 REGAR LADO DERECHO", 
+                 command=lambda: self.regar_lado('derecho'),
+                 bg='#2196f3', fg='white', font=('Arial', 11, 'bold'),
+                 relief=tk.RAISED, bd=3, cursor='hand2', width=20).pack(side=tk.RIGHT, padx=10)
         
-        self.pie_canvas = tk.Canvas(pie_frame, bg='#2d5016', highlightthickness=0, width=650, height=500)
-        self.pie_canvas.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        # Vista de la parcela: sensores individuales o mapa de calor interpolado
+        tk.Checkbutton(botones_frame, text="🗺️ Mapa de calor", variable=self.vista_mapa_calor,
+                      command=self.dibujar_parcela, bg='#4a7c1f', fg='white',
+                      selectcolor='#2d5016', font=('Arial', 10, 'bold')).pack(side=tk.LEFT, padx=10)
+        
+        # Una botonera por válvula para regar con más detalle
+        valvulas_frame = tk.Frame(pileta_frame, bg='#4a7c1f')
+        valvulas_frame.pack(fill=tk.X, pady=5)
+        tk.Label(valvulas_frame, text="Válvulas:", font=('Arial', 9, 'bold'),
+                bg='#4a7c1f', fg='white').pack(side=tk.LEFT, padx=5)
+        for valvula in range(len(self.valvulas)):
+            tk.Button(valvulas_frame, text=f"V{valvula + 1}",
+                     command=lambda v=valvula: self.abrir_valvulas(v),
+                     bg='#1976d2', fg='white', font=('Arial', 8, 'bold'),
+                     cursor='hand2', width=3).pack(side=tk.LEFT, padx=1)
         
-        self.pred_canvas = tk.Canvas(pred_frame, bg='#2d5016', highlightthickness=0, width=650, height=500)
-        self.pred_canvas.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-    
-    def crear_pestana_estadisticas(self, parent):
-        """Crea la pestaña de estadísticas detalladas con scroll"""
-        # Frame con scroll para estadísticas
-        canvas_stats = tk.Canvas(parent, bg='#2d5016', highlightthickness=0)
-        scrollbar_stats = tk.Scrollbar(parent, orient="vertical", command=canvas_stats.yview)
-        scrollable_stats = tk.Frame(canvas_stats, bg='#2d5016')
+        # Botón para sembrar plátano
+        siembra_frame = tk.Frame(pileta_frame, bg='#4a7c1f')
+        siembra_frame.pack(fill=tk.X, pady=5)
         
-        scrollable_stats.bind(
-            "<Configure>",
-            lambda e: canvas_stats.configure(scrollregion=canvas_stats.bbox("all"))
-        )
+        self.btn_sembrar = tk.Button(siembra_frame, text="🌱 SEMBRAR PLÁTANO", 
+                                    command=self.sembrar_platano,
+                                    bg='#4caf50', fg='white', font=('Arial', 12, 'bold'),
+                                    relief=tk.RAISED, bd=3, cursor='hand2', width=25)
+        self.btn_sembrar.pack(pady=5)
         
-        canvas_stats.create_window((0, 0), window=scrollable_stats, anchor="nw")
-        canvas_stats.configure(yscrollcommand=scrollbar_stats.set)
+        # Indicador de nivel de agua y estado del cultivo
+        info_frame = tk.Frame(pileta_frame, bg='#4a7c1f')
+        info_frame.pack(fill=tk.X, pady=5)
         
-        canvas_stats.pack(side="left", fill="both", expand=True)
-        scrollbar_stats.pack(side="right", fill="y")
+        self.nivel_label = tk.Label(info_frame, text=f"Nivel de agua: {self.nivel_agua:.0f}%", 
+                                   font=('Arial', 11, 'bold'), bg='#4a7c1f', fg='#00ffff')
+        self.nivel_label.pack(side=tk.LEFT, padx=20)
         
-        # Canvas para estadísticas
-        self.stats_canvas = tk.Canvas(scrollable_stats, bg='#2d5016', highlightthickness=0, width=650, height=800)
-        self.stats_canvas.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-    
-    def sembrar_platano(self):
-        """Acción de sembrar plátano"""
-        if self.platano_sembrado:
-            messagebox.showinfo("Cultivo Existente", "¡Ya hay plátanos sembrados en la parcela!")
-            return
+        self.estado_cultivo_label = tk.Label(info_frame, text="Estado: No sembrado", 
+                                            font=('Arial', 11, 'bold'), bg='#4a7c1f', fg='#ffeb3b')
+        self.estado_cultivo_label.pack(side=tk.RIGHT, padx=20)
         
-        self.platano_sembrado = True
-        self.etapa_crecimiento = 1  # Comienza en germinación
-        self.dias_desde_siembra = 0
-        self.btn_sembrar.config(text="🌱 PLÁTANO SEMBRADO", state=tk.DISABLED, bg='#795548')
+        # Botón para recargar agua
+        recarga_frame = tk.Frame(pileta_frame, bg='#4a7c1f')
+        recarga_frame.pack(fill=tk.X, pady=5)
         
-        # ACTUALIZAR EL ESTADO A "Plátanos sembrados" - CORRECCIÓN APLICADA
-        self.estado_cultivo_label.config(text="Estado: Plátanos sembrados")
-        self.actualizar_info_cultivo()
+        tk.Button(recarga_frame, text="💦 RECARGAR AGUA", 
+                 command=self.recargar_agua,
+                 bg='#00bcd4', fg='white', font=('Arial', 11, 'bold'),
+                 relief=tk.RAISED, bd=3, cursor='hand2', width=20).pack(pady=5)
         
+        # Dibujar la parcela inicial
         self.dibujar_parcela()
-        messagebox.showinfo("Siembra Exitosa", 
-                          "✅ ¡Plátanos sembrados correctamente!\n\n"
-                          "🌱 Etapa: Germinación\n"
-                          "⏰ Próxima etapa en: 30 días\n"
-                          "💧 Mantén la humedad entre 65%-80%")
-    
-    def recargar_agua(self):
-        """Recarga la pileta de agua"""
-        self.nivel_agua = 100
-        self.nivel_label.config(text=f"Nivel de agua: {self.nivel_agua}%")
-        self.dibujar_parcela()
-        messagebox.showinfo("Agua Recargada", "✅ La pileta ha sido recargada al 100%")
     
-    def regar_lado(self, lado):
-        """Riega un lado específico de la parcela"""
-        if self.nivel_agua < 10:
-            messagebox.showwarning("Agua Insuficiente", 
-                                 "¡La pileta está casi vacía! Recargue agua primero.")
-            return
+    def dibujar_parcela(self):
+        """Dibuja la representación visual de la parcela"""
+        self.parcela_canvas.delete("all")
         
-        # Reducir nivel de agua
-        self.nivel_agua = max(0, self.nivel_agua - 15)
-        self.nivel_label.config(text=f"Nivel de agua: {self.nivel_agua}%")
+        canvas_width = 600
+        canvas_height = 600
         
-        # Aumentar humedad en los sensores del lado seleccionado
-        sensores_regados = 0
-        for sensor_id, data in self.datos_sensores.items():
-            if data['lado'] == lado:
-                # Aumentar humedad entre 15-25%
-                aumento = random.uniform(15, 25)
-                nueva_humedad = min(95, data['humedad'] + aumento)
-                self.datos_sensores[sensor_id]['humedad'] = round(nueva_humedad, 1)
-                sensores_regados += 1
+        # Dibujar el canal central
+        canal_x = canvas_width // 2
+        canal_ancho = 30
+        self.parcela_canvas.create_rectangle(canal_x - canal_ancho//2, 50,
+                                           canal_x + canal_ancho//2, canvas_height - 50,
+                                           fill='#1e88e5', outline='#0d47a1', width=2, tags='canal')
         
-        # Actualizar visualización
-        self.dibujar_parcela()
-        self.actualizar_graficos()
-        self.actualizar_estadisticas()
+        # Dibujar texto "CANAL"
+        self.parcela_canvas.create_text(canal_x, canvas_height // 2, 
+                                       text="CANAL", font=('Arial', 12, 'bold'),
+                                       fill='white', angle=90, tags='canal')
         
-        messagebox.showinfo("Riego Completado", 
-                          f"✅ Lado {lado.upper()} regado correctamente\n"
-                          f"📊 {sensores_regados} sensores actualizados\n"
-                          f"💧 Nivel de agua restante: {self.nivel_agua}%")
-    
-    def avanzar_mes(self):
-        """Avanza al siguiente mes en la simulación"""
-        self.mes_actual = (self.mes_actual + 1) % 12
+        if self.vista_mapa_calor.get():
+            # Humedad interpolada de toda la parcela, bajo el canal
+            self.dibujar_mapa_calor(50, 50, canvas_width - 50, canvas_height - 50)
+            self.parcela_canvas.tag_raise('canal')
+        else:
+            # Dibujar sensores del lado izquierdo
+            lado_izq_x = canal_x - canal_ancho//2 - 60
+            self.dibujar_sensores_lado(lado_izq_x, 'izquierdo')
+            
+            # Dibujar sensores del lado derecho
+            lado_der_x = canal_x + canal_ancho//2 + 60
+            self.dibujar_sensores_lado(lado_der_x, 'derecho')
         
-        # Recargar un poco de agua cada mes (lluvia natural)
-        self.nivel_agua = min(100, self.nivel_agua + 10)
-        self.nivel_label.config(text=f"Nivel de agua: {self.nivel_agua}%")
+        # Dibujar pileta de agua
+        self.dibujar_pileta_agua()
         
-        # Avanzar crecimiento del plátano
+        # Dibujar plátanos si están sembrados
         if self.platano_sembrado:
-            self.dias_desde_siembra += 30  # 30 días por mes
-            
-            # Actualizar etapa de crecimiento
-            if self.dias_desde_siembra >= 90:
-                self.etapa_crecimiento = 3  # Maduración
-            elif self.dias_desde_siembra >= 60:
-                self.etapa_crecimiento = 2  # Crecimiento
+            self.dibujar_platanos()
+    
+    def dibujar_mapa_calor(self, x0, y0, x1, y1, zoom=5):
+        """Dibuja la humedad interpolada como una sola imagen en el rectángulo dado.
         
-        self.actualizar_simulacion()
+        La imagen se calcula a 1/`zoom` de resolución, se carga en un PhotoImage con una
+        sola llamada y Tk la amplía.
+        """
+        if not self.datos_sensores:
+            return
+        ancho, alto = (x1 - x0) // zoom, (y1 - y0) // zoom
+        rejilla = self.rejilla_humedad()
+        mapa = self.mapa_calor
+        if mapa is None or (mapa.filas, mapa.columnas, mapa.ancho, mapa.alto) != (
+                len(rejilla), len(rejilla[0]), ancho, alto):
+            mapa = self.mapa_calor = MapaCalor(len(rejilla), len(rejilla[0]), ancho, alto)
+        
+        coef = self.coeficientes
+        minimo, maximo = coef['humedad_suelo_min'], coef['humedad_suelo_max']
+        if self.paleta_calor is None:
+            # Seco (marrón) -> bajo el ideal (naranja) -> ideal (verde) -> exceso (rojo)
+            def posicion(humedad):
+                return (humedad - minimo) / (maximo - minimo)
+            self.paleta_calor = MapaCalor.paleta([
+                (0.0, '#5d4037'), (posicion(self.humedad_ideal_min), '#ff9800'),
+                (posicion((self.humedad_ideal_min + self.humedad_ideal_max) / 2), '#4caf50'),
+                (posicion(self.humedad_ideal_max), '#4caf50'), (1.0, '#f44336')])
+        
+        imagen = tk.PhotoImage(master=self.parcela_canvas, format='PPM',
+                               data=mapa.ppm(rejilla, minimo, maximo, self.paleta_calor))
+        self.imagen_calor = imagen.zoom(zoom)  # referencia para que Tk no la libere
+        self.parcela_canvas.create_image(x0, y0, image=self.imagen_calor, anchor='nw')
+        self.parcela_canvas.create_text((x0 + x1) // 2, y0 - 20,
+                                        text=f"Mapa de humedad ({minimo}% - {maximo}%)",
+                                        font=('Arial', 10, 'bold'), fill='white')
     
-    def reiniciar_simulacion(self):
-        """Reinicia la simulación a su estado inicial"""
-        self.mes_actual = 0
-        self.historial_humedad = []
-        self.historial_riego = []
-        self.alertas = []
-        self.nivel_agua = 80
-        self.nivel_label.config(text=f"Nivel de agua: {self.nivel_agua}%")
-        self.platano_sembrado = False
-        self.etapa_crecimiento = 0
-        self.dias_desde_siembra = 0
-        self.btn_sembrar.config(text="🌱 SEMBRAR PLÁTANO", state=tk.NORMAL, bg='#4caf50')
+    def dibujar_sensores_lado(self, x_base, lado):
+        """Dibuja los sensores de un lado específico"""
+        canvas_height = 600
         
-        # RESTABLECER EL ESTADO A "No sembrado" AL REINICIAR
-        self.estado_cultivo_label.config(text="Estado: No sembrado")
-        self.actualizar_info_cultivo()
+        # Sensores de este lado, ordenados por área (ninguno antes del primer paso)
+        sensores_lado = [(sensor_id, self.datos_sensores[sensor_id])
+                         for area in self.areas_lado[lado]
+                         for sensor_id in self.sensores_area[area]
+                         if sensor_id in self.datos_sensores]
         
-        self.inicializar_datos()
-        self.actualizar_simulacion()
-        messagebox.showinfo("Reinicio", "Simulación reiniciada correctamente")
-    
-    def actualizar_info_cultivo(self):
-        """Actualiza la información del cultivo en la interfaz"""
-        if self.platano_sembrado:
-            etapas = {1: "Germinación", 2: "Crecimiento", 3: "Maduración"}
-            etapa_text = etapas.get(self.etapa_crecimiento, "Desconocida")
+        # Dibujar 6 sensores en este lado (2 por área × 3 áreas en vertical)
+        espaciado_y = (canvas_height - 100) // 6
+        radio_sensor = 15
+        
+        for i, (sensor_id, data) in enumerate(sensores_lado[:6]):  # Solo primeros 6 del lado
+            y = 80 + i * espaciado_y
             
-            self.etapa_label.config(text=f"Etapa: {etapa_text}")
-            self.dias_label.config(text=f"Días desde siembra: {self.dias_desde_siembra}")
+            # Color según estado de humedad (gris si la lectura es sospechosa)
+            if data['estado'] == 'Sospechoso':
+                color = '#9e9e9e'
+            elif data['humedad'] < self.humedad_ideal_min:
+                color = '#ff9800'  # Naranja - baja humedad
+            elif data['humedad'] > self.humedad_ideal_max:
+                color = '#f44336'  # Rojo - alta humedad
+            else:
+                color = '#4caf50'  # Verde - ideal
             
-            if self.etapa_crecimiento < 3:
-                dias_restantes = 30 - (self.dias_desde_siembra % 30)
-                self.proxima_label.config(text=f"Próxima etapa en: {dias_restantes} días")
+            # Dibujar sensor
+            self.parcela_canvas.create_oval(x_base - radio_sensor, y - radio_sensor,
+                                           x_base + radio_sensor, y + radio_sensor,
+                                           fill=color, outline='white', width=2)
+            
+            # Etiqueta del sensor
+            self.parcela_canvas.create_text(x_base, y, 
+                                           text=str(sensor_id + 1),
+                                           font=('Arial', 8, 'bold'), fill='white')
+            
+            # Indicador de humedad
+            humedad_text = f"{data['humedad']}%"
+            self.parcela_canvas.create_text(x_base, y + radio_sensor + 10,
+                                           text=humedad_text,
+                                           font=('Arial', 7), fill='white')
+            
+            # Lateral de riego conectando al canal (azul si llevó agua en el último riego)
+            canal_x = 300
+            if self.red.flujo_laterales[data['area']] > 0:
+                linea = {'fill': '#29b6f6', 'width': 2}
             else:
-                self.proxima_label.config(text="¡Etapa final alcanzada!")
-        else:
-            self.etapa_label.config(text="Estado: No sembrado")
-            self.dias_label.config(text="")
-            self.proxima_label.config(text="")
-    
-    def actualizar_simulacion(self):
-        """Actualiza toda la simulación con los datos del mes actual"""
-        self.simular_clima()
-        self.actualizar_controles()
-        self.actualizar_graficos()
-        self.actualizar_estadisticas()
-        self.actualizar_info_cultivo()
-        self.dibujar_parcela()
-        self.verificar_alertas()
+                linea = {'fill': '#888888', 'width': 1, 'dash': (2, 2)}
+            if lado == 'izquierdo':
+                self.parcela_canvas.create_line(x_base + radio_sensor, y,
+                                               canal_x - 15, y, **linea)
+            else:
+                self.parcela_canvas.create_line(x_base - radio_sensor, y,
+                                               canal_x + 15, y, **linea)
     
-    def simular_clima(self):
-        """Simula los efectos del clima en la humedad del suelo"""
-        mes_nombre = self.meses[self.mes_actual]
-        clima = self.patrones_clima[mes_nombre]
+    def dibujar_pileta_agua(self):
+        """Dibuja la pileta de agua"""
+        canvas_width = 600
+        canvas_height = 600
+        
+        # Posición de la pileta (abajo a la derecha)
+        pileta_x = canvas_width - 100
+        pileta_y = canvas_height - 80
+        pileta_ancho = 80
+        pileta_alto = 60
         
-        # Calcular efecto neto en humedad
-        efecto_lluvia = clima['lluvia'] * 0.1
-        efecto_sequia = clima['sequia'] * 0.2
-        efecto_temperatura = (clima['temperatura'] - 25) * 0.5
+        # Dibujar pileta
+        self.parcela_canvas.create_rectangle(pileta_x, pileta_y,
+                                           pileta_x + pileta_ancho, pileta_y + pileta_alto,
+                                           fill='#1e88e5', outline='#0d47a1', width=3)
         
-        cambio_humedad_neto = efecto_lluvia - efecto_sequia - efecto_temperatura
+        # Dibujar nivel de agua
+        nivel_alto = (self.nivel_agua / 100) * pileta_alto
+        self.parcela_canvas.create_rectangle(pileta_x, pileta_y + pileta_alto - nivel_alto,
+                                           pileta_x + pileta_ancho, pileta_y + pileta_alto,
+                                           fill='#29b6f6', outline='')
         
-        # Aplicar cambios a cada sensor
-        for sensor_id in self.datos_sensores:
-            variacion = random.uniform(-5, 5)
-            nueva_humedad = self.datos_sensores[sensor_id]['humedad'] + cambio_humedad_neto + variacion
-            nueva_humedad = max(30, min(95, nueva_humedad))
-            
-            self.datos_sensores[sensor_id]['humedad'] = round(nueva_humedad, 1)
+        # Etiqueta de la pileta
+        self.parcela_canvas.create_text(pileta_x + pileta_ancho//2, pileta_y - 10,
+                                       text="PILETA", font=('Arial', 9, 'bold'),
+                                       fill='white')
         
-        # Registrar datos para historial
-        humedades = [sensor['humedad'] for sensor in self.datos_sensores.values()]
-        humedad_promedio = sum(humedades) / len(humedades)
-        self.historial_humedad.append(humedad_promedio)
+        # Tuberías de conexión a los lados
+        canal_x = 300
+        self.parcela_canvas.create_line(pileta_x, pileta_y + pileta_alto//2,
+                                       canal_x, pileta_y + pileta_alto//2,
+                                       fill='#888888', width=2)
     
-    def actualizar_controles(self):
-        """Actualiza los controles de la interfaz"""
-        mes_nombre = self.meses[self.mes_actual]
-        clima = self.patrones_clima[mes_nombre]
+    def dibujar_platanos(self):
+        """Dibuja los plátanos en la parcela, agregados por área"""
+        canvas_width = 600
         
-        self.mes_label.config(text=f"Mes: {mes_nombre}")
-        self.clima_label.config(
-            text=f"Lluvia: {clima['lluvia']}mm | Temp: {clima['temperatura']}°C | Sequía: {clima['sequia']}%"
-        )
+        canal_x = canvas_width // 2
+        
+        # Un marcador por área en lugar de un elemento por planta
+        estilos = {1: ('#8bc34a', "🌱"), 2: ('#4caf50', "🌿"), 3: ('#388e3c', "🍌")}
+        resumen = self.crecimiento.resumen_por_area()
+        areas_por_lado = self.num_areas // 2
+        
+        for area, (cantidad, etapa_media, dominante, salud) in enumerate(resumen):
+            if cantidad == 0:
+                continue
+            
+            lado, fila = divmod(area, areas_por_lado)
+            x_base = canal_x - 190 if lado == 0 else canal_x + 190
+            y = 70 + fila * 80
+            
+            # Tamaño según etapa de crecimiento promedio, color según etapa dominante
+            tamaño = 5 + 10 * etapa_media
+            color, emoji = estilos[dominante]
+            borde = '#2e7d32' if salud >= 0.8 else ('#ffeb3b' if salud >= 0.5 else '#795548')
+            
+            # Dibujar grupo de plantas
+            self.parcela_canvas.create_oval(x_base - tamaño, y - tamaño,
+                                           x_base + tamaño, y + tamaño,
+                                           fill=color, outline=borde, width=3)
+            
+            # Dibujar emoji de plátano
+            self.parcela_canvas.create_text(x_base, y, text=emoji,
+                                           font=('Arial', 12), fill='#795548')
+            
+            # Cantidad de plantas del área
+            self.parcela_canvas.create_text(x_base, y + tamaño + 8, text=str(cantidad),
+                                           font=('Arial', 7), fill='white')
     
-    def actualizar_graficos(self):
-        """Actualiza todos los gráficos"""
-        self.actualizar_grafico_barras()
-        self.actualizar_grafico_pastel()
-        self.actualizar_grafico_prediccion()
+    def crear_controles_derecha(self, parent):
+        """Crea los controles del panel derecho"""
+        # Notebook para organizar contenido
+        notebook = self.notebook = ttk.Notebook(parent)
+        notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        # Estilo para el notebook
+        style = ttk.Style()
+        style.configure('TNotebook.Tab', font=('Arial', 10, 'bold'))
+        
+        # Pestaña 1: Información y controles
+        info_tab = tk.Frame(notebook, bg='#2d5016')
+        notebook.add(info_tab, text='📋 Información')
+        
+        # Pestaña 2: Gráficos
+        graficos_tab = tk.Frame(notebook, bg='#2d5016')
+        notebook.add(graficos_tab, text='📊 Gráficos')
+        
+        # Pestaña 3: Estadísticas Detalladas
+        stats_tab = tk.Frame(notebook, bg='#2d5016')
+        notebook.add(stats_tab, text='📈 Estadísticas')
+        
+        self.registrar_pestana(notebook, info_tab, 'informacion', self.crear_pestana_informacion)
+        self.registrar_pestana(notebook, graficos_tab, 'graficos', self.crear_pestana_graficos)
+        self.registrar_pestana(notebook, stats_tab, 'estadisticas', self.crear_pestana_estadisticas)
     
-    def actualizar_estadisticas(self):
-        """Actualiza las estadísticas detalladas"""
-        self.stats_canvas.delete("all")
+    def crear_pestana_informacion(self, parent):
+        """Crea la pestaña de información con scroll"""
+        # Frame con scroll
+        canvas = tk.Canvas(parent, bg='#2d5016', highlightthickness=0)
+        scrollbar = tk.Scrollbar(parent, orient="vertical", command=canvas.yview)
+        scrollable_frame = tk.Frame(canvas, bg='#2d5016')
         
-        if not self.historial_humedad:
-            self.stats_canvas.create_text(325, 400, 
-                                        text='No hay datos suficientes\npara mostrar estadísticas', 
-                                        font=('Arial', 14, 'bold'), fill='white',
-                                        justify=tk.CENTER)
-            return
+        scrollable_frame.bind(
+            "<Configure>",
+            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
+        )
         
-        # Calcular estadísticas
-        humedad_actual = self.historial_humedad[-1] if self.historial_humedad else 0
-        humedad_min = min(self.historial_humedad) if self.historial_humedad else 0
-        humedad_max = max(self.historial_humedad) if self.historial_humedad else 0
-        humedad_promedio = sum(self.historial_humedad) / len(self.historial_humedad) if self.historial_humedad else 0
+        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
+        canvas.configure(yscrollcommand=scrollbar.set)
         
-        # Contar sensores por estado
-        estados = {'IDEAL': 0, 'BAJA': 0, 'ALTA': 0}
-        for sensor in self.datos_sensores.values():
-            if sensor['humedad'] < self.humedad_ideal_min:
-                estados['BAJA'] += 1
-            elif sensor['humedad'] > self.humedad_ideal_max:
-                estados['ALTA'] += 1
-            else:
-                estados['IDEAL'] += 1
+        canvas.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
         
-        # Texto de estadísticas
-        stats_text = f"""ESTADÍSTICAS DETALLADAS - MES {self.meses[self.mes_actual]}
-
-HUMEDAD:
-• Actual: {humedad_actual:.1f}%
-• Mínima Histórica: {humedad_min:.1f}%
-• Máxima Histórica: {humedad_max:.1f}%
-• Promedio: {humedad_promedio:.1f}%
-
-SENSORES ({self.total_sensores} total):
-• Ideales: {estados['IDEAL']} ({estados['IDEAL']/self.total_sensores*100:.1f}%)
-• Baja Humedad: {estados['BAJA']} ({estados['BAJA']/self.total_sensores*100:.1f}%)
-• Alta Humedad: {estados['ALTA']} ({estados['ALTA']/self.total_sensores*100:.1f}%)
-
-RECURSOS:
-• Nivel de agua: {self.nivel_agua}%
-• Meses simulados: {len(self.historial_humedad)}
-• Áreas totales: {self.num_areas}
-
-CULTIVO:
-• Estado: {'Plátanos sembrados' if self.platano_sembrado else 'No sembrado'}"""
+        # Información del mes actual
+        info_frame = tk.LabelFrame(scrollable_frame, text="📅 INFORMACIÓN DEL MES ACTUAL", 
+                                  font=('Arial', 12, 'bold'), bg='#4a7c1f', fg='white',
+                                  padx=15, pady=15)
+        info_frame.pack(fill=tk.X, padx=10, pady=10)
         
-        if self.platano_sembrado:
-            etapas = {1: "Germinación", 2: "Crecimiento", 3: "Maduración"}
-            etapa_text = etapas.get(self.etapa_crecimiento, "Desconocida")
-            stats_text += f"""
-• Etapa actual: {etapa_text}
-• Días desde siembra: {self.dias_desde_siembra}
-• Próxima etapa: {30 - (self.dias_desde_siembra % 30) if self.etapa_crecimiento < 3 else '¡Final!'} días
-
-RANGO IDEAL PARA PLÁTANO: {self.humedad_ideal_min}% - {self.humedad_ideal_max}%"""
+        self.mes_label = tk.Label(info_frame, text="Mes: Enero", font=('Arial', 14, 'bold'),
+                                 bg='#4a7c1f', fg='yellow')
+        self.mes_label.pack(anchor=tk.W)
         
-        # Dibujar texto
-        lines = stats_text.split('\n')
-        for i, line in enumerate(lines):
-            y_pos = 50 + i * 25
-            self.stats_canvas.create_text(50, y_pos, text=line, 
-                                         font=('Arial', 11, 'bold'), 
-                                         fill='white', anchor=tk.W)
+        self.clima_label = tk.Label(info_frame, text="Lluvia: 40mm | Temp: 28°C | Sequía: 20%",
+                                   font=('Arial', 11), bg='#4a7c1f', fg='white')
+        self.clima_label.pack(anchor=tk.W)
         
-        # Título
-        self.stats_canvas.create_text(325, 20, 
-                                     text="📈 ESTADÍSTICAS DETALLADAS", 
-                                     font=('Arial', 16, 'bold'), fill='white')
+        # Información del cultivo
+        self.cultivo_frame = tk.LabelFrame(scrollable_frame, text="🌱 ESTADO DEL CULTIVO", 
+                                        font=('Arial', 12, 'bold'), bg='#4a7c1f', fg='white',
+                                        padx=15, pady=15)
+        self.cultivo_frame.pack(fill=tk.X, padx=10, pady=10)
         
-        # Dibujar gráfico de progreso si hay cultivo
-        if self.platano_sembrado:
-            self.dibujar_progreso_cultivo()
-    
-    def dibujar_progreso_cultivo(self):
-        """Dibuja una barra de progreso del cultivo"""
-        y_base = 600
-        ancho_total = 600
-        alto_barra = 30
+        self.etapa_label = tk.Label(self.cultivo_frame, text="Estado: No sembrado", 
+                                   font=('Arial', 11, 'bold'), bg='#4a7c1f', fg='#ffeb3b')
+        self.etapa_label.pack(anchor=tk.W)
         
-        # Fondo de la barra
-        self.stats_canvas.create_rectangle(50, y_base, 50 + ancho_total, y_base + alto_barra,
-                                          fill='#333333', outline='white', width=2)
+        self.dias_label = tk.Label(self.cultivo_frame, text="", 
+                                  font=('Arial', 11), bg='#4a7c1f', fg='white')
+        self.dias_label.pack(anchor=tk.W)
         
-        # Progreso actual
-        progreso = min(1.0, self.dias_desde_siembra / 90.0)
-        ancho_progreso = ancho_total * progreso
+        self.proxima_label = tk.Label(self.cultivo_frame, text="", 
+                                     font=('Arial', 11), bg='#4a7c1f', fg='white')
+        self.proxima_label.pack(anchor=tk.W)
         
-        # Color según etapa
-        if self.etapa_crecimiento == 1:
-            color = '#8bc34a'
-        elif self.etapa_crecimiento == 2:
-            color = '#4caf50'
-        else:
-            color = '#388e3c'
+        self.rendimiento_label = tk.Label(self.cultivo_frame, text="", 
+                                         font=('Arial', 11), bg='#4a7c1f', fg='white')
+        self.rendimiento_label.pack(anchor=tk.W)
         
-        # Barra de progreso
-        self.stats_canvas.create_rectangle(50, y_base, 50 + ancho_progreso, y_base + alto_barra,
-                                          fill=color, outline='')
+        # Controles de simulación
+        control_frame = tk.LabelFrame(scrollable_frame, text="🎮 CONTROLES DE SIMULACIÓN", 
+                                     font=('Arial', 12, 'bold'), bg='#4a7c1f', fg='white',
+                                     padx=15, pady=15)
+        control_frame.pack(fill=tk.X, padx=10, pady=10)
         
-        # Etiquetas
-        self.stats_canvas.create_text(325, y_base - 20, 
-                                     text="PROGRESO DEL CULTIVO", 
-                                     font=('Arial', 12, 'bold'), fill='white')
+        tk.Button(control_frame, text="⏭️ AVANZAR MES", command=self.avanzar_mes,
+                 bg='#ff6b35', fg='white', font=('Arial', 12, 'bold'),
+                 relief=tk.RAISED, bd=3, cursor='hand2', width=20).pack(pady=5)
         
-        self.stats_canvas.create_text(325, y_base + alto_barra + 20, 
-                                     text=f"{self.dias_desde_siembra}/90 días ({progreso*100:.1f}%)", 
-                                     font=('Arial', 10, 'bold'), fill='white')
+        tk.Button(control_frame, text="🔄 REINICIAR SIMULACIÓN", command=self.reiniciar_simulacion,
+                 bg='#2196f3', fg='white', font=('Arial', 12, 'bold'),
+                 relief=tk.RAISED, bd=3, cursor='hand2', width=20).pack(pady=5)
         
-        # Marcas de etapas
-        for i, (dias, etapa) in enumerate([(0, "Inicio"), (30, "Germ"), (60, "Crec"), (90, "Mad")]):
-            x = 50 + (dias / 90.0) * ancho_total
-            self.stats_canvas.create_line(x, y_base - 10, x, y_base + alto_barra + 10, 
-                                        fill='white', width=1)
-            self.stats_canvas.create_text(x, y_base - 25, text=etapa, 
-                                         font=('Arial', 8), fill='white')
-    
-    def actualizar_grafico_barras(self):
-        """Actualiza el gráfico de barras de humedad por áreas"""
-        self.bar_canvas.delete("all")
+        # Estado de sensores
+        sensores_frame = tk.LabelFrame(scrollable_frame, text="🔍 ESTADO DE SENSORES", 
+                                      font=('Arial', 12, 'bold'), bg='#4a7c1f', fg='white',
+                                      padx=15, pady=15)
+        sensores_frame.pack(fill=tk.X, padx=10, pady=10)
         
-        # Calcular humedad promedio por área
-        humedades_areas = []
+        # Crear grid de sensores
         for area in range(self.num_areas):
-            sensores_area = [self.datos_sensores[area * self.sensores_por_area + i] 
-                           for i in range(self.sensores_por_area)]
-            humedades = [sensor['humedad'] for sensor in sensores_area]
-            humedad_promedio = sum(humedades) / len(humedades)
-            humedades_areas.append(humedad_promedio)
+            area_frame = tk.Frame(sensores_frame, bg='#4a7c1f')
+            area_frame.pack(fill=tk.X, pady=2)
+            
+            tk.Label(area_frame, text=f"Área {area+1}:", font=('Arial', 9, 'bold'),
+                    bg='#4a7c1f', fg='white', width=8).pack(side=tk.LEFT)
+            
+            for sensor_id in self.sensores_area[area]:
+                sensor_data = self.datos_sensores[sensor_id]
+                
+                # Color según estado
+                if sensor_data['humedad'] < self.humedad_ideal_min:
+                    color = '#ff9800'
+                elif sensor_data['humedad'] > self.humedad_ideal_max:
+                    color = '#f44336'
+                else:
+                    color = '#4caf50'
+                
+                sensor_text = f"S{sensor_id+1}: {sensor_data['humedad']}%"
+                lbl = tk.Label(area_frame, text=sensor_text, font=('Arial', 8),
+                             bg=color, fg='white', width=12)
+                lbl.pack(side=tk.LEFT, padx=2)
         
-        # Configuración del gráfico
-        canvas_width = 650
-        canvas_height = 500
-        margin = 80
-        graph_width = canvas_width - 2 * margin
-        graph_height = canvas_height - 2 * margin
-        bar_width = graph_width / (self.num_areas + 1)
+        # Leyenda
+        leyenda_frame = tk.Frame(sensores_frame, bg='#4a7c1f')
+        leyenda_frame.pack(fill=tk.X, pady=10)
         
-        # Dibujar ejes
-        self.bar_canvas.create_line(margin, margin, margin, canvas_height - margin, width=2, fill='white')
-        self.bar_canvas.create_line(margin, canvas_height - margin, canvas_width - margin, canvas_height - margin, width=2, fill='white')
+        tk.Label(leyenda_frame, text="Leyenda:", font=('Arial', 9, 'bold'),
+                bg='#4a7c1f', fg='white').pack(side=tk.LEFT)
         
-        # Título
-        self.bar_canvas.create_text(canvas_width // 2, 30, 
-                                   text="Humedad por Área de Cultivo", 
-                                   font=('Arial', 16, 'bold'), fill='white')
+        for color, texto in [('#4caf50', 'Ideal'), ('#ff9800', 'Baja'), ('#f44336', 'Alta')]:
+            tk.Label(leyenda_frame, text="■", font=('Arial', 12),
+                    bg=color, fg=color).pack(side=tk.LEFT, padx=2)
+            tk.Label(leyenda_frame, text=texto, font=('Arial', 8),
+                    bg='#4a7c1f', fg='white').pack(side=tk.LEFT, padx=5)
+    
+    def crear_pestana_graficos(self, parent):
+        """Crea la pestaña de gráficos con scroll"""
+        # Frame con scroll para gráficos
+        canvas_graficos = tk.Canvas(parent, bg='#2d5016', highlightthickness=0)
+        scrollbar_graficos = tk.Scrollbar(parent, orient="vertical", command=canvas_graficos.yview)
+        scrollable_graficos = tk.Frame(canvas_graficos, bg='#2d5016')
         
-        # Dibujar barras
-        max_humedad = max(humedades_areas) if humedades_areas else 100
-        min_humedad = min(humedades_areas) if humedades_areas else 0
+        scrollable_graficos.bind(
+            "<Configure>",
+            lambda e: canvas_graficos.configure(scrollregion=canvas_graficos.bbox("all"))
+        )
         
-        for i, humedad in enumerate(humedades_areas):
-            x0 = margin + (i + 0.5) * bar_width
-            y0 = canvas_height - margin
-            
-            # Calcular altura de la barra
-            bar_height = (humedad / 100) * graph_height
-            
-            # Color según humedad
-            if humedad < self.humedad_ideal_min:
-                color = '#ff9800'  # Naranja
-            elif humedad > self.humedad_ideal_max:
-                color = '#f44336'  # Rojo
-            else:
-                color = '#4caf50'  # Verde
-            
-            # Dibujar barra
-            self.bar_canvas.create_rectangle(
-                x0 - bar_width/2, y0 - bar_height,
-                x0 + bar_width/2, y0,
-                fill=color, outline='white', width=1
-            )
-            
-            # Etiqueta del valor
-            self.bar_canvas.create_text(x0, y0 - bar_height - 10, 
-                                       text=f"{humedad:.1f}%", 
-                                       font=('Arial', 9, 'bold'), fill='white')
-            
-            # Etiqueta del área
-            self.bar_canvas.create_text(x0, y0 + 15, 
-                                       text=f"Área {i+1}", 
-                                       font=('Arial', 9), fill='white')
+        canvas_graficos.create_window((0, 0), window=scrollable_graficos, anchor="nw")
+        canvas_graficos.configure(yscrollcommand=scrollbar_graficos.set)
+        
+        canvas_graficos.pack(side="left", fill="both", expand=True)
+        scrollbar_graficos.pack(side="right", fill="y")
+        
+        # Notebook para gráficos dentro del frame scrollable
+        graficos_notebook = ttk.Notebook(scrollable_graficos)
+        graficos_notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
-        # Líneas de referencia
-        y_ideal_min = canvas_height - margin - (self.humedad_ideal_min / 100) * graph_height
-        y_ideal_max = canvas_height - margin - (self.humedad_ideal_max / 100) * graph_height
+        # Pestaña de gráfico de barras
+        bar_frame = tk.Frame(graficos_notebook, bg='#2d5016')
+        graficos_notebook.add(bar_frame, text='📊 Barras')
         
-        self.bar_canvas.create_line(margin, y_ideal_min, canvas_width - margin, y_ideal_min, 
-                                   fill='blue', dash=(4, 2), width=2)
-        self.bar_canvas.create_line(margin, y_ideal_max, canvas_width - margin, y_ideal_max, 
-                                   fill='red', dash=(4, 2), width=2)
+        # Pestaña de gráfico de pastel
+        pie_frame = tk.Frame(graficos_notebook, bg='#2d5016')
+        graficos_notebook.add(pie_frame, text='🥧 Pastel')
         
-        # Leyenda
-        self.bar_canvas.create_text(canvas_width - 100, margin - 20, 
-                                   text="=== Mín Ideal", fill='blue', font=('Arial', 9))
-        self.bar_canvas.create_text(canvas_width - 100, margin, 
-                                   text="=== Máx Ideal", fill='red', font=('Arial', 9))
+        # Pestaña de predicción
+        pred_frame = tk.Frame(graficos_notebook, bg='#2d5016')
+        graficos_notebook.add(pred_frame, text='🔮 Predicción')
+        
+        # Canvas para gráficos con tamaño fijo, creados al abrir cada pestaña
+        self.registrar_pestana(graficos_notebook, bar_frame, 'barras', self.crear_grafico_barras)
+        self.registrar_pestana(graficos_notebook, pie_frame, 'pastel', self.crear_grafico_pastel)
+        self.registrar_pestana(graficos_notebook, pred_frame, 'prediccion', self.crear_grafico_prediccion)
+        self.construir_pestana_seleccionada(graficos_notebook)
     
-    def actualizar_grafico_pastel(self):
-        """Actualiza el gráfico de pastel de estados de sensores"""
-        self.pie_canvas.delete("all")
+    def crear_grafico_barras(self, parent):
+        self.bar_canvas = tk.Canvas(parent, bg='#2d5016', highlightthickness=0, width=650, height=500)
+        self.bar_canvas.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+    
+    def crear_grafico_pastel(self, parent):
+        self.pie_canvas = tk.Canvas(parent, bg='#2d5016', highlightthickness=0, width=650, height=500)
+        self.pie_canvas.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+    
+    def crear_grafico_prediccion(self, parent):
+        controles = tk.Frame(parent, bg='#2d5016')
+        controles.pack(fill=tk.X, padx=10, pady=(10, 0))
+        
+        # Ramas "¿qué pasa si...?": escenario de manejo y meses a simular
+        self.escenario_rama = tk.StringVar(value=next(iter(self.escenarios_rama)))
+        escenario = tk.OptionMenu(controles, self.escenario_rama, *self.escenarios_rama)
+        escenario.config(bg='#4a7c1f', fg='white', font=('Arial', 9, 'bold'))
+        escenario.pack(side=tk.LEFT)
+        self.meses_rama = tk.Spinbox(controles, from_=1, to=60, width=4, font=('Arial', 9))
+        self.meses_rama.delete(0, tk.END)
+        self.meses_rama.insert(0, '6')
+        self.meses_rama.pack(side=tk.LEFT, padx=5)
+        tk.Button(controles, text="🔀 Crear rama", command=self.crear_rama,
+                  bg='#ff9800', fg='white', font=('Arial', 9, 'bold'),
+                  cursor='hand2').pack(side=tk.LEFT, padx=5)
+        tk.Button(controles, text="✖ Quitar ramas", command=self.quitar_ramas,
+                  bg='#795548', fg='white', font=('Arial', 9, 'bold'),
+                  cursor='hand2').pack(side=tk.LEFT)
+        
+        # Selector de serie: promedio de la parcela o un sensor
+        opciones = ["Promedio"] + [f"Sensor {i + 1}" for i in range(self.total_sensores)]
+        self.serie_prediccion = tk.StringVar(value=opciones[0])
+        selector = tk.OptionMenu(controles, self.serie_prediccion, *opciones,
+                                 command=self.cambiar_serie_prediccion)
+        selector.config(bg='#4a7c1f', fg='white', font=('Arial', 9, 'bold'))
+        selector.pack(side=tk.RIGHT)
+        
+        self.pred_canvas = tk.Canvas(parent, bg='#2d5016', highlightthickness=0, width=650, height=500)
+        self.pred_canvas.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+    
+    def cambiar_serie_prediccion(self, opcion):
+        self.sensor_prediccion = None if opcion == "Promedio" else int(opcion.split()[1]) - 1
+        self.actualizar_grafico_prediccion()
+    
+    def crear_rama(self, escenario=None, meses=None):
+        """Bifurca la simulación con el escenario elegido y la compara en la predicción"""
+        if escenario is None:
+            escenario = self.escenario_rama.get()
+        if meses is None:
+            try:
+                meses = max(1, int(self.meses_rama.get()))
+            except ValueError:
+                messagebox.showwarning("Meses inválidos", "Indique un número entero de meses.")
+                return None
+        rama = super().crear_rama(escenario, meses)
+        self.actualizar_grafico_prediccion()
+        return rama
+    
+    def quitar_ramas(self):
+        """Descarta todas las ramas de la comparación"""
+        self.ramas.clear()
+        self.actualizar_grafico_prediccion()
+    
+    def crear_pestana_estadisticas(self, parent):
+        """Crea la pestaña de estadísticas detalladas con scroll"""
+        # Frame con scroll para estadísticas
+        canvas_stats = tk.Canvas(parent, bg='#2d5016', highlightthickness=0)
+        scrollbar_stats = tk.Scrollbar(parent, orient="vertical", command=canvas_stats.yview)
+        scrollable_stats = tk.Frame(canvas_stats, bg='#2d5016')
         
-        # Contar estados
-        estados = {'IDEAL': 0, 'BAJA': 0, 'ALTA': 0}
-        for sensor in self.datos_sensores.values():
-            if sensor['humedad'] < self.humedad_ideal_min:
-                estados['BAJA'] += 1
-            elif sensor['humedad'] > self.humedad_ideal_max:
-                estados['ALTA'] += 1
-            else:
-                estados['IDEAL'] += 1
+        scrollable_stats.bind(
+            "<Configure>",
+            lambda e: canvas_stats.configure(scrollregion=canvas_stats.bbox("all"))
+        )
         
-        total_sensores = self.total_sensores
-        if total_sensores == 0:
-            return
+        canvas_stats.create_window((0, 0), window=scrollable_stats, anchor="nw")
+        canvas_stats.configure(yscrollcommand=scrollbar_stats.set)
         
-        # Configuración
-        canvas_width = 650
-        canvas_height = 500
-        center_x = canvas_width // 2
-        center_y = canvas_height // 2
-        radius = 150
+        canvas_stats.pack(side="left", fill="both", expand=True)
+        scrollbar_stats.pack(side="right", fill="y")
         
-        # Colores
-        colores = {'IDEAL': '#4caf50', 'BAJA': '#ff9800', 'ALTA': '#f44336'}
+        # Canvas para estadísticas
+        self.stats_canvas = tk.Canvas(scrollable_stats, bg='#2d5016', highlightthickness=0, width=650, height=1300)
+        self.stats_canvas.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+    
+    def sembrar_platano(self):
+        """Acción de sembrar plátano"""
+        if self.crecimiento.espacio_libre() == 0:
+            messagebox.showinfo("Parcela Completa", "¡No queda espacio para sembrar más plátanos!")
+            return
         
-        # Dibujar gráfico de pastel
-        start_angle = 0
-        for estado, cantidad in estados.items():
-            if cantidad == 0:
-                continue
-                
-            # Calcular ángulo
-            angle = (cantidad / total_sensores) * 360
-            
-            # Dibujar sector
-            self.dibujar_sector(self.pie_canvas, center_x, center_y, radius, 
-                               start_angle, start_angle + angle, colores[estado])
-            
-            # Etiqueta
-            porcentaje = (cantidad / total_sensores) * 100
-            mid_angle = start_angle + angle / 2
-            label_radius = radius + 40
-            label_x = center_x + label_radius * math.cos(math.radians(mid_angle))
-            label_y = center_y - label_radius * math.sin(math.radians(mid_angle))
-            
-            self.pie_canvas.create_text(label_x, label_y, 
-                                       text=f"{estado}\n{porcentaje:.1f}%", 
-                                       font=('Arial', 10, 'bold'), 
-                                       fill=colores[estado], 
-                                       justify=tk.CENTER)
-            
-            start_angle += angle
+        sembradas = super().sembrar_platano()
         
-        # Título
-        self.pie_canvas.create_text(center_x, 30, 
-                                   text="Distribución de Estados de Sensores", 
-                                   font=('Arial', 16, 'bold'), fill='white')
+        self.actualizar_controles_siembra()
+        self.actualizar_info_cultivo()
         
-        # Leyenda
-        y_legend = center_y + radius + 60
-        for i, (estado, color) in enumerate(colores.items()):
-            x_legend = center_x - 100 + i * 120
-            self.pie_canvas.create_rectangle(x_legend - 50, y_legend - 15,
-                                           x_legend - 30, y_legend + 15,
-                                           fill=color, outline='white')
-            self.pie_canvas.create_text(x_legend, y_legend,
-                                       text=f"{estado}: {estados[estado]}",
-                                       font=('Arial', 10, 'bold'), fill='white')
+        self.dibujar_parcela()
+        messagebox.showinfo("Siembra Exitosa", 
+                          "✅ ¡Plátanos sembrados correctamente!\n\n"
+                          f"🌱 Nueva tanda: {sembradas} plantas en germinación\n"
+                          f"🌴 Total en la parcela: {self.crecimiento.total_plantas} plantas\n"
+                          "💧 Mantén la humedad entre 65%-80%")
     
-    def dibujar_sector(self, canvas, x, y, r, start_angle, end_angle, color):
-        """Dibuja un sector circular"""
-        points = [x, y]
-        for angle in range(int(start_angle), int(end_angle) + 1):
-            rad_angle = math.radians(angle)
-            points.extend([x + r * math.cos(rad_angle), y - r * math.sin(rad_angle)])
-        points.extend([x, y])
-        canvas.create_polygon(points, fill=color, outline='white', width=2)
+    def recargar_agua(self):
+        """Recarga la pileta de agua"""
+        super().recargar_agua()
+        self.nivel_label.config(text=f"Nivel de agua: {self.nivel_agua:.0f}%")
+        self.dibujar_parcela()
+        messagebox.showinfo("Agua Recargada", "✅ La pileta ha sido recargada al 100%")
     
-    def actualizar_grafico_prediccion(self):
-        """Actualiza el gráfico de predicción"""
-        self.pred_canvas.delete("all")
-        
-        if len(self.historial_humedad) < 2:
-            self.pred_canvas.create_text(325, 250, 
-                                       text="Se necesitan más datos\npara la predicción", 
-                                       font=('Arial', 14, 'bold'), fill='white',
-                                       justify=tk.CENTER)
+    def regar_lado(self, lado):
+        """Riega un lado específico de la parcela"""
+        if self.nivel_agua < 10:
+            messagebox.showwarning("Agua Insuficiente", 
+                                 "¡La pileta está casi vacía! Recargue agua primero.")
             return
         
-        # Configuración
-        canvas_width = 650
-        canvas_height = 500
-        margin = 80
-        graph_width = canvas_width - 2 * margin
-        graph_height = canvas_height - 2 * margin
-        
-        # Datos para mostrar
-        meses_mostrar = min(12, len(self.historial_humedad) + 3)
-        datos = self.historial_humedad[:]
+        sensores_regados = super().regar_lado(lado)
+        self.nivel_label.config(text=f"Nivel de agua: {self.nivel_agua:.0f}%")
         
-        # Añadir predicción simple
-        if len(datos) >= 3:
-            ultimos_3 = datos[-3:]
-            tendencia = (ultimos_3[-1] - ultimos_3[0]) / 2
-            for i in range(meses_mostrar - len(datos)):
-                pred_valor = datos[-1] + tendencia * (i + 1)
-                datos.append(max(30, min(90, pred_valor)))
+        # Actualizar visualización
+        self.dibujar_parcela()
+        self.actualizar_graficos()
+        self.actualizar_estadisticas()
         
-        # Dibujar ejes
-        self.pred_canvas.create_line(margin, margin, margin, canvas_height - margin, width=2, fill='white')
-        self.pred_canvas.create_line(margin, canvas_height - margin, canvas_width - margin, canvas_height - margin, width=2, fill='white')
+        messagebox.showinfo("Riego Completado", 
+                          f"✅ Lado {lado.upper()} regado correctamente\n"
+                          f"📊 {sensores_regados} sensores actualizados\n"
+                          f"💧 Nivel de agua restante: {self.nivel_agua:.0f}%")
+    
+    def abrir_valvulas(self, *valvulas):
+        """Riega las áreas de las válvulas indicadas"""
+        if self.nivel_agua < 10:
+            messagebox.showwarning("Agua Insuficiente", 
+                                 "¡La pileta está casi vacía! Recargue agua primero.")
+            return
         
-        # Título
-        self.pred_canvas.create_text(canvas_width // 2, 30, 
-                                   text="Predicción de Humedad", 
-                                   font=('Arial', 16, 'bold'), fill='white')
+        sensores_regados = super().abrir_valvulas(*valvulas)
+        self.nivel_label.config(text=f"Nivel de agua: {self.nivel_agua:.0f}%")
         
-        # Dibujar líneas de referencia
-        y_min_ideal = canvas_height - margin - (self.humedad_ideal_min / 100) * graph_height
-        y_max_ideal = canvas_height - margin - (self.humedad_ideal_max / 100) * graph_height
+        self.dibujar_parcela()
+        self.actualizar_graficos()
+        self.actualizar_estadisticas()
         
-        self.pred_canvas.create_line(margin, y_min_ideal, canvas_width - margin, y_min_ideal, 
-                                   fill='blue', dash=(4, 2), width=2)
-        self.pred_canvas.create_line(margin, y_max_ideal, canvas_width - margin, y_max_ideal, 
-                                   fill='red', dash=(4, 2), width=2)
+        areas = sorted({area + 1 for valvula in valvulas for area in self.valvulas[valvula]})
+        messagebox.showinfo("Riego Completado", 
+                          f"✅ Válvula {', '.join(f'V{v + 1}' for v in valvulas)} abierta "
+                          f"(áreas {', '.join(map(str, areas))})\n"
+                          f"📊 {sensores_regados} sensores actualizados\n"
+                          f"💧 Nivel de agua restante: {self.nivel_agua:.0f}%")
+    
+    def reiniciar_simulacion(self):
+        """Reinicia la simulación a su estado inicial"""
+        super().reiniciar_simulacion()
+        messagebox.showinfo("Reinicio", "Simulación reiniciada correctamente")
+    
+    def actualizar_controles_siembra(self):
+        """Botón de siembra y estado del cultivo según el modelo (también tras órdenes remotas)"""
+        if not self.platano_sembrado:
+            self.btn_sembrar.config(text="🌱 SEMBRAR PLÁTANO", state=tk.NORMAL, bg='#4caf50')
+            self.estado_cultivo_label.config(text="Estado: No sembrado")
+            return
+        if self.crecimiento.espacio_libre() == 0:
+            self.btn_sembrar.config(text="🌱 PARCELA COMPLETA", state=tk.DISABLED, bg='#795548')
+        else:
+            self.btn_sembrar.config(text="🌱 SEMBRAR NUEVA TANDA", state=tk.NORMAL, bg='#4caf50')
+        self.estado_cultivo_label.config(text="Estado: Plátanos sembrados")
+    
+    def actualizar_info_cultivo(self):
+        """Actualiza la información del cultivo en la interfaz"""
+        if 'informacion' not in self.pestanas_creadas:
+            return
         
-        # Dibujar línea de datos
-        puntos = []
-        for i, humedad in enumerate(datos):
-            x = margin + (i / (meses_mostrar - 1)) * graph_width
-            y = canvas_height - margin - (humedad / 100) * graph_height
-            
-            puntos.extend([x, y])
+        if self.platano_sembrado:
+            etapas = {1: "Germinación", 2: "Crecimiento", 3: "Maduración"}
+            etapa_text = etapas.get(self.etapa_crecimiento, "Desconocida")
             
-            # Punto
-            color = '#4caf50' if i < len(self.historial_humedad) else '#ff6b35'
-            self.pred_canvas.create_oval(x-4, y-4, x+4, y+4, fill=color, outline='white')
+            self.etapa_label.config(text=f"Etapa: {etapa_text}")
+            self.dias_label.config(text=f"Días desde siembra: {self.dias_desde_siembra} "
+                                        f"({self.crecimiento.total_plantas} plantas)")
             
-            # Etiqueta del mes
-            if i < len(self.meses):
-                mes_text = self.meses[i]
+            if self.etapa_crecimiento < 3:
+                dias_restantes = self.dias_proxima_etapa()
+                self.proxima_label.config(text=f"Próxima etapa en: {dias_restantes} días")
             else:
-                mes_text = f"P{i-len(self.meses)+1}"
+                self.proxima_label.config(text="¡Etapa final alcanzada!")
             
-            self.pred_canvas.create_text(x, canvas_height - margin + 20, 
-                                       text=mes_text, font=('Arial', 8), fill='white')
+            self.rendimiento_label.config(
+                text=f"Rendimiento estimado: {self.crecimiento.rendimiento_total() / 1000:.1f} t "
+                     f"({self.crecimiento.tiempo_termico_max():.0f} °C·día)")
+        else:
+            self.etapa_label.config(text="Estado: No sembrado")
+            self.dias_label.config(text="")
+            self.proxima_label.config(text="")
+            self.rendimiento_label.config(text="")
+    
+    def actualizar_simulacion(self):
+        """Actualiza toda la simulación con los datos del mes actual"""
+        super().actualizar_simulacion()
+        inicio = time.perf_counter()
+        self.refrescar_interfaz()
+        medio = time.perf_counter()
+        alertas_nuevas = self.calcular_alertas()
+        self.metricas.latencia['interfaz'].observar(medio - inicio)
+        self.metricas.latencia['alertas'].observar(time.perf_counter() - medio)
+        # El diálogo queda fuera de la medición: bloquea hasta que el usuario lo cierra
+        if not self.orden_remota:
+            self.mostrar_alertas(alertas_nuevas)
+    
+    def refrescar_interfaz(self):
+        """Redibuja controles, gráficos y parcela con el estado actual"""
+        self.actualizar_controles()
+        self.actualizar_controles_siembra()
+        self.actualizar_graficos()
+        self.actualizar_estadisticas()
+        self.actualizar_info_cultivo()
+        self.dibujar_parcela()
+    
+    def actualizar_controles(self):
+        """Actualiza los controles de la interfaz"""
+        self.nivel_label.config(text=f"Nivel de agua: {self.nivel_agua:.0f}%")
+        if 'informacion' not in self.pestanas_creadas:
+            return
         
-        # Dibujar línea continua
-        if len(puntos) >= 4:
-            self.pred_canvas.create_line(puntos[:len(self.historial_humedad)*2], 
-                                       fill='#4caf50', width=3)
-            if len(datos) > len(self.historial_humedad):
-                puntos_pred = puntos[len(self.historial_humedad)*2-2:]
-                self.pred_canvas.create_line(puntos_pred, fill='#ff6b35', width=3, dash=(4, 2))
+        mes_nombre = self.meses[self.mes_actual]
+        clima = self.patrones_clima[mes_nombre]
         
-        # Leyenda
-        self.pred_canvas.create_text(canvas_width - 100, margin - 20, 
-                                   text="==== Mín Ideal", fill='blue', font=('Arial', 9))
-        self.pred_canvas.create_text(canvas_width - 100, margin, 
-                                   text="=== Máx Ideal", fill='red', font=('Arial', 9))
-        self.pred_canvas.create_text(canvas_width - 100, margin + 20, 
-                                   text="● Histórico", fill='#4caf50', font=('Arial', 9))
-        self.pred_canvas.create_text(canvas_width - 100, margin + 40, 
-                                   text="● Predicción", fill='#ff6b35', font=('Arial', 9))
+        self.mes_label.config(text=f"Mes: {mes_nombre}")
+        self.clima_label.config(
+            text=f"Lluvia: {clima['lluvia']}mm | Temp: {clima['temperatura']}°C | Sequía: {clima['sequia']}%"
+        )
+    
+    def actualizar_graficos(self):
+        """Actualiza los gráficos cuyas pestañas ya se construyeron"""
+        for nombre in ('barras', 'pastel', 'prediccion'):
+            if nombre in self.pestanas_creadas:
+                self.dibujar_pestana(nombre)
+    
+    def actualizar_estadisticas(self):
+        """Actualiza las estadísticas si su pestaña ya se construyó"""
+        if 'estadisticas' in self.pestanas_creadas:
+            super().actualizar_estadisticas()
     
     def verificar_alertas(self):
         """Verifica y muestra alertas si es necesario"""
-        alertas_nuevas = []
-        
-        # Verificar humedad crítica
-        for sensor_id, data in self.datos_sensores.items():
-            if data['humedad'] < 50:
-                alertas_nuevas.append(f"🚨 Sensor {sensor_id + 1}: HUMEDAD MUY BAJA ({data['humedad']}%)")
-            elif data['humedad'] > 90:
-                alertas_nuevas.append(f"⚠️ Sensor {sensor_id + 1}: HUMEDAD MUY ALTA ({data['humedad']}%)")
-        
-        # Verificar nivel de agua
-        if self.nivel_agua < 20:
-            alertas_nuevas.append("💧 PILETA: Nivel de agua crítico (<20%)")
-        
-        # Verificar condiciones para el plátano
-        if self.platano_sembrado:
-            # Verificar humedad promedio para el cultivo
-            humedades = [sensor['humedad'] for sensor in self.datos_sensores.values()]
-            humedad_promedio = sum(humedades) / len(humedades)
-            
-            if humedad_promedio < self.humedad_ideal_min:
-                alertas_nuevas.append("🌱 CULTIVO: Humedad muy baja para el plátano")
-            elif humedad_promedio > self.humedad_ideal_max:
-                alertas_nuevas.append("🌱 CULTIVO: Humedad muy alta para el plátano")
-            
-            # Alertas de crecimiento
-            if self.etapa_crecimiento == 3:
-                alertas_nuevas.append("🎉 ¡PLÁTANOS LISTOS PARA COSECHAR! 🍌")
+        self.mostrar_alertas(self.calcular_alertas())
+    
+    def mostrar_alertas(self, alertas_nuevas):
+        """Muestra en un diálogo las alertas ya calculadas"""
+        self.metricas.alertas_mostradas += len(alertas_nuevas)
         
         # Mostrar alertas
         if alertas_nuevas:
@@ -1127,6 +3806,119 @@ RANGO IDEAL PARA PLÁTANO: {self.humedad_ideal_min}% - {self.humedad_ideal_max}%
 
 # Ejecutar la aplicación
 if __name__ == "__main__":
-    root = tk.Tk()
-    app = SimuladorPlatano(root)
-    root.mainloop()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Simulación de humedad para cultivo de plátano")
+    parser.add_argument('--semilla', type=int, help="semilla del generador aleatorio")
+    parser.add_argument('--registro', help="archivo donde anexar los eventos de la sesión")
+    parser.add_argument('--reproducir', help="reproduce sin interfaz un registro de eventos")
+    parser.add_argument('--hasta', type=int, help="número de eventos a reproducir")
+    parser.add_argument('--sesion', type=int, default=0,
+                        help="sesión del registro a reproducir, desde 1 (por omisión la última)")
+    parser.add_argument('--servidor', type=int, metavar='PUERTO',
+                        help="expone estado y órdenes por HTTP/WebSocket en este puerto")
+    parser.add_argument('--tiempos-arranque', action='store_true',
+                        help="muestra cuánto tarda cada etapa del arranque de la ventana")
+    parser.add_argument('--sin-interfaz', action='store_true',
+                        help="corre solo el modelo y el servidor, sin ventana")
+    parser.add_argument('--periodo', type=float, default=0,
+                        help="segundos entre meses simulados automáticamente (sin interfaz)")
+    parser.add_argument('--informes', type=int, metavar='CORRIDAS',
+                        help="genera sin interfaz los gráficos SVG de varias corridas")
+    parser.add_argument('--meses', type=int, default=12, help="meses por corrida de informe")
+    parser.add_argument('--salida', default='informes', help="carpeta de los informes")
+    parser.add_argument('--procesos', type=int, help="procesos de trabajo para informes y sensibilidad")
+    parser.add_argument('--sensibilidad', type=int, metavar='MUESTRAS',
+                        help="análisis de sensibilidad de Sobol de los coeficientes del modelo")
+    parser.add_argument('--reglas', help="archivo JSON con las reglas de alerta")
+    parser.add_argument('--valvulas',
+                        help="áreas de cada válvula en JSON, numeradas desde 1, p. ej. '[[1,2],[3]]'")
+    parser.add_argument('--suelos',
+                        help="textura del suelo: una para toda la parcela o una por área en JSON, "
+                             f"p. ej. '[\"arena\", ...]' ({', '.join(SimulacionPlatano.tipos_suelo)})")
+    parser.add_argument('--estado-compartido', metavar='RUTA',
+                        help="publica el estado en un archivo mapeado en memoria (p. ej. en /dev/shm)")
+    parser.add_argument('--monitor', metavar='RUTA',
+                        help="muestra el estado que otro proceso publica con --estado-compartido")
+    args = parser.parse_args()
+    try:
+        reglas_alerta = ReglasAlerta.cargar(args.reglas) if args.reglas else None
+        valvulas = None
+        if args.valvulas:
+            valvulas = json.loads(args.valvulas)
+            if not isinstance(valvulas, list) or not all(
+                    isinstance(areas, list) and all(isinstance(area, int) for area in areas)
+                    for areas in valvulas):
+                raise ValueError("--valvulas: se espera una lista de listas de números de área")
+            valvulas = [[area - 1 for area in areas] for areas in valvulas]
+        suelos = (json.loads(args.suelos) if args.suelos and args.suelos.startswith('[')
+                  else args.suelos)
+        # Configuración inválida: mensaje de uso en vez de un error a mitad del arranque
+        SimulacionPlatano.vacia(0, {'reglas_alerta': reglas_alerta, 'valvulas': valvulas,
+                                    'suelos': suelos})
+    except (OSError, ValueError, KeyError, TypeError) as error:
+        parser.error(str(error))
+    
+    if args.sensibilidad:
+        analisis = AnalisisSensibilidad(args.sensibilidad, args.meses, args.semilla or 0,
+                                        args.procesos)
+        for salida, indices in analisis.ejecutar().items():
+            print(f"\n{salida.upper()}\n{'coeficiente':<20} {'S1':>7} {'ST':>7}")
+            for nombre, (primer_orden, total) in indices.items():
+                print(f"{nombre:<20} {primer_orden:7.3f} {total:7.3f}")
+    elif args.informes:
+        rendimientos = generar_informes(args.informes, args.meses, args.salida, args.procesos)
+        promedio = sum(rendimientos.values()) / len(rendimientos)
+        print(f"{len(rendimientos)} informes en '{args.salida}' | "
+              f"Rendimiento promedio: {promedio / 1000:.1f} t")
+    elif args.monitor:
+        compartido = EstadoCompartido.abrir(args.monitor)
+        ultima = None
+        while True:
+            estado = compartido.leer()
+            if estado['secuencia'] != ultima:
+                ultima = estado['secuencia']
+                humedad = sum(estado['sensores']) / len(estado['sensores'])
+                print(f"Día {estado['dia']} | Nivel de agua: {estado['nivel_agua']:.0f}% | "
+                      f"Humedad promedio: {humedad:.1f}% | "
+                      f"Sospechosos: {len(estado['sospechosos'])}", flush=True)
+            time.sleep(args.periodo or 1)
+    elif args.sin_interfaz:
+        sim = SimulacionPlatano(semilla=args.semilla, ruta_registro=args.registro,
+                                reglas_alerta=reglas_alerta, valvulas=valvulas, suelos=suelos)
+        if args.estado_compartido:
+            EstadoCompartido.crear(args.estado_compartido, sim)
+        servidor = ServidorAPI(sim, puerto=args.servidor or 8765)
+        
+        async def principal():
+            tarea = asyncio.create_task(servidor.servir())
+            while args.periodo > 0:
+                await asyncio.sleep(args.periodo)
+                sim.avanzar_mes()
+            await tarea
+        
+        asyncio.run(principal())
+    elif args.reproducir:
+        sesiones = len(RegistroEventos.sesiones(args.reproducir))
+        sesion = args.sesion or sesiones
+        if not 1 <= sesion <= sesiones:
+            parser.error(f"el registro tiene {sesiones} sesiones")
+        registro = RegistroEventos.cargar(args.reproducir, sesion=sesion - 1)
+        hasta = len(registro.eventos) if args.hasta is None else args.hasta
+        if not 0 <= hasta <= len(registro.eventos):
+            parser.error(f"--hasta debe estar entre 0 y {len(registro.eventos)} (eventos de la sesión)")
+        sim = registro.estado_en(hasta)
+        humedad = (f"{sim.historial_humedad[-1]:.1f}%" if sim.historial_humedad
+                   else "sin lecturas")
+        print(f"Sesión: {sesion}/{sesiones} | Eventos aplicados: {hasta}/{len(registro.eventos)}")
+        print(f"Mes: {sim.meses[sim.mes_actual]} | Nivel de agua: {sim.nivel_agua:.0f}% | "
+              f"Humedad promedio: {humedad} | Plantas: {sim.crecimiento.total_plantas}")
+    else:
+        if tk is None:
+            parser.error("la interfaz gráfica requiere tkinter; use --sin-interfaz, --informes "
+                         "o --sensibilidad")
+        root = tk.Tk()
+        app = SimuladorPlatano(root, semilla=args.semilla, ruta_registro=args.registro,
+                               puerto_servidor=args.servidor, mostrar_tiempos=args.tiempos_arranque,
+                               reglas_alerta=reglas_alerta, valvulas=valvulas, suelos=suelos)
+        if args.estado_compartido:
+            EstadoCompartido.crear(args.estado_compartido, app)
+        root.mainloop()
\ No newline at end of file